@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Dávkové řešení TSP pro více vstupních Excel souborů
+Každý vstup se vyřeší v jednom z procesů a zapíše do vlastního výstupního souboru.
+
+Příklad: python batch.py vstupy/ "depa/*.xlsx" -o vystupy -j 8 --time-limit 60
+"""
+
+import argparse
+import glob
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import perf_counter
+
+import numpy as np
+
+from core.cache import SolutionCache, DEFAULT_CACHE_DIR
+from core.io_handlers import read_input, write_result, EXPORT_FORMATS, SIDECAR_SUFFIX, METADATA_SUFFIX
+from core.models import DistanceMatrix, TSPSolution
+from core.solvers import solve_tsp, find_cycles
+
+# přípony vstupů, které se hledají v zadaném adresáři (stejné, jaké uvádí nápověda)
+INPUT_EXTENSIONS = (".xlsx", ".xlsm", ".xls", ".csv", ".txt", ".npy")
+
+def is_input_file(path, suffix=None, output_dir=None):
+    """Zjistí, zda soubor patří mezi vstupy - ne výstup dřívějšího běhu, binární kopie sešitu ani dočasný soubor"""
+    name = os.path.basename(path)
+    # dočasné soubory Excelu (~$...) a binární kopie matic vedle sešitů přeskočíme
+    if name.startswith("~$") or name.lower().endswith((SIDECAR_SUFFIX, METADATA_SUFFIX)):
+        return False
+    if suffix and os.path.splitext(name)[0].endswith(suffix):
+        return False
+    return not same_directory(os.path.dirname(path), output_dir)
+
+def same_directory(path, directory):
+    """Zjistí, zda path je adresář directory (None nikdy)"""
+    return (bool(directory) and os.path.isdir(path) and os.path.isdir(directory)
+            and os.path.samefile(path, directory))
+
+def collect_inputs(patterns, suffix=None, output_dir=None):
+    """Rozbalí adresáře a glob vzory na seřazený seznam vstupních souborů
+
+    Soubory s příponou výstupu (suffix) a soubory v adresáři výstupů se vynechají, aby další
+    běh nezpracoval výsledky předchozího.
+    """
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            candidates = [os.path.join(pattern, name) for name in os.listdir(pattern)
+                          if name.lower().endswith(INPUT_EXTENSIONS)]
+        else:
+            candidates = glob.glob(pattern)
+        # adresář výstupů zadaný přímo jako vstup (i v glob vzoru) se prochází, výstupy pozná přípona
+        root = pattern if os.path.isdir(pattern) else os.path.dirname(pattern) or "."
+        skip_dir = None if same_directory(root, output_dir) else output_dir
+        files.extend(path for path in candidates
+                     if os.path.isfile(path) and is_input_file(path, suffix, skip_dir))
+    return sorted(set(files))
+
+def output_path(input_file, output_dir, suffix, fmt="xlsx"):
+    """Vrátí cestu výstupního souboru pro daný vstup"""
+    stem = os.path.splitext(os.path.basename(input_file))[0]
+    directory = output_dir or os.path.dirname(input_file)
+    return os.path.join(directory, f"{stem}{suffix}{EXPORT_FORMATS[fmt][0]}")
+
+def solve_file(input_file, output_file, solver_options, cache_dir=None):
+    """Vyřeší jeden vstupní soubor, vrací (počet uzlů, délka trasy, doba v sekundách, zásah cache)"""
+    start = perf_counter()
+    # .npy (DistanceMatrix) se jen namapuje z disku, i když je větší než paměť
+    matrix = DistanceMatrix.open(input_file) if input_file.endswith(".npy") else read_input(input_file)
+    sources = []
+    cache = SolutionCache(cache_dir) if cache_dir else None
+    solution = solve_tsp(matrix, cache=cache, progress=lambda p: sources.append(p.source), **solver_options)
+    result = TSPSolution.from_edges(matrix, solution)
+    cycles = find_cycles(matrix, solution)
+    write_result(matrix, result, cycles, output_file)
+    return len(matrix), result.total_distance, perf_counter() - start, "cache" in sources
+
+def print_summary(durations, failed, wall_time):
+    """Vypíše propustnost a latenci dávky"""
+    print()
+    print(f"Vyřešeno: {len(durations)}, chyby: {len(failed)}, celkový čas: {wall_time:.2f} s")
+    if durations:
+        latencies = np.array(durations)
+        print(f"Propustnost: {len(durations) / wall_time:.2f} souborů/s")
+        print(f"Latence [s]: průměr {latencies.mean():.3f}, medián {np.median(latencies):.3f}, "
+              f"p95 {np.percentile(latencies, 95):.3f}, max {latencies.max():.3f}")
+    for input_file, error in failed:
+        print(f"CHYBA {input_file}: {error}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dávkové řešení TSP pro Excel soubory s maticí vzdáleností")
+    parser.add_argument("inputs", nargs="+",
+                        help="vstupní soubory (matice .xlsx/.xlsm/.xls/.npy nebo souřadnice .csv/.txt/.xlsx), "
+                             "adresáře nebo glob vzory")
+    parser.add_argument("-o", "--output-dir", help="adresář pro výstupy (výchozí: vedle vstupu)")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="počet procesů")
+    parser.add_argument("-m", "--method", default="auto", help="metoda solve_tsp (auto, mtz, dfj, bb, hk, heuristic, lk)")
+    parser.add_argument("--time-limit", type=float, help="časový limit na jeden soubor v sekundách")
+    parser.add_argument("--gap", type=float, help="povolená relativní odchylka od optima (např. 0.01)")
+    parser.add_argument("--suffix", default="_optimum", help="přípona názvu výstupního souboru")
+    parser.add_argument("-f", "--format", default="xlsx", choices=list(EXPORT_FORMATS),
+                        help="formát výstupu (json, parquet, arrow a npz obsahují jen trasu, ne celou matici)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="adresář mezipaměti řešení")
+    parser.add_argument("--no-cache", action="store_true", help="nepoužívat mezipaměť řešení")
+    args = parser.parse_args(argv)
+
+    files = collect_inputs(args.inputs, args.suffix, args.output_dir)
+    if not files:
+        print("Nenalezeny žádné vstupní soubory.")
+        return 1
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    solver_options = {"method": args.method, "time_limit": args.time_limit, "gap": args.gap}
+    print(f"Souborů: {len(files)}, procesů: {args.workers}, metoda: {args.method}")
+
+    durations = []
+    failed = []
+    start = perf_counter()
+    # jeden proces obslouží mnoho souborů - Python a knihovny se načtou jen jednou
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        cache_dir = None if args.no_cache else args.cache_dir
+        futures = {executor.submit(solve_file, path, output_path(path, args.output_dir, args.suffix, args.format),
+                                   solver_options, cache_dir): path for path in files}
+        for future in as_completed(futures):
+            input_file = futures[future]
+            try:
+                num_nodes, total_distance, duration, from_cache = future.result()
+            except Exception as e:
+                failed.append((input_file, str(e)))
+                continue
+            durations.append(duration)
+            cache_note = " (z mezipaměti)" if from_cache else ""
+            print(f"{input_file}: {num_nodes} uzlů, vzdálenost {total_distance:g}, {duration:.2f} s{cache_note}")
+
+    print_summary(durations, failed, perf_counter() - start)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Porovnání doby sestavení PuLP modelu: původní smyčky přes popisky vs. NumPy cesta
+Spuštění: python benchmarks/model_build.py [velikosti...]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from pulp import LpProblem, LpMinimize, LpVariable, LpBinary, LpInteger, lpSum
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.solvers import build_tsp_model, cost_array
+
+# původní sestavení modelu (smyčky přes popisky a matrix.loc) - jen pro srovnání
+def build_legacy_model(matrix):
+    num_nodes = len(matrix)
+    nodes = list(matrix.index)
+    prob = LpProblem("TSP", LpMinimize)
+    x = LpVariable.dicts("x", [(i, j) for i in nodes for j in nodes if i != j], 0, 1, LpBinary)
+    prob += lpSum(matrix.loc[i, j] * x[(i, j)] for i in nodes for j in nodes if i != j)
+    for i in nodes:
+        prob += lpSum(x[(i, j)] for j in nodes if i != j) == 1
+        prob += lpSum(x[(j, i)] for j in nodes if i != j) == 1
+    u = LpVariable.dicts("u", nodes, 0, num_nodes - 1, LpInteger)
+    for i in nodes:
+        for j in nodes:
+            if i != j and i != nodes[0] and j != nodes[0]:
+                prob += u[i] - u[j] + num_nodes * x[(i, j)] <= num_nodes - 1
+    return prob
+
+def random_matrix(size, seed=0):
+    """Vygeneruje náhodnou matici vzdáleností s popisky"""
+    rng = np.random.default_rng(seed)
+    labels = [f"Bod {i+1}" for i in range(size)]
+    return pd.DataFrame(rng.uniform(1, 100, (size, size)).round(1), index=labels, columns=labels)
+
+def main(sizes):
+    print(f"{'n':>6} {'puvodni [s]':>12} {'numpy [s]':>10} {'zrychleni':>10}")
+    for size in sizes:
+        matrix = random_matrix(size)
+
+        start = time.perf_counter()
+        build_legacy_model(matrix)
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        build_tsp_model(cost_array(matrix))
+        fast = time.perf_counter() - start
+
+        print(f"{size:>6} {legacy:>12.3f} {fast:>10.3f} {legacy / fast:>9.1f}x")
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [50, 150, 300])
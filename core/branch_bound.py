@@ -0,0 +1,195 @@
+import heapq
+import time
+import numpy as np
+from core.heuristics import is_valid_tour
+
+# Vlastní implementace metody větví a mezí (Littlův algoritmus)
+# Dolní mez = součet zahrnutých hran + redukce řádků a sloupců zbytkové matice.
+# Uzly stromu se ukládají jen jako řetěz rozhodnutí (rodič, i, j, zahrnout),
+# zbytková matice se při rozvětvení uzlu znovu sestaví z původní matice.
+
+# rozhodnutí v uzlu stromu - persistentní spojový seznam (rodič, i, j, zahrnout)
+ROOT = None
+
+def reduce_matrix(m, active_rows, active_cols):
+    """Zredukuje matici na místě po řádcích a sloupcích, vrací součet redukce"""
+    sub_rows = m[active_rows]
+    row_min = sub_rows[:, active_cols].min(axis=1)
+    if not np.all(np.isfinite(row_min)):
+        return np.inf
+    m[active_rows] -= row_min[:, None]
+    col_min = m[np.ix_(active_rows, active_cols)].min(axis=0)
+    if not np.all(np.isfinite(col_min)):
+        return np.inf
+    m[:, active_cols] -= col_min[None, :]
+    return float(row_min.sum() + col_min.sum())
+
+def replay(cost, decisions):
+    """Sestaví zbytkovou matici uzlu přehráním rozhodnutí nad původní maticí
+
+    Vrací (m, active_rows, active_cols, start_of, end_of, included_cost, included).
+    """
+    num_nodes = len(cost)
+    chain = []
+    while decisions is not ROOT:
+        decisions, i, j, include = decisions
+        chain.append((i, j, include))
+
+    m = cost.copy()
+    active_rows = np.ones(num_nodes, dtype=bool)
+    active_cols = np.ones(num_nodes, dtype=bool)
+    # start_of[k] = začátek úseku cesty končícího v k, end_of[k] = konec úseku začínajícího v k
+    start_of = np.arange(num_nodes)
+    end_of = np.arange(num_nodes)
+    included_cost = 0.0
+    included = []
+
+    for i, j, include in reversed(chain):
+        if include:
+            included_cost += cost[i, j]
+            included.append((i, j))
+            apply_include(m, active_rows, active_cols, start_of, end_of, i, j, len(included) == num_nodes - 1)
+        else:
+            m[i, j] = np.inf
+
+    return m, active_rows, active_cols, start_of, end_of, included_cost, included
+
+def apply_include(m, active_rows, active_cols, start_of, end_of, i, j, last):
+    """Zahrne hranu (i, j): zruší řádek i a sloupec j a zakáže hranu uzavírající podcyklus"""
+    m[i, :] = np.inf
+    m[:, j] = np.inf
+    active_rows[i] = False
+    active_cols[j] = False
+    s = start_of[i]
+    e = end_of[j]
+    end_of[s] = e
+    start_of[e] = s
+    if not last:
+        m[e, s] = np.inf
+
+def choose_branch_edge(m, active_rows, active_cols):
+    """Vybere nulovou hranu zredukované matice s největší penalizací za vynechání"""
+    rows = np.nonzero(active_rows)[0]
+    cols = np.nonzero(active_cols)[0]
+    sub = m[np.ix_(rows, cols)]
+    if sub.shape[1] > 1:
+        row_second = np.partition(sub, 1, axis=1)[:, 1]
+    else:
+        row_second = np.full(len(rows), np.inf)
+    if sub.shape[0] > 1:
+        col_second = np.partition(sub, 1, axis=0)[1, :]
+    else:
+        col_second = np.full(len(cols), np.inf)
+    zero_r, zero_c = np.nonzero(sub == 0)
+    penalty = row_second[zero_r] + col_second[zero_c]
+    best = int(np.argmax(penalty))
+    return int(rows[zero_r[best]]), int(cols[zero_c[best]])
+
+def branch_and_bound(cost, max_open_nodes=100000, upper_bound=np.inf, initial_tour=None,
+                     time_limit=None, gap=None, on_incumbent=None):
+    """Vyřeší TSP Littlovým algoritmem nad polem nákladů
+
+    Prohledává nejlepší-první s prioritní frontou; pokud fronta dosáhne max_open_nodes,
+    další potomci se zpracují do hloubky, takže paměť zůstává omezená a řešení přesné.
+    Výpočet skončí dříve po time_limit sekundách nebo když relativní mezera mezi nejlepší
+    trasou a dolní mezí klesne pod gap. on_incumbent(délka, hrany, dolní mez) se volá
+    při každém zlepšení. initial_tour se použije jako počáteční řešení, jen pokud je to
+    permutace všech uzlů s konečnou délkou (jinak by ořezalo skutečné optimum).
+    Vrací (délka, seznam hran (i, j) v indexech, dolní mez); dolní mez se rovná délce,
+    pokud bylo prohledávání dokončeno (optimalita prokázána). Bez řešení vrací (inf, [], mez).
+    """
+    start_time = time.perf_counter()
+    num_nodes = len(cost)
+    if num_nodes < 2:
+        return 0.0, [], 0.0
+    if num_nodes == 2:
+        total = float(cost[0, 1] + cost[1, 0])
+        return total, [(0, 1), (1, 0)], total
+
+    base = np.array(cost, dtype=np.float64)
+    np.fill_diagonal(base, np.inf)
+
+    best_cost = upper_bound
+    best_edges = []
+    if is_valid_tour(base, initial_tour):
+        initial_tour = [int(k) for k in initial_tour]
+        tour_edges = list(zip(initial_tour, initial_tour[1:] + initial_tour[:1]))
+        tour_cost = float(sum(base[i, j] for i, j in tour_edges))
+        if tour_cost < best_cost:
+            best_cost, best_edges = tour_cost, tour_edges
+
+    root_m = base.copy()
+    root_bound = reduce_matrix(root_m, np.ones(num_nodes, dtype=bool), np.ones(num_nodes, dtype=bool))
+    seq = 0
+    # klíč fronty (mez, -hloubka, pořadí) - při shodné mezi dáme přednost hlubším uzlům
+    heap = [(root_bound, 0, seq, ROOT)]
+
+    lower_bound = root_bound
+    stopped = False
+    while heap and not stopped:
+        node = heapq.heappop(heap)
+        # uzel vybraný z fronty má nejnižší mez ze všech otevřených uzlů
+        lower_bound = node[0]
+        if lower_bound >= best_cost:
+            break
+        if gap is not None and np.isfinite(best_cost) and best_cost - lower_bound <= gap * abs(best_cost):
+            stopped = True
+            break
+        stack = [node]
+        while stack:
+            if time_limit is not None and time.perf_counter() - start_time > time_limit:
+                stopped = True
+                break
+            bound, neg_depth, _, decisions = stack.pop()
+            if bound >= best_cost:
+                continue
+
+            m, active_rows, active_cols, start_of, end_of, included_cost, included = replay(base, decisions)
+
+            # zbývá poslední hrana - je určena jednoznačně
+            if len(included) == num_nodes - 1:
+                i = int(np.nonzero(active_rows)[0][0])
+                j = int(np.nonzero(active_cols)[0][0])
+                total = included_cost + base[i, j]
+                if total < best_cost:
+                    best_cost, best_edges = total, included + [(i, j)]
+                    if on_incumbent is not None:
+                        on_incumbent(float(best_cost), best_edges, float(lower_bound))
+                continue
+
+            # mez potomka = zahrnuté hrany + redukce rodiče + dodatečná redukce potomka;
+            # mez rodiče platí i pro potomky, proto bereme maximum
+            base_reduction = reduce_matrix(m, active_rows, active_cols)
+            if not np.isfinite(base_reduction):
+                continue
+            i, j = choose_branch_edge(m, active_rows, active_cols)
+
+            # větev bez hrany (i, j)
+            m_out = m.copy()
+            m_out[i, j] = np.inf
+            exclude_bound = max(included_cost + base_reduction + reduce_matrix(m_out, active_rows, active_cols), bound)
+
+            # větev s hranou (i, j) - redukovaná cena hrany je nulová, takže se k mezi nic nepřičítá
+            apply_include(m, active_rows, active_cols, start_of, end_of, i, j, len(included) + 1 == num_nodes - 1)
+            include_bound = max(included_cost + base_reduction + reduce_matrix(m, active_rows, active_cols), bound)
+
+            children = []
+            if exclude_bound < best_cost:
+                seq += 1
+                children.append((exclude_bound, neg_depth - 1, seq, (decisions, i, j, False)))
+            if include_bound < best_cost:
+                seq += 1
+                children.append((include_bound, neg_depth - 1, seq, (decisions, i, j, True)))
+
+            for child in children:
+                if len(heap) < max_open_nodes:
+                    heapq.heappush(heap, child)
+                else:
+                    stack.append(child)
+
+    # prohledávání nebylo přerušeno (čas, mezera) - optimum je prokázané
+    if not stopped:
+        lower_bound = best_cost
+    if not best_edges:
+        return np.inf, [], float(lower_bound)
+    return float(best_cost), best_edges, float(min(lower_bound, best_cost))
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from core.models import DistanceMatrix, CoordinateMatrix
+
+# Trvalá mezipaměť řešení na disku
+# Klíč = SHA-256 z hodnot matice, popisků a nastavení řešiče; jeden JSON soubor na záznam.
+# Stáří záznamu určuje čas poslední změny souboru (při zásahu se obnoví), při překročení
+# limitu velikosti se mažou nejdéle nepoužité záznamy (LRU).
+
+# výchozí umístění a limit velikosti mezipaměti
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "tsp_branch_and_bound")
+DEFAULT_MAX_BYTES = 50 * 1024 ** 2
+
+class SolutionCache:
+    """Mezipaměť řešení TSP s LRU vyřazováním a limitem velikosti"""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, matrix, settings):
+        """Spočítá klíč z hodnot matice, popisků a nastavení řešiče"""
+        digest = hashlib.sha256()
+        digest.update(str((len(matrix), len(matrix.columns))).encode())
+        # matice ze souřadnic je dána body a metrikou, matice na disku se hashuje po blocích
+        # řádků (stejný výsledek jako celé pole)
+        if isinstance(matrix, CoordinateMatrix):
+            blocks = [matrix.coordinates, np.frombuffer(matrix.metric.encode(), dtype=np.uint8)]
+        elif isinstance(matrix, DistanceMatrix):
+            blocks = (block for _, block in matrix.row_blocks())
+        else:
+            blocks = [matrix.to_numpy(dtype=np.float64)]
+        for block in blocks:
+            digest.update(np.ascontiguousarray(block).tobytes())
+        digest.update(repr([str(label) for label in matrix.index]).encode("utf-8"))
+        digest.update(repr([str(label) for label in matrix.columns]).encode("utf-8"))
+        digest.update(json.dumps(settings, sort_keys=True, default=str).encode("utf-8"))
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, matrix, settings):
+        """Vrátí uložené řešení (seznam hran s popisky) nebo None"""
+        found = self.lookup(matrix, settings)
+        return None if found is None else found[0]
+
+    def lookup(self, matrix, settings):
+        """Vrátí dvojici (hrany s popisky, prokázané optimum True/False) nebo None"""
+        path = self.path(self.key(matrix, settings))
+        try:
+            with open(path, encoding="utf-8") as cache_file:
+                entry = json.load(cache_file)
+            os.utime(path)  # záznam byl právě použit
+        except (OSError, ValueError):
+            return None
+        nodes = list(matrix.index)
+        return [(nodes[i], nodes[j]) for i, j in entry["edges"]], bool(entry.get("proven", False))
+
+    def put(self, matrix, settings, solution, total_distance=None, proven=False):
+        """Uloží řešení a případně vyřadí nejdéle nepoužité záznamy
+
+        proven označí prokázané optimum (heuristické trasy se ukládají s False).
+        """
+        position = {label: i for i, label in enumerate(matrix.index)}
+        entry = {
+            "edges": [[position[a], position[b]] for a, b in solution],
+            "total_distance": None if total_distance is None else float(total_distance),
+            "proven": bool(proven),
+            "settings": settings,
+        }
+        # zápis přes dočasný soubor - souběžné procesy nikdy neuvidí rozepsaný záznam
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+            json.dump(entry, tmp_file, default=str)
+        os.replace(tmp_path, self.path(self.key(matrix, settings)))
+        self.evict()
+
+    def evict(self):
+        """Maže nejdéle nepoužité záznamy, dokud mezipaměť nepřekračuje max_bytes"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        """Smaže všechny záznamy"""
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
@@ -0,0 +1,79 @@
+import numpy as np
+
+# Held-Karpův algoritmus (dynamické programování) pro malé instance
+# dp[mask, k] = nejkratší cesta z uzlu 0 přes uzly v mask končící v uzlu k + 1
+# (bit b v mask odpovídá uzlu b + 1, uzel 0 je pevný start)
+
+# výchozí strop paměti pro tabulky DP (256 MB)
+DEFAULT_MAX_MEMORY = 256 * 1024 ** 2
+
+def held_karp_memory(num_nodes):
+    """Odhad paměti tabulek DP v bajtech (float64 hodnoty + int8 předchůdci)"""
+    if num_nodes < 2:
+        return 0
+    return (1 << (num_nodes - 1)) * (num_nodes - 1) * (8 + 1)
+
+def masks_by_popcount(num_bits):
+    """Vrátí seznam polí masek seskupených podle počtu nastavených bitů"""
+    masks = np.arange(1 << num_bits, dtype=np.int64)
+    popcount = np.zeros(len(masks), dtype=np.int64)
+    for b in range(num_bits):
+        popcount += (masks >> b) & 1
+    order = np.argsort(popcount, kind="stable")
+    bounds = np.searchsorted(popcount[order], np.arange(num_bits + 2))
+    return [order[bounds[s]:bounds[s + 1]] for s in range(num_bits + 1)]
+
+def held_karp(cost, max_memory=DEFAULT_MAX_MEMORY):
+    """Vyřeší TSP přesně Held-Karpovým algoritmem nad polem nákladů
+
+    Odmítne instanci, jejíž tabulky by přesáhly max_memory bajtů (MemoryError).
+    Vrací (délka, seznam hran (i, j) v indexech).
+    """
+    num_nodes = len(cost)
+    if num_nodes < 2:
+        return 0.0, []
+    required = held_karp_memory(num_nodes)
+    if required > max_memory:
+        raise MemoryError(
+            f"Held-Karp pro {num_nodes} uzlů potřebuje {required / 1024 ** 2:.0f} MB, "
+            f"povoleno je {max_memory / 1024 ** 2:.0f} MB")
+
+    cost = np.asarray(cost, dtype=np.float64)
+    m = num_nodes - 1
+    full = (1 << m) - 1
+    dp = np.full((1 << m, m), np.inf)
+    parent = np.full((1 << m, m), -1, dtype=np.int8)
+
+    # cesty s jediným uzlem
+    singles = 1 << np.arange(m)
+    dp[singles, np.arange(m)] = cost[0, 1:]
+
+    inner = cost[1:, 1:]
+    for layer in masks_by_popcount(m)[2:]:
+        for k in range(m):
+            sel = layer[(layer >> k) & 1 == 1]
+            prev = sel ^ (1 << k)
+            cand = dp[prev] + inner[:, k][None, :]
+            best = np.argmin(cand, axis=1)
+            dp[sel, k] = cand[np.arange(len(sel)), best]
+            parent[sel, k] = best
+
+    # uzavření okruhu zpět do uzlu 0
+    closing = dp[full] + cost[1:, 0]
+    last = int(np.argmin(closing))
+    total = float(closing[last])
+
+    # zpětné sestavení pořadí
+    order = []
+    mask = full
+    k = last
+    while k != -1:
+        order.append(k + 1)
+        prev_k = int(parent[mask, k])
+        mask ^= 1 << k
+        k = prev_k
+    order.append(0)
+    order.reverse()
+
+    edges = list(zip(order, order[1:] + order[:1]))
+    return total, edges
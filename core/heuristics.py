@@ -0,0 +1,136 @@
+import numpy as np
+
+# Rychlé heuristiky pro TSP nad polem nákladů
+# Trasa je pole indexů uzlů v pořadí průjezdu (návrat do prvního uzlu je implicitní).
+# Všechny tahy počítají s nesymetrickou maticí (obrácení úseku mění směr jeho hran).
+
+# tolerance pro uznání zlepšení (ochrana proti zacyklení na zaokrouhlovacích chybách)
+EPS = 1e-9
+
+def tour_cost(cost, tour):
+    """Vrátí délku uzavřené trasy"""
+    tour = np.asarray(tour)
+    return float(cost[tour, np.roll(tour, -1)].sum())
+
+def is_valid_tour(cost, tour):
+    """Zjistí, zda je tour permutací všech uzlů matice s konečnou délkou"""
+    if tour is None:
+        return False
+    tour = np.asarray(tour)
+    num_nodes = len(cost)
+    if tour.shape != (num_nodes,) or not np.array_equal(np.sort(tour), np.arange(num_nodes)):
+        return False
+    return bool(np.isfinite(tour_cost(cost, tour)))
+
+def nearest_neighbour(cost, start=0):
+    """Sestaví trasu metodou nejbližšího souseda
+
+    Vybírá se jen z nenavštívených uzlů, takže výsledek je vždy permutace uzlů - pokud z uzlu
+    nevede konečná hrana do žádného z nich, trasa má nekonečnou délku (viz is_valid_tour).
+    """
+    num_nodes = len(cost)
+    visited = np.zeros(num_nodes, dtype=bool)
+    tour = np.empty(num_nodes, dtype=np.int64)
+    current = start
+    for k in range(num_nodes):
+        tour[k] = current
+        visited[current] = True
+        if k == num_nodes - 1:
+            break
+        unvisited = np.flatnonzero(~visited)
+        current = int(unvisited[np.argmin(cost[current, unvisited])])
+    return tour
+
+def two_opt(cost, tour):
+    """Zlepšuje trasu 2-opt tahy (vždy nejlepší tah z celé matice tahů), dokud to jde"""
+    tour = np.array(tour, dtype=np.int64)
+    num_nodes = len(tour)
+    if num_nodes < 4:
+        return tour
+
+    valid = np.triu(np.ones((num_nodes, num_nodes), dtype=bool), k=2)
+    valid[0, num_nodes - 1] = False  # hrany 0 a n-1 spolu sousedí přes uzavření trasy
+
+    while True:
+        # hrana k vede z a[k] do b[k]
+        a = tour
+        b = np.roll(tour, -1)
+        edge = cost[a, b]
+        back = cost[b, a]
+        fwd = np.concatenate(([0.0], np.cumsum(edge)))
+        bwd = np.concatenate(([0.0], np.cumsum(back)))
+
+        # tah (i, j): hrany i a j nahradíme hranami a[i]->a[j] a b[i]->b[j], úsek b[i]..a[j] se obrátí
+        delta = cost[a[:, None], a[None, :]] + cost[b[:, None], b[None, :]] - edge[:, None] - edge[None, :]
+        delta += (bwd[None, :num_nodes] - bwd[1:, None]) - (fwd[None, :num_nodes] - fwd[1:, None])
+        delta[~valid | np.isnan(delta)] = np.inf
+
+        best = int(np.argmin(delta))
+        i, j = divmod(best, num_nodes)
+        if not delta[i, j] < -EPS:
+            return tour
+        tour[i + 1:j + 1] = tour[i + 1:j + 1][::-1]
+
+def or_opt(cost, tour, max_segment=3):
+    """Zlepšuje trasu přesuny úseků délky 1..max_segment na jiné místo, dokud to jde"""
+    tour = np.array(tour, dtype=np.int64)
+    num_nodes = len(tour)
+    positions = np.arange(num_nodes)
+
+    improved = True
+    while improved:
+        improved = False
+        for length in range(1, max_segment + 1):
+            if num_nodes < length + 3:
+                break
+            first = tour
+            last = tour[(positions + length - 1) % num_nodes]
+            prev = tour[(positions - 1) % num_nodes]
+            nxt = tour[(positions + length) % num_nodes]
+            # úspora za vyjmutí úseku začínajícího na pozici s
+            gain = cost[prev, first] + cost[last, nxt] - cost[prev, nxt]
+
+            # cena vložení úseku s mezi tour[k] a tour[k + 1]
+            a = tour
+            b = np.roll(tour, -1)
+            delta = cost[a[None, :], first[:, None]] + cost[last[:, None], b[None, :]] - cost[a, b][None, :]
+            delta -= gain[:, None]
+
+            # hrana k nesmí sahat do přesouvaného úseku ani do hrany před ním
+            offset = (positions[None, :] - positions[:, None]) % num_nodes
+            delta[(offset < length) | (offset == num_nodes - 1) | np.isnan(delta)] = np.inf
+
+            best = int(np.argmin(delta))
+            s, k = divmod(best, num_nodes)
+            if delta[s, k] < -EPS:
+                rotated = np.roll(tour, -s)
+                segment = rotated[:length]
+                rest = rotated[length:]
+                q = (k - s) % num_nodes - length
+                tour = np.concatenate((rest[:q + 1], segment, rest[q + 1:]))
+                improved = True
+    return tour
+
+def improve_tour(cost, tour):
+    """Střídá 2-opt a Or-opt, dokud některý z nich trasu zlepšuje"""
+    tour = np.array(tour, dtype=np.int64)
+    current = tour_cost(cost, tour)
+    while True:
+        tour = or_opt(cost, two_opt(cost, tour))
+        new_cost = tour_cost(cost, tour)
+        if not new_cost < current - EPS:
+            return tour
+        current = new_cost
+
+def heuristic_tour(cost, start=0):
+    """Nejbližší soused z uzlu start zlepšený 2-opt a Or-opt tahy
+
+    Vrací None, pokud se trasu konečné délky najít nepodařilo (zakázané hrany).
+    """
+    cost = np.array(cost, dtype=np.float64)
+    np.fill_diagonal(cost, np.inf)
+    if len(cost) < 2:
+        return np.arange(len(cost))
+    with np.errstate(invalid="ignore"):
+        tour = improve_tour(cost, nearest_neighbour(cost, start))
+    return tour if is_valid_tour(cost, tour) else None
@@ -0,0 +1,118 @@
+from time import perf_counter
+import numpy as np
+from core.heuristics import improve_tour, EPS
+from core.lin_kernighan import lk_tour
+from core.models import SolverProgress
+from core.solvers import cost_array, solve_tsp, FULL_HEURISTIC_MAX_NODES
+from core.tours import solution_tour, tour_edges
+
+# Přepočet trasy po malé úpravě matice (what-if změny v editoru)
+# Předchozí trasa je výchozí řešení, lokální hledání (LK/Or-opt, záměny úseků) začíná
+# jen u uzlů dotčených změnou. Dolní mez předchozího výpočtu se posune o součet snížení vzdáleností
+# (žádná trasa nemůže zlevnit víc) - pokud ji nová trasa dosáhne, je optimum potvrzeno.
+# Jinak může výsledek lokálního hledání posloužit jako výchozí řešení přesného výpočtu (solve_tsp).
+
+# nejvyšší podíl uzlů dotčených změnou, kdy se ještě vyplatí přepočet místo nového výpočtu
+SMALL_EDIT_FRACTION = 0.25
+
+def changed_cells(old_cost, new_cost):
+    """Vrátí (rows, cols, delta) buněk mimo diagonálu, které se změnily, delta = nová - stará"""
+    diff = np.asarray(new_cost, dtype=np.float64) - np.asarray(old_cost, dtype=np.float64)
+    np.fill_diagonal(diff, 0.0)
+    rows, cols = np.nonzero(diff)
+    return rows, cols, diff[rows, cols]
+
+def is_small_edit(previous_matrix, matrix, max_fraction=SMALL_EDIT_FRACTION):
+    """Zjistí, zda se matice liší od předchozí jen v několika uzlech (stejné popisky)"""
+    if previous_matrix is None or matrix is None:
+        return False
+    if list(previous_matrix.index) != list(matrix.index) or list(previous_matrix.columns) != list(matrix.columns):
+        return False
+    rows, cols, _ = changed_cells(cost_array(previous_matrix), cost_array(matrix))
+    touched = np.union1d(rows, cols)
+    return len(touched) <= max_fraction * len(matrix)
+
+def segment_exchange(cost, tour, anchors):
+    """Zlepšuje trasu záměnou dvou sousedních úseků za hranou vycházející z uzlu kotvy
+
+    Tah ruší tři hrany a úseky nepřevrací, hodí se proto i pro nesymetrické matice.
+    Pro každou kotvu se vyhodnotí všechny dvojice dalších hran najednou (pole n x n).
+    """
+    tour = np.array(tour, dtype=np.int64)
+    num_nodes = len(tour)
+    upper = np.triu(np.ones((num_nodes, num_nodes), dtype=bool), 1)
+    upper[0] = False
+    pending = list(anchors)
+    while pending:
+        anchor = pending.pop()
+        # kotva na začátek, zkoumaná hrana je (r[0], r[1])
+        r = np.roll(tour, -int(np.nonzero(tour == anchor)[0][0]))
+        nxt = np.roll(r, -1)
+        removed = cost[r, nxt]
+        # r[0] -> r[j+1] ... r[k] -> r[1] ... r[j] -> r[k+1]
+        delta = (cost[r[0], nxt][:, None] + cost[r, r[1]][None, :] + cost[r[:, None], nxt[None, :]]
+                 - removed[0] - removed[:, None] - removed[None, :])
+        delta = np.where(upper, delta, np.inf)
+        j, k = np.unravel_index(np.argmin(delta), delta.shape)
+        if delta[j, k] < -EPS:
+            tour = np.concatenate((r[:1], r[j + 1:k + 1], r[1:j + 1], r[k + 1:]))
+            pending.extend(int(node) for node in (r[0], r[j], r[k]))
+    return tour
+
+def reoptimize(matrix, previous_solution, previous_matrix, lower_bound=None, time_limit=None, progress=None,
+               solver_options=None):
+    """Přepočítá trasu po úpravě matice, vrací seznam hran s popisky jako solve_tsp
+
+    previous_solution - řešení pro previous_matrix, lower_bound - jeho dolní mez (je-li známa).
+    Změněné buňky určí rozdíl obou matic; lokální hledání začne od jejich uzlů a jejich
+    sousedů na trase. progress dostane zprávu se zdrojem "incremental".
+    solver_options - parametry solve_tsp; pokud jsou zadané a optimum lokálního hledání není
+    potvrzené dolní mezí, trasa se předá solve_tsp jako výchozí řešení (initial_solution)
+    a vrátí se výsledek přesného výpočtu. Zpráva "incremental" pak nemá final=True.
+    Bez solver_options je výsledek jen heuristický, pokud jej dolní mez nepotvrdí.
+    """
+    start_time = perf_counter()
+    nodes = list(matrix.index)
+    if list(previous_matrix.index) != nodes:
+        raise ValueError("Předchozí řešení patří k matici s jinými uzly")
+
+    cost = cost_array(matrix)
+    rows, cols, delta = changed_cells(cost_array(previous_matrix), cost)
+    tour = solution_tour(previous_solution, nodes)
+
+    # žádná trasa nezlevní o víc než součet všech snížení
+    if lower_bound is not None:
+        lower_bound = float(lower_bound + delta[delta < 0].sum())
+
+    if len(delta) and len(tour) >= 4:
+        # uzly změněných hran a jejich sousedé na trase
+        pos = np.empty(len(tour), dtype=np.int64)
+        pos[tour] = np.arange(len(tour))
+        touched = np.union1d(rows, cols)
+        active = np.unique(np.concatenate((touched, tour[(pos[touched] + 1) % len(tour)],
+                                           tour[(pos[touched] - 1) % len(tour)])))
+
+        search_cost = np.array(cost, dtype=np.float64)
+        np.fill_diagonal(search_cost, np.inf)
+        tour = lk_tour(search_cost, time_limit=time_limit, initial_tour=tour, active=active)
+        if len(tour) <= FULL_HEURISTIC_MAX_NODES:
+            tour = segment_exchange(search_cost, tour, active)
+        total = float(cost[tour, np.roll(tour, -1)].sum())
+        # malé matice doladíme úplným 2-opt/Or-opt, pokud optimum ještě není potvrzeno
+        proven = SolverProgress(total, lower_bound, None, 0.0, "incremental").proven
+        if not proven and len(tour) <= FULL_HEURISTIC_MAX_NODES:
+            tour = improve_tour(search_cost, tour)
+
+    edges = tour_edges(tour)
+    solution = [(nodes[i], nodes[j]) for i, j in edges]
+    total = float(cost[tour, np.roll(tour, -1)].sum())
+    if lower_bound is not None:
+        lower_bound = min(lower_bound, total)
+    update = SolverProgress(total, lower_bound, solution, perf_counter() - start_time, "incremental")
+    exact = solver_options is not None and not update.proven
+    update.final = not exact
+    if progress is not None:
+        progress(update)
+    if exact:
+        return solve_tsp(matrix, progress=progress, initial_solution=solution, **solver_options)
+    return solution
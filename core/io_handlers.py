@@ -1,58 +1,386 @@
+import hashlib
+import json
+import os
 import pandas as pd
+import numpy as np
 import re
-from openpyxl.utils import get_column_letter
+from openpyxl import load_workbook
+from core.models import DistanceMatrix, CoordinateMatrix, as_solution, gather_costs
+from core.xlsx_writer import StreamingWorkbook
 
-def read_excel(filename):
-    """Načte data z Excel souboru"""
-    df = pd.read_excel(filename, index_col=0)
+# binarni kopie matice vedle sesitu (hodnoty .npy + popisky .json) - dalsi nacteni
+# jen namapuje pole z disku misto parsovani XML; platnost urcuje cas zmeny a SHA-256 sesitu
+SIDECAR_SUFFIX = ".tsp.npy"
+METADATA_SUFFIX = ".tsp.json"
+SIDECAR_VERSION = 1
+
+def file_digest(filename, chunk_size=1024 ** 2):
+    """Vrátí SHA-256 obsahu souboru (čte po blocích)"""
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def sidecar_paths(filename):
+    """Vrátí cesty (hodnoty, metadata) binární kopie matice pro daný sešit"""
+    return filename + SIDECAR_SUFFIX, filename + METADATA_SUFFIX
+
+def load_sidecar(filename):
+    """Načte matici z platné binární kopie (paměťově mapované), jinak vrátí None"""
+    values_path, meta_path = sidecar_paths(filename)
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        stat = os.stat(filename)
+        if meta.get("version") != SIDECAR_VERSION or meta["size"] != stat.st_size:
+            return None
+        if meta["mtime_ns"] != stat.st_mtime_ns:
+            # soubor byl jen "dotčen" (kopie, uložení beze změny) - rozhodne obsah
+            if meta["sha256"] != file_digest(filename):
+                return None
+            meta["mtime_ns"] = stat.st_mtime_ns
+            write_metadata(meta_path, meta)
+        # copy-on-write mapování - úpravy matice v aplikaci se do souboru nepropíší
+        values = np.load(values_path, mmap_mode="c")
+    except (OSError, ValueError, KeyError):
+        return None
+    index = pd.Index(meta["index"], name=meta["index_name"])
+    columns = pd.Index(meta["columns"])
+    if values.shape != (len(index), len(columns)):
+        return None
+    return pd.DataFrame(values, index=index, columns=columns)
+
+def write_metadata(meta_path, meta):
+    """Zapíše metadata binární kopie přes dočasný soubor"""
+    tmp_path = meta_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp_path, meta_path)
+
+def save_sidecar(filename, df):
+    """Uloží binární kopii matice vedle sešitu (jen čistě číselné matice, chyby zápisu ignoruje)"""
+    if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in df.dtypes):
+        return
+    values_path, meta_path = sidecar_paths(filename)
+    labels = [label.item() if isinstance(label, np.generic) else label for label in df.index]
+    columns = [label.item() if isinstance(label, np.generic) else label for label in df.columns]
+    try:
+        stat = os.stat(filename)
+        meta = {
+            "version": SIDECAR_VERSION,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": file_digest(filename),
+            "index": labels,
+            "columns": columns,
+            "index_name": df.index.name,
+        }
+        tmp_path = values_path + ".tmp.npy"
+        np.save(tmp_path, np.ascontiguousarray(df.to_numpy(dtype=np.float64)))
+        os.replace(tmp_path, values_path)
+        # metadata až po hodnotách - rozepsaná kopie se nikdy nepovažuje za platnou
+        write_metadata(meta_path, meta)
+    except (OSError, TypeError, ValueError):
+        pass
+
+def read_excel_streaming(filename):
+    """Načte matici přes openpyxl v režimu jen pro čtení (řádky jako n-tice hodnot, bez objektů buněk)
+
+    První řádek jsou popisky sloupců, první sloupec popisky řádků. Nečíselné hodnoty
+    nebo duplicitní popisky vyvolají ValueError.
+    """
+    workbook = load_workbook(filename, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            raise ValueError("Prázdný list")
+        # prázdné buňky na konci záhlaví nepatří k matici
+        width = len(header)
+        while width > 1 and header[width - 1] is None:
+            width -= 1
+        columns = list(header[1:width])
+        labels = []
+        values = []
+        for row in rows:
+            row = tuple(row[:width]) + (None,) * (width - len(row))
+            if all(value is None for value in row):
+                continue
+            labels.append(row[0])
+            values.append(row[1:])
+    finally:
+        workbook.close()
+    if len(set(columns)) != len(columns) or len(set(labels)) != len(labels):
+        raise ValueError("Duplicitní popisky uzlů")
+    data = np.array(values, dtype=np.float64).reshape(len(labels), len(columns))
+    return pd.DataFrame(data, index=pd.Index(labels, name=header[0]), columns=columns)
+
+def read_excel(filename, use_sidecar=True):
+    """Načte data z Excel souboru
+
+    S use_sidecar=True se matice při prvním načtení uloží i jako binární kopie vedle sešitu
+    a další načtení ji jen paměťově namapuje. Sešity .xlsx se čtou proudově přes openpyxl,
+    ostatní formáty (nebo nečíselné tabulky) přes pandas.
+    """
+    if use_sidecar:
+        df = load_sidecar(filename)
+        if df is not None:
+            return df
+    try:
+        if not filename.lower().endswith((".xlsx", ".xlsm")):
+            raise ValueError("Proudové čtení podporuje jen .xlsx")
+        df = read_excel_streaming(filename)
+    except (ValueError, TypeError):
+        df = pd.read_excel(filename, index_col=0)
+    if use_sidecar:
+        save_sidecar(filename, df)
     return df
 
 # odstraneni spec. znaku z nazvu listu
 def sanitize_sheet_name(name):
     return re.sub(r'[\\/*?[\]:]', '', name)[:31]
 
-# zapis vystupu do excelu - openpyxl
+# nazvy sloupcu se souradnicemi (porovnavaji se bez diakritiky a velikosti pismen)
+LATITUDE_COLUMNS = ("lat", "latitude", "sirka", "zemepisna_sirka")
+LONGITUDE_COLUMNS = ("lon", "lng", "long", "longitude", "delka", "zemepisna_delka")
+X_COLUMNS = ("x",)
+Y_COLUMNS = ("y",)
+
+def normalize_column(name):
+    """Sjednotí název sloupce pro rozpoznání souřadnic (malá písmena, bez diakritiky)"""
+    text = str(name).strip().lower().replace(" ", "_")
+    return text.translate(str.maketrans("áčďéěíňóřšťúůýž", "acdeeinorstuuyz"))
+
+def find_coordinate_columns(columns):
+    """Vrátí (sloupec 1, sloupec 2, metrika) podle názvů sloupců, nebo None"""
+    names = {normalize_column(column): column for column in columns}
+    for first, second, metric in ((LATITUDE_COLUMNS, LONGITUDE_COLUMNS, "haversine"),
+                                  (X_COLUMNS, Y_COLUMNS, "euclidean")):
+        a = next((names[name] for name in first if name in names), None)
+        b = next((names[name] for name in second if name in names), None)
+        if a is not None and b is not None:
+            return a, b, metric
+    return None
+
+def read_coordinates(filename, metric=None):
+    """Načte body se souřadnicemi z CSV nebo Excelu jako CoordinateMatrix
+
+    Sloupce lat/lon (šířka/délka) -> vzdálenost po kouli v km, x/y -> eukleidovská;
+    jinak se použijí první dva číselné sloupce za sloupcem s názvy bodů.
+    První sloupec jsou názvy bodů (pokud to není souřadnice, jinak se body očíslují).
+    """
+    if filename.lower().endswith((".csv", ".txt")):
+        df = pd.read_csv(filename, sep=None, engine="python")
+    else:
+        df = pd.read_excel(filename)
+    found = find_coordinate_columns(df.columns)
+    if found is not None:
+        first, second, detected = found
+    else:
+        numeric = [column for column in df.columns[1:] if pd.api.types.is_numeric_dtype(df[column])]
+        if len(numeric) < 2:
+            raise ValueError("V souboru nejsou rozpoznány sloupce se souřadnicemi")
+        first, second, detected = numeric[0], numeric[1], "euclidean"
+    df = df.dropna(subset=[first, second])
+    label_column = df.columns[0]
+    if label_column in (first, second):
+        labels = [str(i + 1) for i in range(len(df))]
+    else:
+        labels = [str(label) for label in df[label_column]]
+    if len(set(labels)) != len(labels):
+        raise ValueError("Duplicitní názvy bodů")
+    coordinates = df[[first, second]].to_numpy(dtype=np.float64)
+    return CoordinateMatrix(coordinates, labels, metric or detected)
+
+def is_coordinate_file(filename):
+    """Zjistí podle přípony a záhlaví, zda soubor obsahuje souřadnice bodů místo matice"""
+    lower = filename.lower()
+    if lower.endswith((".csv", ".txt")):
+        return True
+    if lower.endswith((".xlsx", ".xlsm")):
+        workbook = load_workbook(filename, read_only=True, data_only=True)
+        try:
+            header = next(workbook.worksheets[0].iter_rows(max_row=1, values_only=True), ())
+        finally:
+            workbook.close()
+    else:
+        header = list(pd.read_excel(filename, nrows=0).columns)
+    header = [value for value in header if value is not None]
+    # matice má sloupec pro každý uzel, tabulka bodů jen pár sloupců
+    return len(header) <= 4 and find_coordinate_columns(header) is not None
+
+def read_input(filename, metric=None):
+    """Načte vstup - matici vzdáleností (read_excel) nebo souřadnice bodů (read_coordinates)"""
+    if is_coordinate_file(filename):
+        return read_coordinates(filename, metric)
+    return read_excel(filename)
+
+def leg_costs(matrix, sequence):
+    """Vrátí pole vzdáleností jednotlivých úseků uzavřené trasy zadané pořadím míst"""
+    rows = matrix.index.get_indexer(sequence)
+    cols = matrix.columns.get_indexer(sequence[1:] + sequence[:1])
+    return gather_costs(matrix, rows, cols)
+
+# nejvetsi matice, ktera se vejde na list Excelu (16384 sloupcu vcetne popisku)
+EXCEL_MAX_NODES = 16383
+
+# velikost bloku radku pri zapisu matice z DataFrame
+WRITE_BLOCK_ROWS = 1024
+
+def matrix_row_blocks(matrix):
+    """Prochází matici po blocích řádků, vrací (první řádek, pole hodnot)"""
+    if isinstance(matrix, DistanceMatrix):
+        yield from matrix.row_blocks()
+        return
+    try:
+        values = matrix.to_numpy(dtype=np.float64)
+    except (ValueError, TypeError):
+        values = matrix.to_numpy(dtype=object)  # nečíselné buňky se zapíšou tak, jak jsou
+    for start in range(0, len(values), WRITE_BLOCK_ROWS):
+        yield start, values[start:start + WRITE_BLOCK_ROWS]
+
+def write_matrix_sheet(worksheet, matrix, solution):
+    """Zapíše matici na list po řádcích, hodnoty vybraných hran (TSPSolution) rovnou tučně"""
+    labels = list(matrix.index)
+    # sloupec vybrané hrany pro každý řádek (+1 za sloupec s popisky, -1 = bez vybrané hrany)
+    selected = np.full(len(labels), -1, dtype=np.int64)
+    columns = matrix.columns.get_indexer(solution.node_sequence)
+    selected[solution.tour] = np.roll(columns, -1) + 1
+    selected = selected.tolist()
+
+    # v levém horním rohu název indexu jako u DataFrame.to_excel
+    worksheet.append([getattr(matrix.index, "name", None)] + list(matrix.columns))
+    for start, block in matrix_row_blocks(matrix):
+        for offset, row in enumerate(block.tolist()):
+            i = start + offset
+            worksheet.append([labels[i]] + row, bold_columns=(selected[i],))
+
+def write_table_sheet(workbook, sheet_name, columns):
+    """Zapíše list se záhlavím a sloupci zadanými jako {název: hodnoty}"""
+    worksheet = workbook.create_sheet(sanitize_sheet_name(sheet_name))
+    worksheet.append(list(columns))
+    for row in zip(*columns.values()):
+        worksheet.append(list(row))
+
+# zapis vystupu do excelu - proudove po radcich (core.xlsx_writer), pamet nezavisi na velikosti matice
 def write_excel(matrix, solution, cycles, filename):
     print("Zapisovani do Excelu.")
-    writer = pd.ExcelWriter(filename, engine='openpyxl')
-    matrix.to_excel(writer, sheet_name='Matice_optimum')
-    workbook = writer.book
-    worksheet = writer.sheets['Matice_optimum']
-    
-    # tucne oznacit hodnoty vybrane algoritmem v matici
-    for edge in solution:
-        row_index = matrix.index.get_loc(edge[0]) + 2
-        col_index = matrix.columns.get_loc(edge[1]) + 2
-        cell = worksheet.cell(row=row_index, column=col_index)
-        cell.font = cell.font.copy(bold=True)
+    solution = as_solution(matrix, solution)
+    workbook = StreamingWorkbook(filename)
+    if isinstance(matrix, CoordinateMatrix):
+        # vstup byl zadán souřadnicemi - místo matice n x n se zapíšou body
+        names = ("Sirka", "Delka") if matrix.metric == "haversine" else ("X", "Y")
+        write_table_sheet(workbook, 'Souradnice', {'Bod': list(matrix.index),
+                                                   names[0]: matrix.coordinates[:, 0].tolist(),
+                                                   names[1]: matrix.coordinates[:, 1].tolist()})
+    elif len(matrix) <= EXCEL_MAX_NODES:
+        write_matrix_sheet(workbook.create_sheet('Matice_optimum'), matrix, solution)
+    else:
+        print(f"Matice {len(matrix)}x{len(matrix)} se na list Excelu nevejde, list Matice_optimum se vynechá.")
 
     # výpočet vzdálenosti
-    sum_distance = sum(matrix.loc[node[0], node[1]] for node in solution)
-    pd.DataFrame({'Soucet_vzdalenosti': [sum_distance]}).to_excel(writer, sheet_name='Soucet_vzdalenosti', index=False)
+    write_table_sheet(workbook, 'Soucet_vzdalenosti', {'Soucet_vzdalenosti': [solution.total_distance]})
 
     # posloupnost míst-zapis do excelu
     if solution:  # kontrola, zda máme řešení
-        nodes_sequence = [solution[0][0]]
-        current_node = solution[0][1]
-        while current_node != solution[0][0]:
-            nodes_sequence.append(current_node)
-            for edge in solution:
-                if edge[0] == current_node:
-                    current_node = edge[1]
-                    break
-        nodes_sequence.append(solution[0][0])  # přidání návratu do výchozího bodu
-        pd.DataFrame({'Posloupnost_mist': nodes_sequence}).to_excel(writer, sheet_name='Posloupnost_mist', index=False)
+        nodes_sequence = solution.node_sequence
+        nodes_sequence = nodes_sequence + nodes_sequence[:1]  # přidání návratu do výchozího bodu
+        write_table_sheet(workbook, 'Posloupnost_mist', {'Posloupnost_mist': nodes_sequence})
 
     # okruhy a jejich delky-zapis do excelu
     cycle_data = []
     for cycle in cycles:
-        cycle_length = matrix.loc[cycle[-1], cycle[0]] + sum(matrix.loc[cycle[j], cycle[j + 1]] for j in range(len(cycle) - 1))
+        cycle_length = float(leg_costs(matrix, list(cycle)).sum())
         cycle_data.append((", ".join(cycle), cycle_length))
     
     if cycle_data:  # kontrola, zda máme data
-        pd.DataFrame({'Okruh': [data[0] for data in cycle_data],
-                    'Vzdalenost': [data[1] for data in cycle_data]}).to_excel(
-            writer, sheet_name='Alternativni_okruhy', index=False)
+        write_table_sheet(workbook, 'Alternativni_okruhy', {'Okruh': [data[0] for data in cycle_data],
+                                                            'Vzdalenost': [data[1] for data in cycle_data]})
+
+    workbook.close()
+    print("Vystup se ulozi do: ", filename)
+
+# kompaktni vystupy - jen trasa a souhrn, matice n x n se znovu nezapisuje
+def edge_table(matrix, solution):
+    """Tabulka úseků trasy v pořadí jízdy (pořadí, odkud, kam, vzdálenost, kumulativně)"""
+    solution = as_solution(matrix, solution)
+    sequence = solution.node_sequence
+    return pd.DataFrame({
+        'poradi': np.arange(1, len(sequence) + 1),
+        'z': [str(node) for node in sequence],
+        'do': [str(node) for node in sequence[1:] + sequence[:1]],
+        'vzdalenost': solution.leg_costs,
+        'kumulativni_vzdalenost': solution.prefix_costs[1:],
+    })
+
+def write_json(matrix, solution, cycles, filename):
+    """Zapíše trasu, její úseky, součet a alternativní okruhy jako JSON"""
+    solution = as_solution(matrix, solution)
+    sequence = solution.node_sequence
+    costs = solution.leg_costs.tolist()
+    result = {
+        'soucet_vzdalenosti': solution.total_distance,
+        'pocet_mist': len(sequence),
+        'posloupnost_mist': [str(node) for node in sequence + sequence[:1]],
+        'hrany': [{'z': str(a), 'do': str(b), 'vzdalenost': cost}
+                  for a, b, cost in zip(sequence, sequence[1:] + sequence[:1], costs)],
+        'alternativni_okruhy': [{'okruh': [str(node) for node in cycle],
+                                 'vzdalenost': float(leg_costs(matrix, list(cycle)).sum())}
+                                for cycle in cycles],
+    }
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=1)
+    print("Vystup se ulozi do: ", filename)
+
+def require_pyarrow():
+    """Ověří, že je k dispozici volitelný balíček pyarrow (Parquet/Arrow)"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError("Export do Parquet/Arrow vyžaduje balíček pyarrow (pip install pyarrow)") from None
+
+def write_parquet(matrix, solution, cycles, filename):
+    """Zapíše tabulku úseků trasy do Parquet (vyžaduje pyarrow)"""
+    require_pyarrow()
+    edge_table(matrix, solution).to_parquet(filename, index=False)
+    print("Vystup se ulozi do: ", filename)
+
+def write_arrow(matrix, solution, cycles, filename):
+    """Zapíše tabulku úseků trasy jako soubor Arrow IPC / Feather (vyžaduje pyarrow)"""
+    require_pyarrow()
+    edge_table(matrix, solution).to_feather(filename)
+    print("Vystup se ulozi do: ", filename)
+
+def write_npz(matrix, solution, cycles, filename):
+    """Zapíše trasu jako pole indexů uzlů, popisky a vzdálenosti úseků (NumPy .npz)"""
+    solution = as_solution(matrix, solution)
+    np.savez_compressed(filename,
+                        tour=solution.tour,
+                        labels=np.array([str(node) for node in solution.labels]),
+                        leg_costs=solution.leg_costs,
+                        total_distance=np.float64(solution.total_distance))
+    print("Vystup se ulozi do: ", filename)
+
+# podporované výstupní formáty: název -> (přípona souboru, funkce zápisu)
+EXPORT_FORMATS = {
+    'xlsx': ('.xlsx', write_excel),
+    'json': ('.json', write_json),
+    'parquet': ('.parquet', write_parquet),
+    'arrow': ('.arrow', write_arrow),
+    'npz': ('.npz', write_npz),
+}
+
+def format_from_filename(filename, default='xlsx'):
+    """Odhadne výstupní formát podle přípony souboru"""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.feather':
+        return 'arrow'
+    return next((name for name, (ext, _) in EXPORT_FORMATS.items() if ext == extension), default)
 
-    writer._save()
-    print("Vystup se ulozi do: ", filename)
\ No newline at end of file
+def write_result(matrix, solution, cycles, filename, fmt=None):
+    """Zapíše výsledek ve zvoleném formátu (výchozí podle přípony souboru, jinak Excel)"""
+    fmt = fmt or format_from_filename(filename)
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Neznámý výstupní formát {fmt!r}, podporované jsou {', '.join(EXPORT_FORMATS)}")
+    EXPORT_FORMATS[fmt][1](matrix, solution, cycles, filename)
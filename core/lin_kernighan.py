@@ -0,0 +1,251 @@
+from collections import deque
+from time import perf_counter
+import numpy as np
+from core.heuristics import EPS
+from core.symmetry import is_symmetric
+
+# Heuristika pro velké instance (1k-10k uzlů) ve stylu Lin-Kernighan
+# - kandidátní seznamy k nejbližších sousedů se spočítají jednou po blocích matice
+# - trasa je pole uzlů + pole pozic, tahy mění jen dotčené úseky
+# - "don't-look" bity: zkoumají se jen uzly, v jejichž okolí se trasa změnila
+# Symetrické matice používají LK řetězce 2-opt tahů (obracení úseků) a Or-opt,
+# nesymetrické jen Or-opt přesuny úseků bez obrácení (obrácení by měnilo cenu úseku).
+
+# velikost bloku řádků při hledání nejbližších sousedů (omezuje pomocnou paměť)
+BLOCK_ROWS = 1024
+
+def neighbour_lists(cost, k=8):
+    """Vrátí pole (n, k) s k nejbližšími sousedy každého uzlu podle řádku matice"""
+    num_nodes = len(cost)
+    k = min(k, num_nodes - 1)
+    result = np.empty((num_nodes, k), dtype=np.int64)
+    for start in range(0, num_nodes, BLOCK_ROWS):
+        stop = min(start + BLOCK_ROWS, num_nodes)
+        block = np.array(cost[start:stop], dtype=np.float64)
+        block[np.arange(stop - start), np.arange(start, stop)] = np.inf
+        nearest = np.argpartition(block, k - 1, axis=1)[:, :k]
+        order = np.argsort(np.take_along_axis(block, nearest, axis=1), axis=1)
+        result[start:stop] = np.take_along_axis(nearest, order, axis=1)
+    return result
+
+def greedy_neighbour_tour(cost, neighbours, start=0):
+    """Nejbližší soused s využitím kandidátních seznamů (celý řádek jen když jsou sousedé obsazení)
+
+    Vybírá se jen z nenavštívených uzlů, výsledek je tedy vždy permutace (délka může být nekonečná).
+    """
+    num_nodes = len(cost)
+    visited = np.zeros(num_nodes, dtype=bool)
+    tour = np.empty(num_nodes, dtype=np.int64)
+    current = start
+    for k in range(num_nodes):
+        tour[k] = current
+        visited[current] = True
+        if k == num_nodes - 1:
+            break
+        candidates = [j for j in neighbours[current] if not visited[j]]
+        if candidates:
+            current = candidates[0]
+        else:
+            unvisited = np.flatnonzero(~visited)
+            row = np.asarray(cost[current], dtype=np.float64)
+            current = int(unvisited[np.argmin(row[unvisited])])
+    return tour
+
+class ArrayTour:
+    """Trasa uložená jako pole uzlů a pole pozic uzlů"""
+
+    def __init__(self, tour):
+        self.tour = np.array(tour, dtype=np.int64)
+        self.n = len(self.tour)
+        self.pos = np.empty(self.n, dtype=np.int64)
+        self.pos[self.tour] = np.arange(self.n)
+
+    def succ(self, node):
+        return int(self.tour[(self.pos[node] + 1) % self.n])
+
+    def pred(self, node):
+        return int(self.tour[(self.pos[node] - 1) % self.n])
+
+    def reverse_positions(self, start, length):
+        """Obrátí úsek trasy dané délky začínající na pozici start (cyklicky)"""
+        idx = (start + np.arange(length)) % self.n
+        self.tour[idx] = self.tour[idx[::-1]]
+        self.pos[self.tour[idx]] = idx
+
+    def reverse_path(self, first, last):
+        """Obrátí cestu first..last (po směru trasy), případně kratší doplněk; vrací (start, délka)"""
+        length = (self.pos[last] - self.pos[first]) % self.n + 1
+        if 2 * length <= self.n:
+            start = int(self.pos[first])
+        else:
+            start = int((self.pos[last] + 1) % self.n)
+            length = self.n - length
+        self.reverse_positions(start, length)
+        return start, length
+
+    def move_segment(self, first, length, after, reverse=False):
+        """Přesune úsek délky length začínající uzlem first za uzel after"""
+        start = int(self.pos[first])
+        idx = (start + np.arange(length)) % self.n
+        segment = self.tour[idx]
+        if reverse:
+            segment = segment[::-1]
+        rest = np.roll(self.tour, -(start + length))[:self.n - length]
+        insert_at = int(np.nonzero(rest == after)[0][0]) + 1
+        self.tour = np.concatenate((rest[:insert_at], segment, rest[insert_at:]))
+        self.pos[self.tour] = np.arange(self.n)
+
+def lk_step(cost, tour, neighbours, t1, max_depth):
+    """Zkusí z uzlu t1 řetěz 2-opt tahů (LK); ponechá nejlepší zlepšení, vrací dotčené uzly"""
+    touched = [t1]
+    for direction in (1, -1):
+        t2 = tour.succ(t1) if direction == 1 else tour.pred(t1)
+        applied = []  # (start, délka) provedených obrácení pro případné vrácení
+        added = set()
+        delta = 0.0
+        best_delta = 0.0
+        best_step = 0
+        chain_nodes = [t1, t2]
+
+        for _ in range(max_depth):
+            # zisk otevřeného řetězce (bez uzavírací hrany t2-t1)
+            open_gain = -delta + cost[t1, t2]
+            best_choice = None
+            best_gain = EPS
+            for t3 in neighbours[t2]:
+                g1 = open_gain - cost[t2, t3]
+                if g1 <= EPS:
+                    break  # sousedé jsou seřazení, další už zisk nedají
+                if t3 == t1:
+                    continue
+                t4 = tour.pred(t3) if direction == 1 else tour.succ(t3)
+                if t4 == t2 or (min(t3, t4), max(t3, t4)) in added:
+                    continue
+                gain = g1 + cost[t4, t3]
+                if gain > best_gain:
+                    best_gain, best_choice = gain, (t3, t4)
+            if best_choice is None:
+                break
+
+            t3, t4 = best_choice
+            step_delta = cost[t2, t3] + cost[t4, t1] - cost[t1, t2] - cost[t4, t3]
+            if direction == 1:
+                applied.append(tour.reverse_path(t2, t4))
+            else:
+                applied.append(tour.reverse_path(t1, t3))
+            added.add((min(t2, t3), max(t2, t3)))
+            delta += step_delta
+            chain_nodes.extend((t3, t4))
+            if delta < best_delta - EPS:
+                best_delta, best_step = delta, len(applied)
+
+            # nový t2 je soused t1 přes uzavírací hranu
+            t2 = t4
+            direction = 1 if tour.succ(t1) == t4 else -1
+
+        # vrátit tahy za nejlepším krokem
+        for start, length in reversed(applied[best_step:]):
+            tour.reverse_positions(start, length)
+        if best_step:
+            touched.extend(chain_nodes)
+            return touched, best_delta
+    return touched, 0.0
+
+def or_opt_step(cost, tour, neighbours, in_neighbours, t1, max_segment, symmetric):
+    """Zkusí přesunout úsek začínající uzlem t1 k některému z jeho kandidátních sousedů"""
+    n = tour.n
+    for length in range(1, max_segment + 1):
+        if n < length + 3:
+            break
+        first = t1
+        last = int(tour.tour[(tour.pos[first] + length - 1) % n])
+        p = tour.pred(first)
+        q = tour.succ(last)
+        remove_gain = cost[p, first] + cost[last, q] - cost[p, q]
+        if remove_gain <= EPS:
+            continue
+        segment = set(int(tour.tour[(tour.pos[first] + m) % n]) for m in range(length))
+
+        best = None
+        best_delta = -EPS
+        # vložení a -> first ... last -> b, kde a je blízký předchůdce first
+        for a in in_neighbours[first]:
+            if a in segment or a == p:
+                continue
+            b = tour.succ(a)
+            if b in segment:
+                continue
+            d = cost[a, first] + cost[last, b] - cost[a, b] - remove_gain
+            if d < best_delta:
+                best_delta, best = d, (a, False)
+        # obrácené vložení a -> last ... first -> b (jen symetrické matice)
+        if symmetric:
+            for a in neighbours[last]:
+                if a in segment or a == p:
+                    continue
+                b = tour.succ(a)
+                if b in segment:
+                    continue
+                d = cost[a, last] + cost[first, b] - cost[a, b] - remove_gain
+                if d < best_delta:
+                    best_delta, best = d, (a, True)
+
+        if best is not None:
+            a, reverse = best
+            b = tour.succ(a)
+            tour.move_segment(first, length, a, reverse)
+            return [first, last, p, q, a, b], best_delta
+    return [], 0.0
+
+def lk_tour(cost, k=8, max_depth=5, max_segment=3, time_limit=None, initial_tour=None, symmetric=None, start=0,
+            active=None):
+    """Heuristická trasa pro velké instance, vrací pole indexů uzlů
+
+    k - velikost kandidátních seznamů, max_depth - hloubka LK řetězce,
+    max_segment - nejdelší úsek pro Or-opt, time_limit - strop v sekundách,
+    start - počáteční uzel výchozí trasy (nejbližší soused),
+    active - uzly, od kterých se začne hledat (ostatní mají zapnutý don't-look bit), výchozí všechny.
+    """
+    start_time = perf_counter()
+    num_nodes = len(cost)
+    if num_nodes < 4:
+        return np.arange(num_nodes)
+    if symmetric is None:
+        symmetric = is_symmetric(cost)
+
+    neighbours = neighbour_lists(cost, k).tolist()
+    in_neighbours = neighbours if symmetric else neighbour_lists(cost.T, k).tolist()
+
+    if initial_tour is None:
+        initial_tour = greedy_neighbour_tour(cost, neighbours, start)
+    tour = ArrayTour(initial_tour)
+
+    # fronta uzlů s vypnutým don't-look bitem
+    if active is None:
+        queue = deque(range(num_nodes))
+        queued = np.ones(num_nodes, dtype=bool)
+    else:
+        queued = np.zeros(num_nodes, dtype=bool)
+        queued[np.asarray(active, dtype=np.int64)] = True
+        queue = deque(np.nonzero(queued)[0].tolist())
+    while queue:
+        if time_limit is not None and perf_counter() - start_time > time_limit:
+            break
+        t1 = queue.popleft()
+        queued[t1] = False
+
+        touched = []
+        if symmetric:
+            touched, delta = lk_step(cost, tour, neighbours, t1, max_depth)
+            if delta >= 0:
+                touched = []
+        if not touched:
+            touched, _ = or_opt_step(cost, tour, neighbours, in_neighbours, t1, max_segment, symmetric)
+
+        # po zlepšení znovu probudit uzly v okolí změněných hran
+        for node in touched:
+            if not queued[node]:
+                queued[node] = True
+                queue.append(node)
+
+    return tour.tour.copy()
@@ -1,19 +1,344 @@
 # Tento soubor může obsahovat datové modely a struktury pro TSP problém
-# V současné implementaci nejsou explicitní datové modely - používají se pandas DataFrame
-# a seznamy, ale můžeme zde připravit místo pro budoucí rozšíření
+# Matice se většinou předávají jako pandas DataFrame, velmi velké instance jako
+# DistanceMatrix (NumPy memmap na disku) se stejným rozhraním .index/.columns/.loc
 
+import json
+import math
+import os
 from dataclasses import dataclass
 from typing import List, Tuple, Optional
 
-# Příklad možného datového modelu (nepoužívá se v současné implementaci)
-@dataclass
+import numpy as np
+import pandas as pd
+
+from core.tours import tour_sequence
+
+# velikost bloku řádků při průchodu velkou maticí (omezuje pomocnou paměť)
+BLOCK_ROWS = 1024
+
+# střední poloměr Země v km pro vzdálenosti po kouli (haversine)
+EARTH_RADIUS_KM = 6371.0088
+
+# podporované metriky pro matici ze souřadnic
+METRICS = ("euclidean", "haversine")
+
+def gather_costs(matrix, rows, cols):
+    """Vrátí vzdálenosti buněk (rows[k], cols[k]) jako pole float64 bez průchodu přes .loc"""
+    if isinstance(matrix, DistanceMatrix):
+        return np.asarray(matrix.costs[rows, cols], dtype=np.float64)
+    return matrix.to_numpy()[rows, cols].astype(np.float64)
+
 class TSPSolution:
-    """Datový model pro řešení TSP problému"""
-    edges: List[Tuple[str, str]]
-    total_distance: float
-    node_sequence: List[str]
-    
+    """Řešení TSP nad konkrétní maticí - trasa jako pole indexů int32 a tabulka popisků
+
+    Vzdálenosti úseků, jejich prefixové součty a celková délka se spočtou jednou při vytvoření.
+    Iterace vrací hrany (odkud, kam) s popisky, len je počet míst trasy.
+    proven říká, zda je optimalita trasy prokázaná (jinak jde o heuristický výsledek).
+    """
+    __slots__ = ("tour", "labels", "leg_costs", "prefix_costs", "total_distance", "proven", "_sequence",
+                 "_positions")
+
+    def __init__(self, tour, labels, leg_costs, proven=False):
+        self.tour = np.asarray(tour, dtype=np.int32)
+        self.proven = proven
+        self.labels = labels
+        self.leg_costs = np.asarray(leg_costs, dtype=np.float64)
+        # prefix_costs[k] = vzdálenost od startu trasy do jejího k-tého místa
+        self.prefix_costs = np.concatenate(([0.0], np.cumsum(self.leg_costs)))
+        self.total_distance = float(self.prefix_costs[-1])
+        self._sequence = None
+        self._positions = None
+
+    @classmethod
+    def from_tour(cls, matrix, tour, proven=False):
+        """Vytvoří řešení z pole indexů uzlů matice v pořadí trasy"""
+        tour = np.asarray(tour, dtype=np.int64)
+        return cls(tour, list(matrix.index), gather_costs(matrix, tour, np.roll(tour, -1)), proven)
+
+    @classmethod
+    def from_edges(cls, matrix, solution, proven=False):
+        """Vytvoří řešení ze seznamu hran s popisky (výstup solve_tsp)"""
+        return cls.from_tour(matrix, matrix.index.get_indexer(tour_sequence(solution)), proven)
+
+    def __len__(self):
+        return len(self.tour)
+
+    def __iter__(self):
+        sequence = self.node_sequence
+        return zip(sequence, sequence[1:] + sequence[:1])
+
     @property
     def num_nodes(self) -> int:
         """Vrátí počet uzlů v řešení"""
-        return len(set([node for edge in self.edges for node in edge]))
\ No newline at end of file
+        return len(self.tour)
+
+    @property
+    def node_sequence(self) -> List[str]:
+        """Popisky míst v pořadí trasy (bez návratu do startu)"""
+        if self._sequence is None:
+            self._sequence = [self.labels[i] for i in self.tour.tolist()]
+        return self._sequence
+
+    @property
+    def edges(self) -> List[Tuple[str, str]]:
+        """Hrany trasy s popisky ve formátu solve_tsp"""
+        return list(self)
+
+    def position(self, node) -> int:
+        """Pořadí místa v trase (od 0)"""
+        if self._positions is None:
+            self._positions = {label: k for k, label in enumerate(self.node_sequence)}
+        return self._positions[node]
+
+    def distance_between(self, start, end) -> float:
+        """Vzdálenost po trase z pozice start na pozici end (přes konec trasy, pokud end < start)"""
+        distance = self.prefix_costs[end] - self.prefix_costs[start]
+        return float(distance if end >= start else distance + self.total_distance)
+
+def as_solution(matrix, solution):
+    """Vrátí TSPSolution - seznam hran převede, hotové řešení ponechá"""
+    if solution is None or isinstance(solution, TSPSolution):
+        return solution
+    return TSPSolution.from_edges(matrix, solution)
+
+@dataclass
+class SolverProgress:
+    """Průběžný stav výpočtu předávaný do callbacku progress v solve_tsp"""
+    upper_bound: Optional[float]  # délka nejlepší dosud nalezené trasy
+    lower_bound: Optional[float]  # dolní mez optima, pokud je známa
+    solution: Optional[List[Tuple[str, str]]]  # hrany nejlepší trasy, pokud jsou k dispozici
+    elapsed: float  # sekundy od začátku výpočtu
+    source: str  # odkud zpráva pochází (heuristika, CBC, větve a meze...)
+    final: bool = False  # poslední zpráva výpočtu
+    message: Optional[str] = None  # doplňující text pro log (např. statistika předzpracování)
+
+    @property
+    def gap(self) -> Optional[float]:
+        """Relativní mezera mezi nejlepší trasou a dolní mezí"""
+        if self.upper_bound is None or self.lower_bound is None or self.upper_bound == 0:
+            return None
+        return max(0.0, (self.upper_bound - self.lower_bound) / abs(self.upper_bound))
+
+    @property
+    def proven(self) -> bool:
+        """Zda je nejlepší trasa prokazatelně optimální"""
+        return self.gap is not None and self.gap <= 1e-9
+
+class ScaledArray:
+    """Pohled na uložené hodnoty matice - čtení vrací float64, celá čísla se násobí měřítkem
+
+    Podporuje indexování jako NumPy pole (řádky, bloky, výběr indexy), len, shape, T
+    a převod np.asarray (ten načte celou matici do paměti).
+    """
+
+    def __init__(self, data, scale=None):
+        self.data = data
+        self.scale = scale
+        self.shape = data.shape
+        self.ndim = data.ndim
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        if self.scale is None:
+            values = np.asarray(self.data[key], dtype=np.float64)
+        else:
+            # maximum celočíselného typu je vyhrazené pro nekonečno (zakázaná hrana)
+            stored = np.asarray(self.data[key])
+            values = np.where(stored == np.iinfo(stored.dtype).max, np.inf, stored * self.scale)
+        return values if values.ndim else float(values)
+
+    def __array__(self, dtype=None, copy=None):
+        values = self[...]
+        return values if dtype is None else values.astype(dtype, copy=False)
+
+    @property
+    def T(self):
+        return ScaledArray(self.data.T, self.scale)
+
+class LabelIndexer:
+    """Přístup k hodnotám matice přes popisky uzlů (matrix.loc[a, b], matrix.loc[a])"""
+
+    def __init__(self, matrix):
+        self.matrix = matrix
+
+    def __getitem__(self, key):
+        index = self.matrix.index
+        if isinstance(key, tuple):
+            row, col = key
+            return self.matrix.costs[index.get_loc(row), index.get_loc(col)]
+        return pd.Series(self.matrix.costs[index.get_loc(key)], index=self.matrix.columns, name=key)
+
+class DistanceMatrix:
+    """Čtvercová matice vzdáleností v souboru .npy mapovaném do paměti
+
+    Hodnoty lze ukládat jako float64, float32 nebo škálovaná celá čísla uint16/uint32
+    (uložená hodnota * scale = vzdálenost; nekonečno a NaN se uloží jako maximum typu
+    a čtou se zpět jako nekonečno).
+    Popisky uzlů a měřítko jsou v souboru .json vedle .npy. Rozhraní odpovídá tomu,
+    co řešiče a exportéry používají z DataFrame: len, index, columns, loc, iloc, to_numpy.
+    """
+
+    def __init__(self, data, labels, scale=None, path=None):
+        if data.ndim != 2 or data.shape[0] != data.shape[1] or data.shape[0] != len(labels):
+            raise ValueError("Matice musí být čtvercová a mít popisek pro každý uzel")
+        self.data = data
+        self.scale = scale
+        self.path = path
+        self.index = pd.Index(labels)
+        self.columns = self.index
+        self.costs = ScaledArray(data, scale)
+        self.loc = LabelIndexer(self)
+        self.iloc = self.costs
+
+    @staticmethod
+    def metadata_path(path):
+        return os.path.splitext(path)[0] + ".json"
+
+    @classmethod
+    def create(cls, path, labels, dtype=np.float32, scale=None):
+        """Založí prázdnou matici na disku (hodnoty se doplní přes write_rows)"""
+        dtype = np.dtype(dtype)
+        if dtype.kind == "u" and scale is None:
+            raise ValueError("Celočíselné uložení potřebuje měřítko scale")
+        data = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(len(labels), len(labels)))
+        matrix = cls(data, labels, scale if dtype.kind == "u" else None, path)
+        matrix.save_metadata()
+        return matrix
+
+    @classmethod
+    def from_frame(cls, df, path, dtype=np.float32, scale=None):
+        """Uloží DataFrame jako matici na disku; pro uint typy zvolí měřítko podle maxima"""
+        values = df.to_numpy(dtype=np.float64)
+        dtype = np.dtype(dtype)
+        if dtype.kind == "u" and scale is None:
+            finite = values[np.isfinite(values)]
+            if finite.size and finite.min() < 0:
+                raise ValueError("Záporné vzdálenosti nelze uložit jako celá čísla bez znaménka")
+            # nejvyšší hodnota typu je vyhrazena pro nekonečno
+            top = finite.max() if finite.size else 0.0
+            scale = float(top) / (np.iinfo(dtype).max - 1) if top > 0 else 1.0
+        matrix = cls.create(path, list(df.index), dtype, scale)
+        for start in range(0, len(values), BLOCK_ROWS):
+            matrix.write_rows(start, values[start:start + BLOCK_ROWS])
+        matrix.flush()
+        return matrix
+
+    @classmethod
+    def open(cls, path, mode="r"):
+        """Otevře matici uloženou dříve (mode="c" povolí změny jen v paměti)"""
+        with open(cls.metadata_path(path), encoding="utf-8") as f:
+            meta = json.load(f)
+        data = np.load(path, mmap_mode=mode)
+        return cls(data, meta["index"], meta.get("scale"), path)
+
+    def save_metadata(self):
+        labels = [label.item() if isinstance(label, np.generic) else label for label in self.index]
+        with open(self.metadata_path(self.path), "w", encoding="utf-8") as f:
+            json.dump({"index": labels, "columns": labels, "index_name": None, "scale": self.scale,
+                       "dtype": self.data.dtype.str}, f, ensure_ascii=False)
+
+    def write_rows(self, start, values):
+        """Zapíše blok řádků (float64 vzdálenosti) od řádku start"""
+        values = np.asarray(values, dtype=np.float64)
+        if self.scale is None:
+            self.data[start:start + len(values)] = values
+            return
+        top = np.iinfo(self.data.dtype).max
+        # konečné hodnoty nejvýše top - 1, aby se při čtení nezaměnily za nekonečno
+        encoded = np.clip(np.rint(values / self.scale), 0, top - 1)
+        encoded[~np.isfinite(values)] = top
+        self.data[start:start + len(values)] = encoded.astype(self.data.dtype)
+
+    def flush(self):
+        if hasattr(self.data, "flush"):
+            self.data.flush()
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    def row_blocks(self, block_rows=BLOCK_ROWS):
+        """Prochází matici po blocích řádků, vrací (první řádek, pole float64)"""
+        for start in range(0, len(self), block_rows):
+            yield start, self.costs[start:start + block_rows]
+
+    def to_numpy(self, dtype=np.float64):
+        """Načte celou matici do paměti"""
+        return np.asarray(self.costs, dtype=dtype)
+
+    def to_frame(self):
+        """Převede matici na DataFrame (načte ji celou do paměti)"""
+        return pd.DataFrame(self.to_numpy(), index=self.index, columns=self.columns)
+
+    def copy(self):
+        """Kopie matice - data jen pro čtení se sdílí, zapisovatelná (mode="c") se zkopírují do paměti"""
+        if not self.data.flags.writeable:
+            return DistanceMatrix(self.data, list(self.index), self.scale, self.path)
+        return DistanceMatrix(np.array(self.data), list(self.index), self.scale)
+
+class CoordinateDistances:
+    """Matice vzdáleností mezi body, která se počítá až při indexování (nic se neukládá)
+
+    Indexuje se jako NumPy pole n x n - prvek, řádek, blok řádků nebo výběr polí indexů.
+    metric="euclidean" pro rovinné souřadnice (x, y), "haversine" pro (šířka, délka)
+    ve stupních, vzdálenost v km.
+    """
+
+    def __init__(self, points, metric="euclidean"):
+        if metric not in METRICS:
+            raise ValueError(f"Neznámá metrika {metric!r}, podporované jsou {', '.join(METRICS)}")
+        self.points = np.asarray(points, dtype=np.float64)
+        self.metric = metric
+        self.shape = (len(self.points), len(self.points))
+        self.ndim = 2
+        self.dtype = np.dtype(np.float64)
+        self.T = self  # obě metriky jsou symetrické
+        self._points = np.radians(self.points) if metric == "haversine" else self.points
+        self._coords = self._points.tolist()
+
+    def __getitem__(self, key):
+        if key is Ellipsis:
+            key = (slice(None), slice(None))
+        if not isinstance(key, tuple):
+            key = (key, slice(None))
+        rows, cols = key
+        if isinstance(rows, (int, np.integer)) and isinstance(cols, (int, np.integer)):
+            return self.distance(int(rows), int(cols))
+        a = self._points[rows]
+        b = self._points[cols]
+        # řez spolu s polem nebo řezem dává tabulku všech dvojic, jinak se páruje po prvcích
+        scalar = isinstance(rows, (int, np.integer)) or isinstance(cols, (int, np.integer))
+        if not scalar and (isinstance(rows, slice) or isinstance(cols, slice)):
+            a = a[:, None, :]
+            b = b[None, :, :]
+        if self.metric == "euclidean":
+            diff = a - b
+            return np.sqrt(np.einsum("...k,...k->...", diff, diff))
+        half_lat = np.sin((b[..., 0] - a[..., 0]) / 2)
+        half_lon = np.sin((b[..., 1] - a[..., 1]) / 2)
+        h = half_lat ** 2 + np.cos(a[..., 0]) * np.cos(b[..., 0]) * half_lon ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(h, 1.0)))
+
+    def distance(self, i, j):
+        """Vzdálenost jedné dvojice bodů (bez vytváření polí - volá se v heuristikách velmi často)"""
+        (a0, a1), (b0, b1) = self._coords[i], self._coords[j]
+        if self.metric == "euclidean":
+            return math.hypot(a0 - b0, a1 - b1)
+        h = math.sin((b0 - a0) / 2) ** 2 + math.cos(a0) * math.cos(b0) * math.sin((b1 - a1) / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(h, 1.0)))
+
+class CoordinateMatrix(DistanceMatrix):
+    """Matice vzdáleností zadaná souřadnicemi bodů - paměť O(n), vzdálenosti se počítají po blocích"""
+
+    def __init__(self, coordinates, labels, metric="euclidean"):
+        super().__init__(CoordinateDistances(coordinates, metric), labels)
+        self.coordinates = self.data.points
+        self.metric = metric
+
+    def copy(self):
+        return CoordinateMatrix(self.coordinates.copy(), list(self.index), self.metric)
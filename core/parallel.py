@@ -0,0 +1,152 @@
+import multiprocessing as mp
+import os
+import queue
+import signal
+from time import perf_counter, time
+
+from core.models import SolverProgress
+from core.solvers import solve_tsp, HELD_KARP_MAX_NODES, FULL_HEURISTIC_MAX_NODES
+
+# Paralelní portfolio řešičů - každá konfigurace běží ve vlastním procesu,
+# první prokázané optimum ukončí ostatní (včetně jejich podprocesů CBC).
+
+# relativní tolerance, při které považujeme horní a dolní mez za shodné
+PROOF_TOLERANCE = 1e-9
+
+# jak dlouho po uplynutí time_limit ještě čekáme na závěrečné zprávy běhů (sekundy)
+FINISH_GRACE = 2.0
+
+def default_portfolio(num_nodes, workers):
+    """Výchozí sada konfigurací: přesné metody a heuristiky s různými počátečními uzly"""
+    if num_nodes <= HELD_KARP_MAX_NODES:
+        return [{"method": "hk"}]
+    configs = [{"method": "dfj"}, {"method": "bb"}, {"method": "mtz"}]
+    heuristic = "heuristic" if num_nodes <= FULL_HEURISTIC_MAX_NODES else "lk"
+    for seed in range(max(1, workers - len(configs))):
+        configs.append({"method": heuristic, "seed": seed})
+    return configs
+
+def is_proven(progress, gap=None):
+    """Zjistí, zda zpráva řešiče dokládá optimum (nebo požadovanou mezeru)"""
+    if progress is None or progress.upper_bound is None or progress.lower_bound is None:
+        return False
+    tolerance = max(gap or 0.0, PROOF_TOLERANCE) * max(1.0, abs(progress.upper_bound))
+    return progress.upper_bound - progress.lower_bound <= tolerance
+
+def portfolio_worker(index, matrix, config, deadline, gap, results):
+    """Spustí solve_tsp s danou konfigurací a posílá zprávy do fronty results
+
+    deadline je absolutní čas (time.time()) konce výpočtu - čas spuštění procesu a importu
+    modulů se tak odečte od časového limitu.
+    """
+    # vlastní skupina procesů - při ukončení zastavíme i CBC spuštěné tímto procesem
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+    time_limit = None if deadline is None else max(0.0, deadline - time())
+    try:
+        solution = solve_tsp(matrix, time_limit=time_limit, gap=gap,
+                             progress=lambda p: results.put(("progress", index, p)), **config)
+        results.put(("done", index, solution))
+    except Exception as e:
+        results.put(("error", index, str(e)))
+
+def stop_process(process):
+    """Ukončí proces řešiče i s jeho podprocesy"""
+    if process.is_alive():
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except (AttributeError, OSError):
+            process.terminate()
+    process.join()
+
+def solve_portfolio(matrix, configs=None, workers=None, time_limit=None, gap=None, progress=None):
+    """Řeší TSP několika konfiguracemi solve_tsp souběžně v procesech
+
+    Nejvýše workers procesů běží zároveň (výchozí = počet jader). Jakmile některá konfigurace
+    prokáže optimum (nebo mezeru gap), ostatní se ukončí. Vrací hrany nejlepší nalezené trasy.
+    progress dostává zprávy všech běhů, source má tvar "portfolio:<metoda>/<zdroj>".
+    time_limit platí pro celé portfolio včetně spuštění procesů; po jeho uplynutí se vrátí
+    nejlepší dosud nalezená trasa. Závěrečná zpráva má dolní mez rovnou délce trasy jen
+    u prokázaného optima, při dosažení mezery gap nese dolní mez řešiče.
+    """
+    start_time = perf_counter()
+    deadline = None if time_limit is None else time() + time_limit
+    workers = max(1, workers or os.cpu_count() or 1)
+    configs = list(configs or default_portfolio(len(matrix), workers))
+
+    ctx = mp.get_context("spawn")
+    results = ctx.Queue()
+    pending = list(enumerate(configs))
+    running = {}
+    best = None  # (délka, řešení)
+    best_lower = None
+    finished = False  # některý běh dosáhl optima nebo mezery gap
+
+    def handle(kind, index, payload):
+        nonlocal best, best_lower, finished
+        if kind == "progress":
+            name = configs[index].get("method", "?")
+            if payload.solution and payload.upper_bound is not None:
+                if best is None or payload.upper_bound < best[0]:
+                    best = (payload.upper_bound, payload.solution)
+            if payload.final and payload.lower_bound is not None:
+                best_lower = max(best_lower or payload.lower_bound, payload.lower_bound)
+            if payload.final and is_proven(payload, gap):
+                finished = True
+            if progress is not None:
+                progress(SolverProgress(payload.upper_bound, payload.lower_bound, payload.solution,
+                                        perf_counter() - start_time, f"portfolio:{name}/{payload.source}"))
+        else:
+            # proces mohl být odebrán už jako ukončený bez zprávy
+            process = running.pop(index, None)
+            if process is not None:
+                process.join()
+
+    def launch():
+        while pending and len(running) < workers:
+            index, config = pending.pop(0)
+            process = ctx.Process(target=portfolio_worker, daemon=True,
+                                  args=(index, matrix, config, deadline, gap, results))
+            process.start()
+            running[index] = process
+
+    try:
+        launch()
+        while running and not finished:
+            # po uplynutí limitu (a rezervy na závěrečné zprávy) skončíme, máme-li nějakou trasu
+            if deadline is not None and best is not None and time() > deadline + FINISH_GRACE:
+                break
+            try:
+                kind, index, payload = results.get(timeout=0.1)
+            except queue.Empty:
+                # proces spadl bez zprávy
+                for index in [i for i, p in running.items() if not p.is_alive()]:
+                    running.pop(index).join()
+                launch()
+                continue
+            handle(kind, index, payload)
+            if kind != "progress":
+                launch()
+    finally:
+        # zprávy procesů, které skončily samy, ještě mohou být ve frontě (např. závěrečná trasa);
+        # čte se před ukončením ostatních - zabitý proces může ve frontě nechat neúplnou zprávu
+        while True:
+            try:
+                message = results.get(timeout=0.05)
+            except queue.Empty:
+                break
+            handle(*message)
+        for process in running.values():
+            stop_process(process)
+        results.close()
+
+    if best is None:
+        raise RuntimeError("Žádná konfigurace portfolia nenašla trasu")
+
+    if progress is not None:
+        # dolní mez nelepší než délka trasy; shodné meze = prokázané optimum
+        lower = None if best_lower is None else min(best_lower, best[0])
+        if lower is not None and best[0] - lower <= PROOF_TOLERANCE * max(1.0, abs(best[0])):
+            lower = best[0]
+        progress(SolverProgress(best[0], lower, best[1], perf_counter() - start_time, "portfolio", final=True))
+    return best[1]
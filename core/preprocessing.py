@@ -0,0 +1,240 @@
+from dataclasses import dataclass
+from time import perf_counter
+import numpy as np
+
+# Předzpracování před sestavením MILP modelu - vyřazení hran, které nemohou být v optimální trase
+# Dolní mez: přiřazovací úloha (nesymetrické matice) nebo 1-strom s Held-Karpovými penalizacemi
+# (symetrické). Z duálních proměnných plyne pro každou hranu redukovaná cena - o kolik nejméně vzroste
+# dolní mez, pokud hranu vynutíme. Když dolní mez + redukovaná cena překročí délku heuristické trasy,
+# hrana v žádné lepší trase není a do modelu se nedostane. Zbude-li uzlu jediná možnost, hrana se zafixuje.
+
+# počet kroků subgradientní metody pro 1-strom
+ONE_TREE_ITERATIONS = 100
+
+@dataclass
+class EdgeReduction:
+    """Výsledek předzpracování - které hrany zůstanou v modelu a které jsou zafixované na 1"""
+    keep: np.ndarray  # bool n x n, hrany, které mohou být v optimální trase
+    fixed: np.ndarray  # bool n x n, hrany, které v ní být musí
+    lower_bound: float
+    upper_bound: float
+    symmetric: bool
+    elapsed: float
+
+    @property
+    def total(self) -> int:
+        """Počet proměnných modelu bez předzpracování"""
+        num_nodes = len(self.keep)
+        return num_nodes * (num_nodes - 1) // (2 if self.symmetric else 1)
+
+    @property
+    def kept(self) -> int:
+        """Počet proměnných, které zůstanou v modelu"""
+        kept = int(self.keep.sum())
+        return kept // 2 if self.symmetric else kept
+
+    @property
+    def num_fixed(self) -> int:
+        fixed = int(self.fixed.sum())
+        return fixed // 2 if self.symmetric else fixed
+
+    def summary(self):
+        """Popis pro log"""
+        removed = self.total - self.kept
+        share = removed / self.total * 100 if self.total else 0.0
+        bound = "1-strom" if self.symmetric else "přiřazovací úloha"
+        return (f"předzpracování ({bound}, {self.elapsed:.2f} s): vyřazeno {removed} z {self.total} proměnných "
+                f"({share:.1f} %), zafixováno {self.num_fixed}, dolní mez {self.lower_bound:g}, "
+                f"horní mez {self.upper_bound:g}")
+
+def finite_costs(cost):
+    """Kopie matice s diagonálou a zakázanými hranami nahrazenými velkou konečnou hodnotou
+
+    Vrací (pole, velká hodnota) - dolní mez nad touto hodnotou znamená, že trasa bez zakázaných hran neexistuje.
+    """
+    a = np.array(cost, dtype=np.float64)
+    np.fill_diagonal(a, np.inf)
+    finite = np.isfinite(a)
+    big = (float(np.abs(a[finite]).max()) + 1.0) * len(a) if finite.any() else 1.0
+    a[~finite] = big
+    return a, big
+
+def assignment_bound(cost):
+    """Vyřeší přiřazovací úlohu maďarskou metodou, vrací (dolní mez, redukované ceny n x n)
+
+    Redukované ceny c[i, j] - u[i] - v[j] jsou nezáporné (duálně přípustné potenciály),
+    součet potenciálů je optimum přiřazení a tedy dolní mez délky trasy.
+    """
+    a, big = finite_costs(cost)
+    num_nodes = len(a)
+    # potenciály a přiřazení sloupců indexované od 1 (sloupec 0 je pomocný)
+    u = np.zeros(num_nodes + 1)
+    v = np.zeros(num_nodes + 1)
+    assigned = np.zeros(num_nodes + 1, dtype=np.int64)
+    way = np.zeros(num_nodes + 1, dtype=np.int64)
+    for i in range(1, num_nodes + 1):
+        assigned[0] = i
+        j0 = 0
+        minv = np.full(num_nodes + 1, np.inf)
+        used = np.zeros(num_nodes + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = assigned[j0]
+            free = ~used[1:]
+            current = a[i0 - 1] - u[i0] - v[1:]
+            better = free & (current < minv[1:])
+            minv[1:][better] = current[better]
+            way[1:][better] = j0
+            candidates = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+            u[assigned[used]] += delta
+            v[used] -= delta
+            minv[~used] -= delta
+            j0 = j1
+            if assigned[j0] == 0:
+                break
+        # prodloužení přiřazení po nalezené cestě
+        while j0:
+            j1 = way[j0]
+            assigned[j0] = assigned[j1]
+            j0 = j1
+    lower_bound = float(u[1:].sum() + v[1:].sum())
+    if lower_bound >= big:
+        return np.inf, None
+    reduced = a - u[1:, None] - v[None, 1:]
+    np.fill_diagonal(reduced, np.inf)
+    return lower_bound, np.maximum(reduced, 0.0)
+
+def minimum_spanning_tree(weights):
+    """Primův algoritmus nad plnou maticí, vrací pole rodičů (kořen 0 má rodiče -1)"""
+    num_nodes = len(weights)
+    in_tree = np.zeros(num_nodes, dtype=bool)
+    parent = np.zeros(num_nodes, dtype=np.int64)
+    parent[0] = -1
+    dist = weights[0].copy()
+    in_tree[0] = True
+    dist[0] = np.inf
+    for _ in range(num_nodes - 1):
+        j = int(np.argmin(dist))
+        in_tree[j] = True
+        dist[j] = np.inf
+        closer = ~in_tree & (weights[j] < dist)
+        dist[closer] = weights[j][closer]
+        parent[closer] = j
+    return parent
+
+def one_tree(weights):
+    """1-strom: kostra uzlů 1..n-1 a dvě nejkratší hrany uzlu 0, vrací (délka, stupně, rodiče, hrany uzlu 0)"""
+    num_nodes = len(weights)
+    parent = minimum_spanning_tree(weights[1:, 1:])
+    children = np.arange(1, num_nodes - 1)
+    tree_cost = float(weights[children + 1, parent[children] + 1].sum())
+    nearest = np.argsort(weights[0, 1:], kind="stable")[:2] + 1
+    degrees = np.zeros(num_nodes, dtype=np.int64)
+    np.add.at(degrees, children + 1, 1)
+    np.add.at(degrees, parent[children] + 1, 1)
+    degrees[nearest] += 1
+    degrees[0] = 2
+    return tree_cost + float(weights[0, nearest].sum()), degrees, parent, nearest
+
+def path_maxima(weights, parent):
+    """Pro každou dvojici uzlů kostry vrátí nejdelší hranu na cestě mezi nimi (n x n)
+
+    Hrany kostry se spojují od nejkratší (jako v Kruskalově algoritmu), všechny dvojice
+    mezi spojovanými komponentami mají maximum rovné délce spojující hrany.
+    """
+    num_nodes = len(weights)
+    children = np.arange(1, num_nodes)
+    lengths = weights[children, parent[children]]
+    maxima = np.zeros((num_nodes, num_nodes))
+    component = np.arange(num_nodes)
+    members = {node: [node] for node in range(num_nodes)}
+    for k in np.argsort(lengths, kind="stable").tolist():
+        a = component[children[k]]
+        b = component[parent[children[k]]]
+        first, second = members[a], members[b]
+        maxima[np.ix_(first, second)] = lengths[k]
+        maxima[np.ix_(second, first)] = lengths[k]
+        if len(first) < len(second):
+            a, b, first, second = b, a, second, first
+        component[second] = a
+        first.extend(second)
+        del members[b]
+    return maxima
+
+def one_tree_bound(cost, upper_bound, iterations=ONE_TREE_ITERATIONS):
+    """Held-Karpova dolní mez z 1-stromů (subgradientní metoda), vrací (dolní mez, redukované ceny n x n)
+
+    Redukovaná cena hrany = o kolik se prodlouží nejlepší 1-strom, pokud hranu obsahuje.
+    """
+    a, big = finite_costs(cost)
+    num_nodes = len(a)
+    pi = np.zeros(num_nodes)
+    best_bound, best_pi = -np.inf, pi
+    step_scale = 2.0
+    stalled = 0
+    for _ in range(iterations):
+        weights = a + pi[:, None] + pi[None, :]
+        length, degrees, _, _ = one_tree(weights)
+        bound = length - 2.0 * pi.sum()
+        if bound > best_bound + 1e-9:
+            best_bound, best_pi = bound, pi.copy()
+            stalled = 0
+        else:
+            stalled += 1
+            if stalled >= 5:
+                step_scale /= 2.0
+                stalled = 0
+        subgradient = degrees - 2
+        norm = float((subgradient ** 2).sum())
+        # 1-strom se stupni 2 je trasa - mez je přesná
+        if norm == 0 or best_bound >= upper_bound or step_scale < 1e-4:
+            break
+        pi = pi + step_scale * (upper_bound - bound) / norm * subgradient
+
+    if best_bound >= big:
+        return np.inf, None
+    weights = a + best_pi[:, None] + best_pi[None, :]
+    _, _, parent, nearest = one_tree(weights)
+    reduced = np.empty_like(weights)
+    # hrany mezi uzly 1..n-1 nahradí nejdelší hranu kostry na cestě mezi svými konci
+    reduced[1:, 1:] = weights[1:, 1:] - path_maxima(weights[1:, 1:], parent)
+    # hrana uzlu 0 nahradí jeho delší ze dvou vybraných hran
+    reduced[0, 1:] = weights[0, 1:] - weights[0, nearest].max()
+    reduced[1:, 0] = reduced[0, 1:]
+    np.fill_diagonal(reduced, np.inf)
+    return float(best_bound), np.maximum(reduced, 0.0)
+
+def reduce_edges(cost, upper_bound, symmetric=False):
+    """Určí hrany, které mohou být v trase nejvýše upper_bound dlouhé (EdgeReduction)
+
+    Hrany zadané trasy délky upper_bound vyřazeny nikdy nejsou, takže heuristické řešení zůstává přípustné.
+    """
+    start_time = perf_counter()
+    num_nodes = len(cost)
+    if symmetric:
+        lower_bound, reduced = one_tree_bound(cost, upper_bound)
+    else:
+        lower_bound, reduced = assignment_bound(cost)
+    if reduced is None:
+        keep = ~np.eye(num_nodes, dtype=bool)
+        lower_bound = -np.inf
+    else:
+        tolerance = 1e-9 * max(1.0, abs(upper_bound))
+        keep = lower_bound + reduced <= upper_bound + tolerance
+        np.fill_diagonal(keep, False)
+
+    # uzel s jedinou zbývající možností (nesymetricky jeden výstup/vstup, symetricky dvě hrany)
+    fixed = np.zeros_like(keep)
+    if symmetric:
+        forced = keep.sum(axis=1) == 2
+        fixed[forced] = keep[forced]
+        fixed |= fixed.T
+    else:
+        forced_out = keep.sum(axis=1) == 1
+        fixed[forced_out] = keep[forced_out]
+        forced_in = keep.sum(axis=0) == 1
+        fixed[:, forced_in] |= keep[:, forced_in]
+    return EdgeReduction(keep, fixed, float(lower_bound), float(upper_bound), symmetric,
+                         perf_counter() - start_time)
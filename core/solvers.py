@@ -1,72 +1,565 @@
+import os
+import re
+import tempfile
+import threading
+from time import perf_counter
+import numpy as np
 from pulp import *
+from core.branch_bound import branch_and_bound
+from core.held_karp import held_karp, held_karp_memory, DEFAULT_MAX_MEMORY
+from core.heuristics import heuristic_tour, is_valid_tour, tour_cost, EPS
+from core.lin_kernighan import lk_tour
+from core.models import SolverProgress, DistanceMatrix, TSPSolution
+from core.preprocessing import reduce_edges
+from core.symmetry import is_symmetric
+from core.tours import index_cycles, undirected_cycles, tour_edges, solution_cycles, solution_tour
 
-# definování fce pro řešení ODP
-def solve_tsp(matrix):
-    num_nodes = len(matrix)
-    nodes = list(matrix.index)
+# do teto velikosti matice resi method="auto" ulohu Held-Karpovym algoritmem misto CBC
+HELD_KARP_MAX_NODES = 16
+
+# od teto velikosti resi method="auto" ulohu jen heuristikou s kandidatnimi seznamy (LK)
+LK_MIN_NODES = 1000
+
+# do teto velikosti se pocatecni trasa zlepsuje 2-opt/Or-opt nad celou matici tahu, nad ni LK
+FULL_HEURISTIC_MAX_NODES = 300
+
+# převod DataFrame na souvislé pole float64 - čteme jen jednou, dál pracujeme s indexy
+def cost_array(matrix):
+    """Vrátí matici vzdáleností jako souvislé NumPy pole float64
+
+    U DistanceMatrix vrátí pohled na memmap (ScaledArray), který čte jen potřebné řádky.
+    """
+    if isinstance(matrix, DistanceMatrix):
+        return matrix.costs
+    return np.ascontiguousarray(matrix.to_numpy(dtype=np.float64))
+
+# hrany mimo diagonálu v pořadí po řádcích (i, j), i != j
+def offdiagonal_edges(num_nodes, keep=None):
+    """Vrátí pole indexů (rows, cols) hran mimo diagonálu (jen ty z masky keep, je-li zadána)"""
+    mask = ~np.eye(num_nodes, dtype=bool)
+    if keep is not None:
+        mask &= keep
+    rows, cols = np.nonzero(mask)
+    return rows, cols
+
+# pozice proměnné hrany (i, j) v seznamu x - pole n x n, -1 = hrana v modelu není
+def edge_positions(rows, cols, num_nodes, symmetric=False):
+    """Vrátí pole n x n s pozicí proměnné každé hrany (u neorientovaného modelu pro oba směry)"""
+    positions = np.full((num_nodes, num_nodes), -1, dtype=np.int64)
+    positions[rows, cols] = np.arange(len(rows))
+    if symmetric:
+        positions[cols, rows] = np.arange(len(rows))
+    return positions
+
+# pozice hran seskupené podle uzlu (výstupní/vstupní hrany, u neorientovaného modelu oba konce)
+def incident_groups(ends, num_nodes):
+    """Rozdělí pozice hran podle uzlu ends[k], vrací seznam polí pozic pro každý uzel"""
+    order = np.argsort(ends, kind="stable")
+    return np.split(order, np.cumsum(np.bincount(ends, minlength=num_nodes))[:-1])
+
+# hrany zafixované předzpracováním - proměnná má dolní mez 1
+def fix_edges(x_vars, positions, fixed):
+    """Nastaví dolní mez 1 proměnným hran, které musí být v každé optimální trase"""
+    if fixed is None:
+        return
+    ks = positions[np.nonzero(fixed)]
+    for k in np.unique(ks[ks >= 0]).tolist():
+        x_vars[k].lowBound = 1
+
+# sestaveni modelu nad polem nakladu - hromadne vytvareni koeficientu
+def build_tsp_model(cost, method="mtz", initial_tour=None, keep=None, fixed=None):
+    """Sestaví PuLP model TSP z pole nákladů, vrací (prob, x_vars, rows, cols, positions)
+
+    method="mtz" přidá Miller-Tucker-Zemlin podmínky, method="dfj" jen podmínky stupňů
+    (podmínky proti podcyklům se pak doplňují postupně v solve_tsp).
+    initial_tour (pole indexů uzlů) se nastaví jako počáteční hodnoty proměnných pro warm start.
+    keep a fixed (bool n x n, core.preprocessing) omezí proměnné na hrany, které mohou být
+    v optimální trase, a zafixují hrany, které v ní být musí.
+    """
+    num_nodes = len(cost)
+    rows, cols = offdiagonal_edges(num_nodes, keep)
+    positions = edge_positions(rows, cols, num_nodes)
 
-    # inicializace linearniho programovani
     prob = LpProblem("TSP", LpMinimize)
 
-    # existence hrany mezi dvěma hranami - nyní vynecháváme diagonálu (i != j)
-    x = LpVariable.dicts("x", [(i, j) for i in nodes for j in nodes if i != j], 0, 1, LpBinary)
+    # binární proměnné jen pro hrany mimo diagonálu, pojmenované podle indexů
+    x_vars = [LpVariable(f"x_{i}_{j}", 0, 1, LpBinary) for i, j in zip(rows.tolist(), cols.tolist())]
+    fix_edges(x_vars, positions, fixed)
 
-    # účelová fce-->minimalizace - vynecháváme diagonální prvky
-    # Opravená verze - explicitně získáváme hodnotu z DataFrame
-    prob += lpSum(matrix.loc[i, j] * x[(i, j)] for i in nodes for j in nodes if i != j)
+    # účelová fce - koeficienty naráz z pole
+    prob.setObjective(LpAffineExpression(zip(x_vars, cost[rows, cols].tolist())))
 
-    # podm. každé místo jen jednou navštívit - vynecháváme diagonálu
-    for i in nodes:
-        prob += lpSum(x[(i, j)] for j in nodes if i != j) == 1  # z každého bodu vychází právě jedna hrana
-        prob += lpSum(x[(j, i)] for j in nodes if i != j) == 1  # do každého bodu vchází právě jedna hrana
+    # podm. každé místo jen jednou navštívit
+    out_edges = incident_groups(rows, num_nodes)
+    in_edges = incident_groups(cols, num_nodes)
+    for i in range(num_nodes):
+        prob.addConstraint(LpConstraint(
+            LpAffineExpression((x_vars[k], 1) for k in out_edges[i].tolist()),
+            LpConstraintEQ, f"out_{i}", 1))
+        prob.addConstraint(LpConstraint(
+            LpAffineExpression((x_vars[k], 1) for k in in_edges[i].tolist()),
+            LpConstraintEQ, f"in_{i}", 1))
 
-    # zamezeni zacykleni - Miller-Tucker-Zemlin podmínky
-    u = LpVariable.dicts("u", nodes, 0, num_nodes - 1, LpInteger)
-    for i in nodes:
-        for j in nodes:
-            # Oprava podmínky - explicitně porovnáváme s prvním uzlem
-            if i != j and i != nodes[0] and j != nodes[0]:  # vynecháváme diagonálu a výchozí bod
-                prob += u[i] - u[j] + num_nodes * x[(i, j)] <= num_nodes - 1
+    u_vars = None
+    if method == "mtz":
+        u_vars = add_mtz_constraints(prob, x_vars, rows, cols, num_nodes)
+    elif method != "dfj":
+        raise ValueError(f"Neznámá metoda: {method}")
 
-    # reseni problemu LP - PuLP knihovna
-    prob.solve(PULP_CBC_CMD(msg=False))  # potlačíme výpis zpráv
+    if initial_tour is not None:
+        set_warm_start(x_vars, u_vars, initial_tour, positions)
 
-    # overeni které hrany maji hodnotu 1, pridani do seznamu solution
-    solution = []
-    for i in nodes:
-        for j in nodes:
-            if i != j and value(x[(i, j)]) == 1:  # ignorujeme diagonálu
-                solution.append((i, j))
+    return prob, x_vars, rows, cols, positions
 
-    return solution
+# hrany trasy jako proměnné modelu - trasa musí použít jen hrany v modelu a všechny zafixované
+def warm_start_values(x_vars, tour, positions):
+    """Vrátí bool pole vybraných proměnných pro trasu, nebo None, pokud trasa do modelu nepasuje
 
-# další možné okruhy
-def find_cycles(matrix, solution):
-    cycles = []
-    visited = set()
-    for edge in solution:
-        visited.add(edge[0])
-        visited.add(edge[1])
+    Nepasuje, když vede po hraně vyřazené předzpracováním nebo vynechá hranu zafixovanou na 1.
+    """
+    tour = np.asarray(tour)
+    ks = positions[tour, np.roll(tour, -1)]
+    if (ks < 0).any():
+        return None
+    chosen = np.zeros(len(x_vars), dtype=bool)
+    chosen[ks] = True
+    if any(var.lowBound == 1 and not flag for var, flag in zip(x_vars, chosen.tolist())):
+        return None
+    return chosen
 
-    nodes = list(matrix.index)
-    for node in nodes:
-        # Opravena podmínka - explicitní kontrola
-        if node not in visited:
-            continue
-        current_node = node
-        cycle = [current_node]
+# pocatecni reseni pro CBC - hrany trasy na 1, ostatni na 0, u = poradi uzlu od uzlu 0
+def set_warm_start(x_vars, u_vars, tour, positions):
+    """Nastaví počáteční hodnoty proměnných podle trasy (pole indexů uzlů)
+
+    Vrací False (a nic nenastaví), pokud trasa do modelu nepasuje (viz warm_start_values).
+    """
+    tour = np.roll(np.asarray(tour), -int(np.argmax(np.asarray(tour) == 0)))
+    chosen = warm_start_values(x_vars, tour, positions)
+    if chosen is None:
+        return False
+    for var, flag in zip(x_vars, chosen.tolist()):
+        var.setInitialValue(1 if flag else 0)
+    if u_vars is not None:
+        for position, node in enumerate(tour.tolist()):
+            u_vars[node].setInitialValue(position)
+    return True
+
+# zamezeni zacykleni - Miller-Tucker-Zemlin podmínky (bez výchozího uzlu 0)
+def add_mtz_constraints(prob, x_vars, rows, cols, num_nodes):
+    """Přidá do modelu MTZ proměnné u a podmínky, vrací seznam proměnných u"""
+    u_vars = [LpVariable(f"u_{i}", 0, num_nodes - 1, LpInteger) for i in range(num_nodes)]
+    mtz = np.nonzero((rows != 0) & (cols != 0))[0]
+    for k, i, j in zip(mtz.tolist(), rows[mtz].tolist(), cols[mtz].tolist()):
+        prob.addConstraint(LpConstraint(
+            LpAffineExpression([(u_vars[i], 1), (u_vars[j], -1), (x_vars[k], num_nodes)]),
+            LpConstraintLE, f"mtz_{i}_{j}", num_nodes - 1))
+    return u_vars
+
+# podminka DFJ - z podmnoziny uzlu S smi vest uvnitr nejvyse |S| - 1 hran
+def add_subtour_cut(prob, x_vars, subset, positions, name):
+    """Přidá do modelu podmínku eliminující podcyklus přes uzly subset"""
+    subset = np.asarray(subset)
+    inner = positions[np.ix_(subset, subset)]
+    ks = inner[inner >= 0]
+    prob.addConstraint(LpConstraint(
+        LpAffineExpression((x_vars[k], 1) for k in ks.tolist()),
+        LpConstraintLE, name, len(subset) - 1))
+
+# neorientovany model pro symetricke matice - jen hrany {i, j}, i < j (horni trojuhelnik)
+def build_symmetric_model(cost, initial_tour=None, keep=None, fixed=None):
+    """Sestaví neorientovaný PuLP model TSP pro symetrickou matici, vrací (prob, x_vars, rows, cols, positions)
+
+    Proměnné jsou jen pro n(n-1)/2 hran horního trojúhelníku, každý uzel má stupeň 2.
+    Podmínky proti podcyklům se doplňují postupně (add_symmetric_subtour_cut) jako u DFJ.
+    keep a fixed mají stejný význam jako v build_tsp_model.
+    """
+    num_nodes = len(cost)
+    upper = np.triu(np.ones((num_nodes, num_nodes), dtype=bool), 1)
+    if keep is not None:
+        upper &= keep
+    rows, cols = offdiagonal_edges(num_nodes, upper)
+    positions = edge_positions(rows, cols, num_nodes, symmetric=True)
+
+    prob = LpProblem("TSP", LpMinimize)
+    x_vars = [LpVariable(f"x_{i}_{j}", 0, 1, LpBinary) for i, j in zip(rows.tolist(), cols.tolist())]
+    fix_edges(x_vars, positions, fixed)
+    prob.setObjective(LpAffineExpression(zip(x_vars, cost[rows, cols].tolist())))
+
+    # podm. stupně - do každého místa vedou právě dvě vybrané hrany
+    incident = incident_groups(np.concatenate((rows, cols)), num_nodes)
+    for i in range(num_nodes):
+        prob.addConstraint(LpConstraint(
+            LpAffineExpression((x_vars[k], 1) for k in (incident[i] % len(rows)).tolist()),
+            LpConstraintEQ, f"deg_{i}", 2))
+
+    if initial_tour is not None:
+        set_symmetric_warm_start(x_vars, initial_tour, positions)
+
+    return prob, x_vars, rows, cols, positions
+
+def set_symmetric_warm_start(x_vars, tour, positions):
+    """Nastaví počáteční hodnoty neorientovaných proměnných podle trasy (pole indexů uzlů)
+
+    Vrací False (a nic nenastaví), pokud trasa do modelu nepasuje (viz warm_start_values).
+    """
+    chosen = warm_start_values(x_vars, tour, positions)
+    if chosen is None:
+        return False
+    for var, flag in zip(x_vars, chosen.tolist()):
+        var.setInitialValue(1 if flag else 0)
+    return True
+
+def add_symmetric_subtour_cut(prob, x_vars, subset, positions, name):
+    """Přidá do neorientovaného modelu podmínku eliminující podcyklus přes uzly subset"""
+    subset = np.asarray(subset)
+    inner = np.triu(positions[np.ix_(subset, subset)] + 1, 1) - 1
+    ks = inner[inner >= 0]
+    prob.addConstraint(LpConstraint(
+        LpAffineExpression((x_vars[k], 1) for k in ks.tolist()),
+        LpConstraintLE, name, len(subset) - 1))
+
+# vybrane hrany z vyreseneho modelu
+def selected_edges(x_vars, rows, cols):
+    """Vrátí indexy (rows, cols) hran, jejichž proměnná má hodnotu 1"""
+    values = np.array([var.varValue or 0.0 for var in x_vars])
+    chosen = values > 0.5
+    return rows[chosen], cols[chosen]
+
+# overeni, ze vybrane hrany tvori jediny okruh pres vsechny uzly
+def is_single_tour(sel_rows, sel_cols, num_nodes):
+    """Vrátí True, pokud hrany (sel_rows, sel_cols) tvoří jednu trasu přes všechny uzly"""
+    if len(sel_rows) != num_nodes:
+        return False
+    if len(np.unique(sel_rows)) != num_nodes or len(np.unique(sel_cols)) != num_nodes:
+        return False
+    return len(index_cycles(sel_rows, sel_cols, num_nodes)) == 1
+
+# sledovani logu CBC - prubezne nalezena reseni a dolni mez
+class CbcLogWatcher(threading.Thread):
+    """Čte log CBC během výpočtu a hlásí nová celočíselná řešení a dolní mez"""
+
+    INTEGER_SOLUTION = re.compile(r"Integer solution of (\S+)")
+    BEST_POSSIBLE = re.compile(r"best possible (\S+?)[\s),]")
+    LOWER_BOUND = re.compile(r"Lower bound:\s+(\S+)")
+
+    def __init__(self, path, on_update=None, interval=0.2):
+        super().__init__(daemon=True)
+        self.path = path
+        self.on_update = on_update
+        self.interval = interval
+        self.upper_bound = None
+        self.lower_bound = None
+        self.stop_event = threading.Event()
+
+    def parse_line(self, line):
+        """Zpracuje jeden řádek logu, vrací True, pokud se změnila některá z mezí"""
+        changed = False
+        for pattern, attr in ((self.INTEGER_SOLUTION, "upper_bound"),
+                              (self.BEST_POSSIBLE, "lower_bound"),
+                              (self.LOWER_BOUND, "lower_bound")):
+            match = pattern.search(line)
+            if not match:
+                continue
+            try:
+                number = float(match.group(1))
+            except ValueError:
+                continue
+            if abs(number) < 1e40 and number != getattr(self, attr):
+                setattr(self, attr, number)
+                changed = True
+        return changed
+
+    def run(self):
+        position = 0
         while True:
-            next_node = None
-            for edge in solution:
-                if edge[0] == current_node:
-                    next_node = edge[1]
-                    break
-            if next_node is None:
-                break
-            if next_node == node:
-                cycles.append(cycle)
+            finished = self.stop_event.wait(self.interval)
+            if os.path.exists(self.path):
+                with open(self.path, errors="replace") as log_file:
+                    log_file.seek(position)
+                    lines = log_file.readlines()
+                    position = log_file.tell()
+                for line in lines:
+                    if self.parse_line(line) and self.on_update is not None:
+                        self.on_update(self.upper_bound, self.lower_bound)
+            if finished:
                 break
-            cycle.append(next_node)
-            current_node = next_node
 
-    return cycles
\ No newline at end of file
+    def stop(self):
+        """Ukončí sledování po přečtení zbytku logu"""
+        self.stop_event.set()
+        self.join()
+
+# definování fce pro řešení ODP
+def solve_tsp(matrix, method="auto", max_rounds=1000, max_open_nodes=100000,
+              held_karp_max_nodes=HELD_KARP_MAX_NODES, held_karp_max_memory=DEFAULT_MAX_MEMORY,
+              warm_start=True, time_limit=None, gap=None, progress=None, seed=None, workers=None,
+              cache=None, symmetric=None, preprocess=True, initial_solution=None):
+    """Vyřeší TSP zvolenou metodou
+
+    method="auto" - Held-Karp pro malé matice (do held_karp_max_nodes uzlů), "lk" od LK_MIN_NODES, jinak "mtz"
+    method="hk"  - Held-Karpovo dynamické programování (odmítne příliš velké instance)
+    method="mtz" - jeden MILP s MTZ podmínkami (CBC)
+    method="dfj" - CBC s postupným přidáváním řezů proti podcyklům
+    method="bb"  - vlastní metoda větví a mezí (Littlův algoritmus) bez CBC
+    method="heuristic" - jen nejbližší soused + 2-opt/Or-opt (okamžitý, ne nutně optimální výsledek)
+    method="lk"  - heuristika s kandidátními seznamy (Lin-Kernighan, Or-opt) pro tisíce uzlů
+    method="portfolio" - několik metod paralelně v procesech (core.parallel), workers = počet procesů
+
+    S warm_start=True se heuristická trasa předá CBC i metodě větví a mezí jako počáteční řešení.
+    time_limit (sekundy) a gap (relativní mezera, např. 0.01) výpočet ukončí dříve; vrátí se
+    nejlepší nalezená trasa. progress(SolverProgress) dostává průběžně zlepšení a dolní mez.
+    seed zvolí náhodný počáteční uzel heuristik (pro různé běhy v portfoliu).
+    cache (core.cache.SolutionCache) vrátí uložené řešení stejné matice se stejným nastavením;
+    zásah se ohlásí zprávou se zdrojem "cache". Ukládají se jen prokázaná optima a deterministické
+    heuristiky bez časového limitu.
+    symmetric - u metod "mtz" a "dfj" se symetrická matice (None = zjistí se automaticky) řeší
+    neorientovaným modelem s n(n-1)/2 proměnnými a postupně přidávanými řezy; False to vypne.
+    preprocess - před sestavením modelu "mtz"/"dfj" vyřadí hrany, které podle dolní meze
+    (přiřazovací úloha nebo 1-strom) a heuristické trasy nemohou být v optimu (core.preprocessing).
+    Statistika se ohlásí zprávou se zdrojem "preprocess".
+    initial_solution - hrany výchozí trasy s popisky (např. předchozí řešení po malé úpravě matice);
+    je-li platná a kratší než heuristická, použije se místo ní jako počáteční řešení.
+    """
+    if cache is not None:
+        settings = {"method": method, "gap": gap, "time_limit": time_limit, "seed": seed}
+        found = cache.lookup(matrix, settings)
+        if found is not None:
+            cached, cached_proven = found
+            if progress is not None:
+                total = TSPSolution.from_edges(matrix, cached).total_distance
+                # uložené optimum se ohlásí i s dolní mezí, heuristická trasa bez ní
+                progress(SolverProgress(total, total if cached_proven else None, cached, 0.0, "cache",
+                                        final=True))
+            return cached
+
+        final = []
+
+        def remember_final(update):
+            if update.final:
+                final.append(update)
+            if progress is not None:
+                progress(update)
+
+        solution = solve_tsp(matrix, method, max_rounds, max_open_nodes, held_karp_max_nodes,
+                             held_karp_max_memory, warm_start, time_limit, gap, remember_final, seed, workers,
+                             symmetric=symmetric, preprocess=preprocess, initial_solution=initial_solution)
+        deterministic = method in ("heuristic", "lk") and time_limit is None
+        if final and (final[-1].proven or deterministic):
+            cache.put(matrix, settings, solution, final[-1].upper_bound, proven=final[-1].proven)
+        return solution
+
+    if method == "portfolio":
+        from core.parallel import solve_portfolio
+        return solve_portfolio(matrix, workers=workers, time_limit=time_limit, gap=gap, progress=progress)
+
+    start_time = perf_counter()
+    nodes = list(matrix.index)
+    cost = cost_array(matrix)
+    num_nodes = len(cost)
+
+    def labels(edges):
+        return [(nodes[i], nodes[j]) for i, j in edges]
+
+    def report(upper_bound, lower_bound, edges, source, final=False, message=None):
+        if progress is not None:
+            progress(SolverProgress(upper_bound, lower_bound, labels(edges) if edges is not None else None,
+                                    perf_counter() - start_time, source, final, message))
+
+    start_node = 0 if seed is None else int(np.random.default_rng(seed).integers(num_nodes))
+
+    def remaining_time():
+        if time_limit is None:
+            return None
+        return max(0.0, time_limit - (perf_counter() - start_time))
+
+    if method == "auto":
+        small = num_nodes <= held_karp_max_nodes and held_karp_memory(num_nodes) <= held_karp_max_memory
+        method = "hk" if small else "lk" if num_nodes >= LK_MIN_NODES else "mtz"
+
+    # jen heuristiky pracují s maticí na disku po částech, ostatní metody ji načtou celou
+    if method not in ("lk", "heuristic"):
+        cost = np.ascontiguousarray(cost, dtype=np.float64)
+
+    if method == "hk":
+        total, edges = held_karp(cost, max_memory=held_karp_max_memory)
+        report(total, total, edges, "held-karp", final=True)
+        return labels(edges)
+
+    if method == "lk":
+        # LK může navázat na zadanou výchozí trasu
+        given = solution_tour(initial_solution, nodes) if initial_solution is not None else None
+        tour = lk_tour(cost, time_limit=time_limit, start=start_node,
+                       initial_tour=given if is_valid_tour(cost, given) else None)
+        if not is_valid_tour(cost, tour):
+            raise RuntimeError("Heuristika nenašla trasu konečné délky")
+        edges = tour_edges(tour)
+        report(float(cost[tour, np.roll(tour, -1)].sum()), None, edges, "lk", final=True)
+        return labels(edges)
+
+    # heuristicka trasa - horni mez pro presne metody a zaloha pri vyprseni casu
+    initial_tour = None
+    reduce_model = preprocess and method in ("mtz", "dfj") and num_nodes >= 5
+    if warm_start or method == "heuristic" or time_limit is not None or reduce_model:
+        if num_nodes <= FULL_HEURISTIC_MAX_NODES:
+            initial_tour = heuristic_tour(cost, start_node)
+        else:
+            initial_tour = lk_tour(cost, time_limit=remaining_time(), start=start_node)
+        # trasa s nekonečnou délkou (zakázané hrany) není ani horní mez, ani záloha
+        if not is_valid_tour(cost, initial_tour):
+            initial_tour = None
+        else:
+            report(tour_cost(cost, initial_tour), None, tour_edges(initial_tour), "heuristic",
+                   final=method == "heuristic")
+
+    # zadaná výchozí trasa nahradí horší (nebo žádnou) heuristickou
+    if initial_solution is not None:
+        given = solution_tour(initial_solution, nodes)
+        if is_valid_tour(cost, given) and (initial_tour is None
+                                           or tour_cost(cost, given) < tour_cost(cost, initial_tour) - EPS):
+            initial_tour = given
+            report(tour_cost(cost, initial_tour), None, tour_edges(initial_tour), "initial")
+
+    if method == "heuristic":
+        if initial_tour is None:
+            raise RuntimeError("Heuristika nenašla trasu konečné délky")
+        return labels(tour_edges(initial_tour))
+
+    if method == "bb":
+        total, edges, lower_bound = branch_and_bound(
+            cost, max_open_nodes=max_open_nodes, initial_tour=initial_tour,
+            time_limit=remaining_time(), gap=gap,
+            on_incumbent=lambda value, found, bound: report(value, bound, found, "branch-and-bound"))
+        report(total, lower_bound, edges, "branch-and-bound", final=True)
+        return labels(edges)
+
+    # symetrická matice - neorientovaný model s polovičním počtem proměnných a řezy jako u DFJ
+    undirected = (method in ("mtz", "dfj") and num_nodes >= 3 and symmetric is not False
+                  and (symmetric or is_symmetric(cost)))
+
+    # predzpracovani - hrany, ktere nemohou byt v trase kratsi nez heuristicka, se do modelu nedostanou
+    # zakázané hrany (nekonečná vzdálenost) se do modelu nedostanou vůbec
+    finite = np.isfinite(cost) if method in ("mtz", "dfj") else None
+    keep = None if finite is None or finite.all() else finite
+    fixed = None
+    # jen ověřená trasa konečné délky je platná horní mez - jinak by vypadly i hrany optima
+    if reduce_model and initial_tour is not None:
+        # LK z trasy 2-opt/Or-opt zpřesní horní mez (čím těsnější, tím víc hran vypadne)
+        if num_nodes <= FULL_HEURISTIC_MAX_NODES:
+            improved = lk_tour(cost, time_limit=remaining_time(), initial_tour=initial_tour)
+            if is_valid_tour(cost, improved) and tour_cost(cost, improved) < tour_cost(cost, initial_tour) - EPS:
+                initial_tour = improved
+                report(tour_cost(cost, initial_tour), None, tour_edges(initial_tour), "heuristic")
+        reduction = reduce_edges(cost, tour_cost(cost, initial_tour), symmetric=undirected)
+        report(reduction.upper_bound, reduction.lower_bound, None, "preprocess", message=reduction.summary())
+        if reduction.lower_bound >= reduction.upper_bound - EPS:
+            # dolní mez dosáhla heuristické trasy - ta je optimální, model se vůbec nesestaví
+            edges = tour_edges(initial_tour)
+            report(reduction.upper_bound, reduction.upper_bound, edges, "preprocess", final=True)
+            return labels(edges)
+        keep, fixed = reduction.keep & finite, reduction.fixed
+
+    if undirected:
+        prob, x_vars, rows, cols, positions = build_symmetric_model(
+            cost, initial_tour if warm_start else None, keep, fixed)
+        find_subtours = lambda sel_rows, sel_cols: undirected_cycles(sel_rows, sel_cols, num_nodes)
+        add_cut = add_symmetric_subtour_cut
+        reset_warm_start = lambda: set_symmetric_warm_start(x_vars, initial_tour, positions)
+    else:
+        prob, x_vars, rows, cols, positions = build_tsp_model(
+            cost, method, initial_tour if warm_start else None, keep, fixed)
+        find_subtours = lambda sel_rows, sel_cols: index_cycles(sel_rows, sel_cols, num_nodes)
+        add_cut = add_subtour_cut
+        reset_warm_start = lambda: set_warm_start(x_vars, None, initial_tour, positions)
+    # trasa, která vede po vyřazené hraně nebo vynechá zafixovanou, se CBC nepředá
+    warm = (warm_start and initial_tour is not None
+            and warm_start_values(x_vars, initial_tour, positions) is not None)
+
+    # prubezne zpravy z logu CBC (jen pokud o ne nekdo stoji)
+    log_path = None
+    watcher = None
+    if progress is not None:
+        log_fd, log_path = tempfile.mkstemp(suffix="-cbc.log")
+        os.close(log_fd)
+        # u DFJ jsou celočíselná řešení CBC jen řešení relaxace (mohou obsahovat podcykly)
+        def on_cbc_update(upper, lower):
+            if method != "mtz" or undirected:
+                upper = None
+            if upper is not None or lower is not None:
+                report(upper, lower, None, "cbc")
+
+        watcher = CbcLogWatcher(log_path, on_cbc_update)
+        watcher.start()
+
+    def make_solver():
+        # potlačíme výpis zpráv
+        return PULP_CBC_CMD(msg=False, warmStart=warm,
+                            timeLimit=remaining_time(), gapRel=gap, logPath=log_path)
+
+    def has_solution():
+        return prob.sol_status in (LpSolutionOptimal, LpSolutionIntegerFeasible)
+
+    try:
+        # reseni problemu LP - PuLP knihovna
+        prob.solve(make_solver())
+
+        # overeni které hrany maji hodnotu 1
+        sel_rows, sel_cols = selected_edges(x_vars, rows, cols)
+
+        if method == "dfj" or undirected:
+            # dokud reseni obsahuje vice okruhu, pridame rezy a resime znovu
+            for round_no in range(max_rounds):
+                if not has_solution():
+                    break
+                cycles = find_subtours(sel_rows, sel_cols)
+                if len(cycles) <= 1:
+                    break
+                # optimum relaxace s castí rezu je dolni mez puvodni ulohy
+                if gap is None and LpStatus[prob.status] == "Optimal":
+                    report(None, value(prob.objective), None, "dfj")
+                if remaining_time() == 0.0:
+                    break
+                for c, cycle in enumerate(cycles):
+                    add_cut(prob, x_vars, cycle, positions, f"sec_{round_no}_{c}")
+                # solve prepsal hodnoty promennych podcykly - obnovime pocatecni trasu
+                if warm:
+                    reset_warm_start()
+                prob.solve(make_solver())
+                sel_rows, sel_cols = selected_edges(x_vars, rows, cols)
+            else:
+                raise RuntimeError(f"DFJ nenašla jediný okruh ani po {max_rounds} kolech")
+    finally:
+        if watcher is not None:
+            watcher.stop()
+            os.remove(log_path)
+
+    if undirected:
+        subtours = find_subtours(sel_rows, sel_cols) if has_solution() else []
+        single = len(subtours) == 1 and len(subtours[0]) == num_nodes
+    else:
+        single = has_solution() and is_single_tour(sel_rows, sel_cols, num_nodes)
+
+    if single:
+        # neorientované hrany se převedou na trasu v pořadí průchodu
+        edges = tour_edges(subtours[0]) if undirected else list(zip(sel_rows.tolist(), sel_cols.tolist()))
+    elif initial_tour is not None:
+        # CBC nestihl najit trasu (casovy limit) - vratime heuristickou
+        edges = tour_edges(initial_tour)
+    else:
+        raise RuntimeError(f"Řešič nenašel přípustnou trasu (stav: {LpStatus[prob.status]})")
+
+    total = float(sum(cost[i, j] for i, j in edges))
+    # optimum je prokázané jen pro trasu vybranou z řešení CBC, ne pro náhradní heuristickou
+    proven = (single and LpStatus[prob.status] == "Optimal" and gap is None
+              and prob.sol_status == LpSolutionOptimal)
+    lower_bound = total if proven else (watcher.lower_bound if watcher is not None else None)
+    report(total, lower_bound, edges, method, final=True)
+
+    # pridani do seznamu solution
+    solution = labels(edges)
+
+    return solution
+
+# další možné okruhy
+def find_cycles(matrix, solution):
+    """Vrátí uzavřené okruhy řešení (každý jednou), začínající prvním uzlem v pořadí matice"""
+    return solution_cycles(solution, matrix.index)
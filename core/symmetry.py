@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+from core.models import BLOCK_ROWS
+
+# Symetrie matice vzdáleností - vektorově po blocích řádků, bez smyček přes buňky
+# Kontrolu i symetrizaci volá GUI (MatrixView) z pracovního vlákna.
+# Symetrické matice (silniční vzdálenosti) řeší solve_tsp neorientovaným modelem s polovičním počtem proměnných.
+
+# povolený rozdíl cost[i, j] a cost[j, i], aby se matice považovala za symetrickou
+SYMMETRY_TOLERANCE = 1e-9
+
+def is_symmetric(cost, tol=SYMMETRY_TOLERANCE):
+    """Zjistí, zda |cost[i, j] - cost[j, i]| <= tol pro všechny dvojice uzlů
+
+    Porovnává se po blocích řádků proti odpovídajícím sloupcům, pomocná paměť je O(BLOCK_ROWS * n).
+    Shodné nekonečné hodnoty (zakázané hrany v obou směrech) se považují za symetrické.
+    """
+    # matice na disku / ze souřadnic (ScaledArray, CoordinateDistances) se čte jen po blocích
+    if not hasattr(cost, "shape"):
+        cost = np.asarray(cost)
+    num_nodes = cost.shape[0]
+    if tuple(cost.shape) != (num_nodes, num_nodes):
+        return False
+    for start in range(0, num_nodes, BLOCK_ROWS):
+        stop = min(start + BLOCK_ROWS, num_nodes)
+        block = np.asarray(cost[start:stop])
+        mirror = np.asarray(cost[:, start:stop]).T
+        with np.errstate(invalid="ignore"):
+            matches = (np.abs(block - mirror) <= tol) | (block == mirror)
+        if not matches.all():
+            return False
+    return True
+
+@dataclass
+class SymmetryReport:
+    """Výsledek kontroly symetrie - počet nesymetrických dvojic a největší odchylka"""
+    asymmetric_pairs: int  # počet dvojic i < j, kde se cost[i, j] a cost[j, i] liší víc než o toleranci
+    total_pairs: int
+    max_deviation: float  # největší |cost[i, j] - cost[j, i]|
+    max_pair: Optional[Tuple[int, int]]  # dvojice (i, j) s největší odchylkou
+    examples: List[Tuple[int, int]]  # první nesymetrické dvojice po řádcích
+
+    @property
+    def is_symmetric(self) -> bool:
+        return self.asymmetric_pairs == 0
+
+def pair_deviations(cost, start, stop):
+    """Odchylky |cost[i, j] - cost[j, i]| pro řádky start..stop-1, jen pro j > i (jinak 0)"""
+    block = np.asarray(cost[start:stop], dtype=np.float64)
+    mirror = np.asarray(cost[:, start:stop], dtype=np.float64).T
+    with np.errstate(invalid="ignore"):
+        deviation = np.where(block == mirror, 0.0, np.abs(block - mirror))
+    # chybějící hodnota (NaN) proti čemukoli se bere jako nekonečná odchylka
+    deviation[np.isnan(deviation)] = np.inf
+    return np.triu(deviation, start + 1)
+
+def analyze_symmetry(cost, tol=SYMMETRY_TOLERANCE, max_examples=5):
+    """Spočítá všechny nesymetrické dvojice a největší odchylku (SymmetryReport), po blocích řádků"""
+    num_nodes = cost.shape[0]
+    count = 0
+    max_deviation = 0.0
+    max_pair = None
+    examples = []
+    for start in range(0, num_nodes, BLOCK_ROWS):
+        stop = min(start + BLOCK_ROWS, num_nodes)
+        deviation = pair_deviations(cost, start, stop)
+        asymmetric = deviation > tol
+        count += int(asymmetric.sum())
+        if len(examples) < max_examples and asymmetric.any():
+            rows, cols = np.nonzero(asymmetric)
+            examples.extend(zip((rows[:max_examples] + start).tolist(), cols[:max_examples].tolist()))
+            examples = examples[:max_examples]
+        k = int(np.argmax(deviation))
+        row, col = divmod(k, num_nodes)
+        if deviation[row, col] > max_deviation:
+            max_deviation = float(deviation[row, col])
+            max_pair = (row + start, col)
+    return SymmetryReport(count, num_nodes * (num_nodes - 1) // 2, max_deviation, max_pair, examples)
+
+def symmetrize(cost):
+    """Vrátí symetrickou matici (A + A.T) / 2 jako nové pole float64, po blocích řádků"""
+    num_nodes = cost.shape[0]
+    result = np.empty((num_nodes, num_nodes), dtype=np.float64)
+    for start in range(0, num_nodes, BLOCK_ROWS):
+        stop = min(start + BLOCK_ROWS, num_nodes)
+        block = np.asarray(cost[start:stop], dtype=np.float64)
+        mirror = np.asarray(cost[:, start:stop], dtype=np.float64).T
+        result[start:stop] = (block + mirror) / 2
+    return result
@@ -0,0 +1,99 @@
+import numpy as np
+
+# Rekonstrukce trasy a okruhů z řešení (seznamu hran)
+# Následník každého uzlu se uloží do slovníku (popisky) nebo pole (indexy), každý uzel
+# se navštíví jednou - zpracování řešení je lineární i pro desetitisíce hran.
+
+def successor_map(solution):
+    """Vrátí slovník {uzel: následník} pro seznam hran s popisky"""
+    return dict(solution)
+
+def tour_sequence(solution):
+    """Vrátí pořadí míst trasy od prvního uzlu řešení (bez návratu do startu)"""
+    if not solution:
+        return []
+    next_node = successor_map(solution)
+    start_node = solution[0][0]
+    sequence = [start_node]
+    current_node = next_node.get(start_node)
+    while current_node is not None and current_node != start_node and len(sequence) < len(solution):
+        sequence.append(current_node)
+        current_node = next_node.get(current_node)
+    return sequence
+
+def solution_cycles(solution, nodes=None):
+    """Rozloží řešení na uzavřené okruhy, každý okruh vrátí jednou jako seznam popisků
+
+    Okruh začíná prvním svým uzlem v pořadí nodes (výchozí je pořadí hran řešení).
+    Otevřené cesty (uzel bez následníka) se vynechají.
+    """
+    next_node = successor_map(solution)
+    if nodes is None:
+        nodes = [edge[0] for edge in solution]
+    visited = set()
+    cycles = []
+    for start_node in nodes:
+        if start_node in visited or start_node not in next_node:
+            continue
+        cycle = [start_node]
+        visited.add(start_node)
+        current_node = next_node[start_node]
+        while current_node is not None and current_node not in visited:
+            visited.add(current_node)
+            cycle.append(current_node)
+            current_node = next_node.get(current_node)
+        if current_node == start_node:
+            cycles.append(cycle)
+    return cycles
+
+def solution_tour(solution, nodes):
+    """Převede seznam hran s popisky na pole indexů uzlů v pořadí trasy"""
+    position = {label: i for i, label in enumerate(nodes)}
+    return np.array([position[node] for node in tour_sequence(solution)], dtype=np.int64)
+
+def index_cycles(sel_rows, sel_cols, num_nodes):
+    """Rozloží vybrané hrany na okruhy, vrací seznam polí indexů uzlů"""
+    succ = np.full(num_nodes, -1, dtype=np.int64)
+    succ[sel_rows] = sel_cols
+    visited = np.zeros(num_nodes, dtype=bool)
+    cycles = []
+    for start in sel_rows.tolist():
+        if visited[start]:
+            continue
+        cycle = []
+        node = start
+        while node != -1 and not visited[node]:
+            visited[node] = True
+            cycle.append(node)
+            node = succ[node]
+        cycles.append(np.array(cycle))
+    return cycles
+
+def undirected_cycles(sel_rows, sel_cols, num_nodes):
+    """Rozloží neorientované hrany (každý uzel stupně 2) na okruhy, vrací seznam polí uzlů v pořadí průchodu"""
+    ends = np.concatenate((sel_rows, sel_cols))
+    others = np.concatenate((sel_cols, sel_rows))
+    # sousedé uzlu i jsou neighbours[offsets[i]:offsets[i + 1]]
+    neighbours = others[np.argsort(ends, kind="stable")].tolist()
+    offsets = np.concatenate(([0], np.cumsum(np.bincount(ends, minlength=num_nodes)))).tolist()
+    visited = np.zeros(num_nodes, dtype=bool)
+    cycles = []
+    for start in np.unique(ends).tolist():
+        if visited[start]:
+            continue
+        cycle = [start]
+        visited[start] = True
+        node = start
+        while True:
+            node = next((v for v in neighbours[offsets[node]:offsets[node + 1]] if not visited[v]), None)
+            if node is None:
+                break
+            visited[node] = True
+            cycle.append(node)
+        cycles.append(np.array(cycle))
+    return cycles
+
+def tour_edges(tour):
+    """Vrátí seznam hran (i, j) trasy zadané polem indexů uzlů"""
+    tour = np.asarray(tour)
+    return list(zip(tour.tolist(), np.roll(tour, -1).tolist()))
@@ -0,0 +1,130 @@
+import zipfile
+from numbers import Number
+import numpy as np
+from xml.sax.saxutils import escape, quoteattr
+from openpyxl.utils import get_column_letter
+
+# Proudový zápis .xlsx - řádky listu se generují jako XML přímo do ZIP archivu,
+# bez objektů buněk. Paměť nezávisí na velikosti listu a zápis je o řád rychlejší
+# než openpyxl (i v režimu write_only). Podporuje čísla, text a tučné písmo.
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PACKAGE_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+INF = float("inf")
+
+# styl buňky s tučným písmem (index v cellXfs ve styles.xml)
+BOLD_STYLE = 1
+
+STYLES_XML = (
+    XML_HEADER + f'<styleSheet xmlns="{MAIN_NS}">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+class StreamingWorksheet:
+    """List otevřený pro zápis - řádky se přidávají metodou append"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.row_number = 0
+        self.letters = []
+        stream.write((XML_HEADER + f'<worksheet xmlns="{MAIN_NS}"><sheetData>').encode("utf-8"))
+
+    def column_letters(self, width):
+        while len(self.letters) < width:
+            self.letters.append(get_column_letter(len(self.letters) + 1))
+        return self.letters
+
+    def append(self, values, bold_columns=()):
+        """Zapíše řádek hodnot (None = prázdná buňka), sloupce v bold_columns tučně"""
+        self.row_number += 1
+        r = self.row_number
+        letters = self.column_letters(len(values))
+        cells = []
+        for j, value in enumerate(values):
+            if value is None:
+                continue
+            style = f' s="{BOLD_STYLE}"' if j in bold_columns else ""
+            if isinstance(value, float):
+                if value != value:
+                    continue  # NaN = prázdná buňka
+                if value in (INF, -INF):
+                    value = "inf" if value > 0 else "-inf"
+                else:
+                    cells.append(f'<c r="{letters[j]}{r}"{style}><v>{float(value)!r}</v></c>')
+                    continue
+            if isinstance(value, (bool, np.bool_)):
+                cells.append(f'<c r="{letters[j]}{r}"{style} t="b"><v>{int(value)}</v></c>')
+            elif isinstance(value, Number):
+                cells.append(f'<c r="{letters[j]}{r}"{style}><v>{value}</v></c>')
+            else:
+                cells.append(f'<c r="{letters[j]}{r}"{style} t="inlineStr">'
+                             f'<is><t xml:space="preserve">{escape(str(value))}</t></is></c>')
+        self.stream.write(f'<row r="{r}">{"".join(cells)}</row>'.encode("utf-8"))
+
+    def close(self):
+        self.stream.write(b"</sheetData></worksheet>")
+        self.stream.close()
+
+class StreamingWorkbook:
+    """Sešit .xlsx zapisovaný postupně list po listu (vždy je otevřený nejvýše jeden list)"""
+
+    def __init__(self, filename):
+        self.archive = zipfile.ZipFile(filename, "w", zipfile.ZIP_DEFLATED, compresslevel=1)
+        self.sheet_names = []
+        self.current = None
+
+    def create_sheet(self, name):
+        """Uzavře předchozí list a otevře nový"""
+        if self.current is not None:
+            self.current.close()
+        self.sheet_names.append(name)
+        path = f"xl/worksheets/sheet{len(self.sheet_names)}.xml"
+        self.current = StreamingWorksheet(self.archive.open(path, "w", force_zip64=True))
+        return self.current
+
+    def close(self):
+        """Dopíše popis sešitu a uzavře soubor"""
+        if self.current is not None:
+            self.current.close()
+            self.current = None
+        count = len(self.sheet_names)
+        sheets = "".join(f'<Override PartName="/xl/worksheets/sheet{k}.xml" ContentType='
+                         f'"application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                         for k in range(1, count + 1))
+        self.archive.writestr("[Content_Types].xml", XML_HEADER +
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            + sheets + '</Types>')
+        self.archive.writestr("_rels/.rels", XML_HEADER +
+            f'<Relationships xmlns="{PACKAGE_REL_NS}"><Relationship Id="rId1" '
+            f'Type="{REL_NS}/officeDocument" Target="xl/workbook.xml"/></Relationships>')
+        self.archive.writestr("xl/workbook.xml", XML_HEADER +
+            f'<workbook xmlns="{MAIN_NS}" xmlns:r="{REL_NS}"><sheets>' +
+            "".join(f'<sheet name={quoteattr(name)} sheetId="{k}" r:id="rId{k}"/>'
+                    for k, name in enumerate(self.sheet_names, start=1)) +
+            '</sheets></workbook>')
+        self.archive.writestr("xl/_rels/workbook.xml.rels", XML_HEADER +
+            f'<Relationships xmlns="{PACKAGE_REL_NS}">' +
+            "".join(f'<Relationship Id="rId{k}" Type="{REL_NS}/worksheet" Target="worksheets/sheet{k}.xml"/>'
+                    for k in range(1, count + 1)) +
+            f'<Relationship Id="rId{count + 1}" Type="{REL_NS}/styles" Target="styles.xml"/>'
+            '</Relationships>')
+        self.archive.writestr("xl/styles.xml", STYLES_XML)
+        self.archive.close()
@@ -3,11 +3,14 @@ from tkinter import filedialog, ttk, messagebox, scrolledtext
 import threading
 import os
 from datetime import datetime
-import pandas as pd
 
 # Import modulů z aplikace
-from core.io_handlers import read_excel, write_excel
+from core.io_handlers import read_input, write_result, format_from_filename, EXPORT_FORMATS
 from core.solvers import solve_tsp, find_cycles
+from core.tours import tour_sequence
+from core.models import TSPSolution
+from core.cache import SolutionCache
+from core.incremental import reoptimize, is_small_edit
 from gui.matrix_editor import MatrixEditor
 from gui.matrix_view import MatrixView
 from gui.route_view import RouteView
@@ -26,8 +29,16 @@ class TSPOptimizerApp(tk.Tk):
         self.output_file_path = tk.StringVar()
         self.output_file_path.set("output_metoda_branch_and_bound.xlsx")
         
-        # Proměnná pro volbu generování Excel souboru
+        # Proměnná pro volbu generování výstupního souboru a jeho formátu
         self.generate_excel = tk.BooleanVar(value=True)
+        self.output_format = tk.StringVar(value="xlsx")
+        
+        # Nastavení výpočtu (metoda, časový limit v sekundách, relativní mezera v %)
+        self.solver_method = tk.StringVar(value="auto")
+        self.time_limit = tk.StringVar(value="")
+        self.gap_percent = tk.StringVar(value="")
+        # Po malé úpravě matice přepočítat trasu lokálně z předchozího řešení
+        self.incremental_resolve = tk.BooleanVar(value=True)
         
         # Proměnné pro výsledky
         self.result_distance = tk.StringVar()
@@ -41,9 +52,20 @@ class TSPOptimizerApp(tk.Tk):
         self.cycles = None
         self.route_sequence = None
         
+        # Matice a dolní mez, ke kterým patří self.solution (pro přepočet po úpravách)
+        self.solved_matrix = None
+        self.solution_lower_bound = None
+        self.solution_proven = False
+        
         # Stav výpočtu
         self.calculation_running = False
         
+        # Mezipaměť řešení (opakovaný výpočet stejné matice se nepočítá znovu)
+        try:
+            self.solution_cache = SolutionCache()
+        except OSError:
+            self.solution_cache = None
+        
         # Vytvoření UI
         self.create_ui()
         
@@ -86,10 +108,19 @@ class TSPOptimizerApp(tk.Tk):
         
         # Zaškrtávací pole pro generování Excel souboru
         self.excel_check = ttk.Checkbutton(self.output_frame, 
-                                          text="Generovat Excel soubor", 
+                                          text="Generovat výstupní soubor", 
                                           variable=self.generate_excel,
                                           command=self.toggle_output_widgets)
-        self.excel_check.pack(anchor="w", padx=5, pady=2)
+        self.excel_check.pack(side=tk.TOP, anchor="w", padx=5, pady=2)
+        
+        # Formát výstupu - json/parquet/arrow/npz obsahují jen trasu (rychlé i pro velké matice)
+        format_frame = ttk.Frame(self.output_frame)
+        format_frame.pack(side=tk.BOTTOM, anchor="w", padx=5, pady=2)
+        ttk.Label(format_frame, text="Formát:").pack(side=tk.LEFT)
+        format_combo = ttk.Combobox(format_frame, textvariable=self.output_format, state="readonly",
+                                    width=10, values=list(EXPORT_FORMATS))
+        format_combo.pack(side=tk.LEFT, padx=5)
+        format_combo.bind("<<ComboboxSelected>>", self.on_output_format_changed)
         
         # Frame pro výběr cesty k výstupnímu souboru
         self.output_path_frame = ttk.Frame(self.output_frame)
@@ -101,6 +132,24 @@ class TSPOptimizerApp(tk.Tk):
         self.output_button = ttk.Button(self.output_path_frame, text="Procházet...", command=self.browse_output_file)
         self.output_button.pack(side=tk.RIGHT)
         
+        # Sekce pro nastavení výpočtu
+        solver_frame = ttk.LabelFrame(form_frame, text="Nastavení výpočtu", padding="10")
+        solver_frame.grid(row=1, column=0, columnspan=2, sticky="ew", padx=5, pady=5)
+        
+        ttk.Label(solver_frame, text="Metoda:").pack(side=tk.LEFT)
+        method_combo = ttk.Combobox(solver_frame, textvariable=self.solver_method, state="readonly", width=12,
+                                    values=("auto", "mtz", "dfj", "bb", "hk", "heuristic", "lk", "portfolio"))
+        method_combo.pack(side=tk.LEFT, padx=(5, 15))
+        
+        ttk.Label(solver_frame, text="Časový limit [s]:").pack(side=tk.LEFT)
+        ttk.Entry(solver_frame, textvariable=self.time_limit, width=8).pack(side=tk.LEFT, padx=(5, 15))
+        
+        ttk.Label(solver_frame, text="Povolená odchylka od optima [%]:").pack(side=tk.LEFT)
+        ttk.Entry(solver_frame, textvariable=self.gap_percent, width=8).pack(side=tk.LEFT, padx=(5, 15))
+        
+        ttk.Checkbutton(solver_frame, text="Po úpravě matice přepočítat jen změny",
+                        variable=self.incremental_resolve).pack(side=tk.LEFT)
+        
         # Nastavení vah sloupců
         form_frame.columnconfigure(0, weight=1)
         form_frame.columnconfigure(1, weight=1)
@@ -216,11 +265,18 @@ class TSPOptimizerApp(tk.Tk):
         else:
             self.output_path_frame.pack_forget()
     
+    def on_output_format_changed(self, event=None):
+        """Změní příponu výstupního souboru podle zvoleného formátu"""
+        path = self.output_file_path.get()
+        if path:
+            extension = EXPORT_FORMATS[self.output_format.get()][0]
+            self.output_file_path.set(os.path.splitext(path)[0] + extension)
+    
     def browse_input_file(self):
         """Otevře dialog pro výběr vstupního souboru"""
         file_path = filedialog.askopenfilename(
-            title="Vyberte vstupní Excel soubor",
-            filetypes=[("Excel soubory", "*.xlsx;*.xls"), ("Všechny soubory", "*.*")]
+            title="Vyberte vstupní soubor (matice nebo souřadnice bodů)",
+            filetypes=[("Excel soubory", "*.xlsx;*.xls"), ("Souřadnice CSV", "*.csv"), ("Všechny soubory", "*.*")]
         )
         if file_path:
             self.input_file_path.set(file_path)
@@ -230,18 +286,21 @@ class TSPOptimizerApp(tk.Tk):
             if self.generate_excel.get() and (not self.output_file_path.get() or self.output_file_path.get() == "output_metoda_branch_and_bound.xlsx"):
                 dir_name = os.path.dirname(file_path)
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                out_file = os.path.join(dir_name, f"optimalizovana_trasa_{timestamp}.xlsx")
+                extension = EXPORT_FORMATS[self.output_format.get()][0]
+                out_file = os.path.join(dir_name, f"optimalizovana_trasa_{timestamp}{extension}")
                 self.output_file_path.set(out_file)
     
     def browse_output_file(self):
         """Otevře dialog pro výběr výstupního souboru"""
         file_path = filedialog.asksaveasfilename(
             title="Zvolte umístění výstupního souboru",
-            defaultextension=".xlsx",
-            filetypes=[("Excel soubory", "*.xlsx"), ("Všechny soubory", "*.*")]
+            defaultextension=EXPORT_FORMATS[self.output_format.get()][0],
+            filetypes=[("Excel soubory", "*.xlsx"), ("JSON", "*.json"), ("Parquet", "*.parquet"),
+                       ("Arrow", "*.arrow;*.feather"), ("NumPy", "*.npz"), ("Všechny soubory", "*.*")]
         )
         if file_path:
             self.output_file_path.set(file_path)
+            self.output_format.set(format_from_filename(file_path, self.output_format.get()))
             self.log("Výstupní soubor bude uložen jako: " + file_path)
     
     def log(self, message):
@@ -260,6 +319,13 @@ class TSPOptimizerApp(tk.Tk):
             messagebox.showerror("Chyba", "Prosím zadejte název výstupního souboru.")
             return
         
+        # Kontrola nastavení výpočtu
+        try:
+            self.get_solver_options()
+        except ValueError:
+            messagebox.showerror("Chyba", "Časový limit a odchylka musí být kladná čísla (nebo prázdné).")
+            return
+        
         # Zamezení spuštění více výpočtů současně
         if self.calculation_running:
             messagebox.showinfo("Informace", "Výpočet již probíhá. Počkejte prosím na dokončení.")
@@ -281,14 +347,26 @@ class TSPOptimizerApp(tk.Tk):
             # Načtení matice ze souboru pouze pokud není již vytvořena
             if self.matrix is None:
                 self.log("Načítání vstupního souboru...")
-                self.matrix = read_excel(self.input_file_path.get())
+                self.matrix = read_input(self.input_file_path.get())
                 self.log(f"Soubor načten. Velikost matice: {len(self.matrix)}x{len(self.matrix)}")
             else:
                 self.log(f"Použití existující matice. Velikost: {len(self.matrix)}x{len(self.matrix)}")
             
-            # Řešení TSP
-            self.log("Spouštím výpočet metodou Branch and Bound...")
-            self.solution = solve_tsp(self.matrix)
+            # Řešení TSP - po malé úpravě matice jen lokální přepočet předchozí trasy
+            if self.incremental_resolve.get() and self.solution and is_small_edit(self.solved_matrix, self.matrix):
+                self.log("Matice se od posledního výpočtu změnila jen málo, přepočítávám předchozí trasu...")
+                # nepotvrzenou trasu z přepočtu dořeší přesný výpočet, přepočet je jen výchozí řešení
+                solver_options = dict(cache=self.solution_cache, **self.get_solver_options())
+                edges = reoptimize(self.matrix, self.solution.edges, self.solved_matrix,
+                                   self.solution_lower_bound, progress=self.on_solver_progress,
+                                   solver_options=solver_options)
+            else:
+                self.log("Spouštím výpočet metodou Branch and Bound...")
+                edges = solve_tsp(self.matrix, progress=self.on_solver_progress,
+                                  cache=self.solution_cache, **self.get_solver_options())
+            # trasa jako pole indexů, délky úseků a součet se spočtou jen jednou
+            self.solution = TSPSolution.from_edges(self.matrix, edges, proven=self.solution_proven)
+            self.solved_matrix = self.matrix.copy()
             self.log("Výpočet dokončen!")
             
             # Nalezení alternativních cyklů
@@ -296,19 +374,24 @@ class TSPOptimizerApp(tk.Tk):
             self.cycles = find_cycles(self.matrix, self.solution)
             
             # Sestavení pořadí uzlů
-            self.route_sequence = self.get_route_sequence()
+            self.route_sequence = self.solution.node_sequence
             
             # Výpis výsledků
-            total_distance = sum(self.matrix.loc[node[0], node[1]] for node in self.solution)
-            self.log(f"Nalezeno optimální řešení s celkovou vzdáleností: {total_distance}")
+            total_distance = self.solution.total_distance
+            if self.solution.proven:
+                self.log(f"Nalezeno optimální řešení s celkovou vzdáleností: {total_distance}")
+            else:
+                self.log(f"Nalezeno řešení s celkovou vzdáleností: {total_distance} "
+                         "(heuristické, optimalita není prokázána)")
             
-            # Export do Excelu pouze pokud je zaškrtnuto
+            # Export pouze pokud je zaškrtnuto
             if self.generate_excel.get():
                 self.log(f"Zapisuji výsledky do výstupního souboru: {self.output_file_path.get()}")
-                write_excel(self.matrix, self.solution, self.cycles, self.output_file_path.get())
+                write_result(self.matrix, self.solution, self.cycles, self.output_file_path.get(),
+                             self.output_format.get())
                 self.log("Export dokončen!")
             else:
-                self.log("Export do Excelu byl přeskočen (není zaškrtnuto).")
+                self.log("Export výsledků byl přeskočen (není zaškrtnuto).")
             
             # Aktualizace zobrazení výsledků
             self.update_results_display()
@@ -316,13 +399,15 @@ class TSPOptimizerApp(tk.Tk):
             # Předání dat komponentám pro zobrazení
             self.matrix_view.set_matrix(self.matrix)
             self.matrix_view.set_solution(self.solution)
-            self.route_view.set_data(self.matrix, self.solution, self.route_sequence)
+            self.route_view.set_data(self.matrix, self.solution)
             
             # Přepnutí na záložku s vizualizací
             self.notebook.select(self.route_view.route_tab)
             
             # Potvrzení dokončení
             success_message = f"Optimalizace úspěšně dokončena!\nCelková vzdálenost: {total_distance}"
+            if not self.solution.proven:
+                success_message += "\n(Heuristické řešení - optimalita není prokázána.)"
             
             if self.generate_excel.get():
                 success_message += f"\nVýsledky uloženy do: {self.output_file_path.get()}"
@@ -343,14 +428,62 @@ class TSPOptimizerApp(tk.Tk):
             self.calculation_running = False
             self.status_var.set("Připraveno")
     
+    def get_solver_options(self):
+        """Vrátí parametry pro solve_tsp podle nastavení výpočtu (ValueError při chybném vstupu)"""
+        options = {"method": self.solver_method.get()}
+        for key, var, scale in (("time_limit", self.time_limit, 1.0), ("gap", self.gap_percent, 0.01)):
+            text = var.get().strip().replace(",", ".")
+            if text:
+                number = float(text)
+                if number <= 0:
+                    raise ValueError(text)
+                options[key] = number * scale
+        return options
+    
+    def on_solver_progress(self, progress):
+        """Průběžná zpráva z řešiče - zapíše zlepšení do logu a zobrazí nejlepší trasu"""
+        if progress.final:
+            self.solution_lower_bound = progress.lower_bound
+            self.solution_proven = progress.proven
+        if progress.source == "incremental":
+            # bez final=True pokračuje přesný výpočet z této trasy
+            follow_up = "" if progress.final else " Pokračuji přesným výpočtem z této trasy..."
+            if progress.proven:
+                self.log(f"Přepočet za {progress.elapsed:.2f} s: trasa {progress.upper_bound:g} je stále optimální.")
+            elif progress.lower_bound is not None:
+                self.log(f"Přepočet za {progress.elapsed:.2f} s: trasa {progress.upper_bound:g}, "
+                         f"dolní mez {progress.lower_bound:g} (odchylka nejvýše {progress.gap * 100:.2f} %)."
+                         + follow_up)
+            else:
+                self.log(f"Přepočet za {progress.elapsed:.2f} s: trasa {progress.upper_bound:g}." + follow_up)
+            return
+        if progress.source == "cache":
+            self.log("Řešení této matice bylo nalezeno v mezipaměti - výpočet se neopakuje.")
+            return
+        if progress.final:
+            return
+        message = f"[{progress.elapsed:.1f} s, {progress.source}]"
+        if progress.upper_bound is not None:
+            message += f" nejlepší trasa: {progress.upper_bound:g}"
+        if progress.lower_bound is not None:
+            message += f" dolní mez: {progress.lower_bound:g}"
+        if progress.gap is not None:
+            message += f" (odchylka {progress.gap * 100:.2f} %)"
+        if progress.message:
+            message += f" - {progress.message}"
+        self.log(message)
+        
+        # Zobrazení průběžně nejlepší trasy
+        if progress.solution:
+            self.result_distance.set(f"Celková vzdálenost: {progress.upper_bound:g} (průběžně)")
+            self.result_sequence.set(" → ".join(self.get_route_sequence(progress.solution)))
+    
     def update_results_display(self):
         """Aktualizuje zobrazení výsledků v hlavním okně"""
         if not self.solution:
             return
             
-        # Výpočet celkové vzdálenosti
-        total_distance = sum(self.matrix.loc[node[0], node[1]] for node in self.solution)
-        self.result_distance.set(f"Celková vzdálenost: {total_distance}")
+        self.result_distance.set(f"Celková vzdálenost: {self.solution.total_distance:g}")
         
         # Zobrazení pořadí bodů
         if self.route_sequence:
@@ -359,33 +492,13 @@ class TSPOptimizerApp(tk.Tk):
         # Povolení výběru textu v entry pro pořadí bodů
         self.sequence_entry.configure(state="readonly")
     
-    def get_route_sequence(self):
-        """Získá sekvenci bodů z řešení"""
-        if not self.solution:
-            return []
-        
-        # Sestavíme slovník pro každý uzel a jeho následovníka
-        next_node = {}
-        for edge in self.solution:
-            next_node[edge[0]] = edge[1]
-        
-        # Začneme na libovolném uzlu (první z hran)
-        if not self.solution:  # Explicitní kontrola pro jistotu
-            return []
-            
-        start_node = self.solution[0][0]
-        current_node = start_node
-        route_sequence = [current_node]
-        
-        # Postupně projdeme trasu
-        while len(route_sequence) < len(self.solution):
-            if current_node in next_node:
-                current_node = next_node[current_node]
-                route_sequence.append(current_node)
-            else:
-                break
-        
-        return route_sequence
+    def get_route_sequence(self, solution=None):
+        """Získá sekvenci bodů z řešení (výchozí je self.solution)"""
+        if solution is None:
+            solution = self.solution
+        if isinstance(solution, TSPSolution):
+            return solution.node_sequence
+        return tour_sequence(solution)
     
     def load_and_display_matrix(self):
         """Načte matici ze souboru a zobrazí ji"""
@@ -396,7 +509,7 @@ class TSPOptimizerApp(tk.Tk):
         try:
             # Načtení matice pokud ještě nebyla načtena
             if self.matrix is None:
-                self.matrix = read_excel(self.input_file_path.get())
+                self.matrix = read_input(self.input_file_path.get())
             
             # Zobrazení matice
             self.matrix_view.set_matrix(self.matrix)
@@ -423,6 +536,9 @@ class TSPOptimizerApp(tk.Tk):
             self.solution = None
             self.cycles = None
             self.route_sequence = None
+            self.solved_matrix = None
+            self.solution_lower_bound = None
+            self.solution_proven = False
             
             # Reset logu
             self.log_text.delete(1.0, tk.END)
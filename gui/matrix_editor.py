@@ -1,8 +1,19 @@
+import io
 import tkinter as tk
 from tkinter import ttk, messagebox
+import numpy as np
 import pandas as pd
-import random
-from gui.utils import validate_float_input
+from gui.matrix_grid import EditableMatrixGrid
+
+# největší matice, kterou lze v editoru vytvořit
+MAX_EDITOR_SIZE = 1000
+
+def parse_pasted_block(text):
+    """Převede text zkopírovaný z tabulky (řádky, sloupce oddělené tabulátorem) na pole, NaN = prázdné"""
+    # desetinná čárka (český Excel) na tečku, nečíselné buňky se převedou na NaN
+    frame = pd.read_csv(io.StringIO(text.replace(",", ".")), sep="\t", header=None,
+                        skip_blank_lines=True, dtype=str)
+    return frame.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
 
 class MatrixEditor:
     def __init__(self, parent, notebook):
@@ -18,7 +29,7 @@ class MatrixEditor:
         # Proměnné pro ukládání dat
         self.matrix_size_var = tk.IntVar(value=3)  # Výchozí velikost matice
         self.matrix_names = []  # Názvy bodů
-        self.matrix_values = {}  # Hodnoty v matici
+        self.matrix_values = np.zeros((0, 0))  # Hodnoty v matici (NaN = nevyplněno)
         
         self.create_ui()
     
@@ -35,7 +46,7 @@ class MatrixEditor:
         # Počet bodů
         ttk.Label(setup_frame, text="Počet bodů (velikost matice):").grid(row=0, column=0, sticky="w", padx=5, pady=5)
         
-        size_spinner = ttk.Spinbox(setup_frame, from_=2, to=20, textvariable=self.matrix_size_var, width=5)
+        size_spinner = ttk.Spinbox(setup_frame, from_=2, to=MAX_EDITOR_SIZE, textvariable=self.matrix_size_var, width=5)
         size_spinner.grid(row=0, column=1, sticky="w", padx=5, pady=5)
         
         # Tlačítko pro inicializaci matice
@@ -44,9 +55,19 @@ class MatrixEditor:
         create_button.grid(row=0, column=2, sticky="w", padx=5, pady=5)
         
         # Středová část - editace názvů bodů a hodnot matice
-        self.editor_frame = ttk.Frame(main_container)
+        self.editor_frame = ttk.LabelFrame(main_container, text="Matice vzdáleností", padding="10")
         self.editor_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
+        ttk.Label(self.editor_frame,
+                  text="Psaní čísla nebo dvojklik upraví buňku, Enter/Tab/šipky přesun, Delete vymaže, "
+                       "Ctrl+V vloží blok zkopírovaný z Excelu, dvojklik na název bodu jej přejmenuje.").pack(anchor="w")
+        
+        # Tabulka na plátně - hodnoty jsou v poli NumPy, upravuje se jen aktivní buňka
+        self.matrix_grid = EditableMatrixGrid(self.editor_frame)
+        self.matrix_grid.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
+        self.matrix_grid.canvas.bind("<<Paste>>", lambda e: self.paste_matrix_values())
+        self.matrix_grid.canvas.bind("<Control-v>", lambda e: self.paste_matrix_values() or "break")
+        
         # Dolní část - tlačítka pro akce s maticí
         action_frame = ttk.Frame(main_container)
         action_frame.pack(fill=tk.X, padx=5, pady=10)
@@ -61,6 +82,9 @@ class MatrixEditor:
         ttk.Button(action_frame, text="Vymazat hodnoty", 
                   command=self.clear_matrix_values).pack(side=tk.LEFT, padx=5)
         
+        ttk.Button(action_frame, text="Vložit ze schránky", 
+                  command=self.paste_matrix_values).pack(side=tk.LEFT, padx=5)
+        
         # Tlačítko pro vytvoření matice
         ttk.Button(action_frame, text="Použít matici", 
                   command=self.apply_created_matrix,
@@ -71,125 +95,77 @@ class MatrixEditor:
     
     def initialize_matrix_editor(self):
         """Inicializuje editor matice podle vybrané velikosti"""
-        # Vyčistit existující editor
-        for widget in self.editor_frame.winfo_children():
-            widget.destroy()
-        
         size = self.matrix_size_var.get()
         
-        # Vytvořit scrollovatelný rámec
-        canvas = tk.Canvas(self.editor_frame)
-        scrollbar = ttk.Scrollbar(self.editor_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Sekce pro názvy bodů
-        names_frame = ttk.LabelFrame(scrollable_frame, text="Názvy bodů", padding="10")
-        names_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        self.matrix_names = []
-        for i in range(size):
-            row_frame = ttk.Frame(names_frame)
-            row_frame.pack(fill=tk.X, padx=5, pady=2)
-            
-            ttk.Label(row_frame, text=f"Bod {i+1}:").pack(side=tk.LEFT, padx=5)
-            
-            name_var = tk.StringVar(value=f"Bod {i+1}")
-            self.matrix_names.append(name_var)
-            
-            name_entry = ttk.Entry(row_frame, textvariable=name_var, width=20)
-            name_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
-        
-        # Sekce pro hodnoty matice
-        matrix_frame = ttk.LabelFrame(scrollable_frame, text="Matice vzdáleností", padding="10")
-        matrix_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        # Záhlaví tabulky
-        ttk.Label(matrix_frame, text="", width=10).grid(row=0, column=0)
-        for i in range(size):
-            ttk.Label(matrix_frame, text=f"Bod {i+1}", width=10).grid(row=0, column=i+1, padx=2, pady=2)
-        
-        # Vytvoření vstupních polí matice
-        self.matrix_values = {}
-        
-        for i in range(size):
-            ttk.Label(matrix_frame, text=f"Bod {i+1}", width=10).grid(row=i+1, column=0, padx=2, pady=2)
-            
-            for j in range(size):
-                var = tk.StringVar()
-                
-                # Na diagonále použijeme hodnotu 0
-                if i == j:
-                    var.set("0")
-                    entry = ttk.Entry(matrix_frame, textvariable=var, width=10, state="readonly")
-                else:
-                    var.set("")
-                    entry = ttk.Entry(matrix_frame, textvariable=var, width=10)
-                    
-                    # Validace vstupu na číselné hodnoty
-                    vcmd = (self.parent.register(validate_float_input), '%P')
-                    entry.config(validate="key", validatecommand=vcmd)
-                
-                entry.grid(row=i+1, column=j+1, padx=2, pady=2)
-                self.matrix_values[(i, j)] = var
+        # Na diagonále použijeme hodnotu 0, ostatní buňky jsou prázdné (NaN)
+        self.matrix_values = np.full((size, size), np.nan)
+        np.fill_diagonal(self.matrix_values, 0.0)
+        
+        # tabulka pracuje přímo s polem i seznamem názvů (přejmenování se projeví v self.matrix_names)
+        self.matrix_grid.finish_edit()
+        self.matrix_grid.set_data(self.matrix_values, [f"Bod {i+1}" for i in range(size)])
+        self.matrix_names = self.matrix_grid.row_labels
+        self.matrix_grid.select(0, 1 if size > 1 else 0)
         
         # Přepnout na záložku vytvořit matici
         self.notebook.select(self.create_matrix_tab)
 
+    def refresh(self):
+        """Překreslí tabulku po hromadné změně hodnot"""
+        self.matrix_grid.finish_edit()
+        self.matrix_grid.redraw()
+
     def mirror_matrix_values(self):
         """Zkopíruje hodnoty z horní trojúhelníkové části matice do spodní části"""
-        size = self.matrix_size_var.get()
-        
-        for i in range(size):
-            for j in range(i+1, size):
-                value = self.matrix_values[(i, j)].get()
-                
-                if value and value.strip():
-                    self.matrix_values[(j, i)].set(value)
+        self.matrix_grid.finish_edit()
+        rows, cols = np.nonzero(np.triu(~np.isnan(self.matrix_values), 1))
+        self.matrix_values[cols, rows] = self.matrix_values[rows, cols]
+        self.refresh()
 
     def fill_random_matrix_values(self):
         """Vyplní matici náhodnými hodnotami"""
-        size = self.matrix_size_var.get()
-        
-        for i in range(size):
-            for j in range(size):
-                if i != j:  # Přeskočit diagonálu
-                    # Generovat náhodnou vzdálenost mezi 1 a 100
-                    random_value = round(random.uniform(1, 100), 1)
-                    self.matrix_values[(i, j)].set(str(random_value))
+        self.matrix_grid.finish_edit()
+        size = len(self.matrix_values)
+        # Generovat náhodné vzdálenosti mezi 1 a 100
+        self.matrix_values[...] = np.round(np.random.uniform(1, 100, (size, size)), 1)
+        np.fill_diagonal(self.matrix_values, 0.0)  # Přeskočit diagonálu
+        self.refresh()
 
     def clear_matrix_values(self):
         """Vymaže všechny hodnoty v matici kromě diagonály"""
-        size = self.matrix_size_var.get()
-        
-        for i in range(size):
-            for j in range(size):
-                if i != j:  # Přeskočit diagonálu
-                    self.matrix_values[(i, j)].set("")
+        self.matrix_grid.finish_edit()
+        self.matrix_values[...] = np.nan
+        np.fill_diagonal(self.matrix_values, 0.0)
+        self.refresh()
+
+    def paste_matrix_values(self):
+        """Vloží blok hodnot ze schránky od aktivní buňky (přesahující část se ořízne)"""
+        self.matrix_grid.finish_edit()
+        try:
+            block = parse_pasted_block(self.parent.clipboard_get())
+        except (tk.TclError, ValueError, pd.errors.ParserError, pd.errors.EmptyDataError):
+            messagebox.showerror("Vložení ze schránky", "Schránka neobsahuje tabulku hodnot.")
+            return
+        row, col = self.matrix_grid.active
+        size = len(self.matrix_values)
+        block = block[:size - row, :size - col]
+        self.matrix_values[row:row + block.shape[0], col:col + block.shape[1]] = block
+        np.fill_diagonal(self.matrix_values, 0.0)
+        self.parent.log(f"Vloženo {block.shape[0]}x{block.shape[1]} hodnot od buňky ({row + 1}, {col + 1}).")
+        self.refresh()
 
     def apply_created_matrix(self):
         """Vytvoří matici z hodnot zadaných v editoru"""
-        size = self.matrix_size_var.get()
+        self.matrix_grid.finish_edit()
         
         # Kontrola, zda jsou všechny hodnoty zadány
-        missing = []
-        for i in range(size):
-            for j in range(size):
-                if i != j and not self.matrix_values[(i, j)].get().strip():
-                    missing.append((i+1, j+1))
-        
-        if missing:
-            missing_str = ", ".join([f"({i},{j})" for i, j in missing])
+        missing_rows, missing_cols = np.nonzero(np.isnan(self.matrix_values))
+        if len(missing_rows):
+            missing_str = ", ".join(f"({i + 1},{j + 1})" for i, j in
+                                    zip(missing_rows[:10].tolist(), missing_cols[:10].tolist()))
+            if len(missing_rows) > 10:
+                missing_str += f" a dalších {len(missing_rows) - 10}"
+            self.matrix_grid.select(int(missing_rows[0]), int(missing_cols[0]))
             messagebox.showerror(
                 "Chybějící hodnoty",
                 f"Některé vzdálenosti nejsou zadány: {missing_str}\n\n"
@@ -198,22 +174,13 @@ class MatrixEditor:
             return None
         
         # Získat názvy bodů
-        node_labels = [name_var.get() for name_var in self.matrix_names]
-        
-        # Sestavit dataframe
-        matrix_data = {}
-        for j in range(size):
-            col_data = []
-            for i in range(size):
-                if i == j:
-                    col_data.append(0)  # Diagonála je vždy 0
-                else:
-                    col_data.append(float(self.matrix_values[(i, j)].get()))
-                    
-            matrix_data[node_labels[j]] = col_data
-        
-        # Vytvořit pandas DataFrame
-        matrix = pd.DataFrame(matrix_data, index=node_labels)
+        node_labels = list(self.matrix_names)
+        if len(set(node_labels)) != len(node_labels):
+            messagebox.showerror("Duplicitní názvy", "Názvy bodů musí být jedinečné.")
+            return None
+        
+        # Vytvořit pandas DataFrame (kopie - další úpravy v editoru matici nezmění)
+        matrix = pd.DataFrame(self.matrix_values.copy(), index=node_labels, columns=node_labels)
         
         # Informovat uživatele
         messagebox.showinfo("Matice vytvořena", "Nová matice byla úspěšně vytvořena a je připravena k použití.")
@@ -223,4 +190,4 @@ class MatrixEditor:
             self.on_matrix_created(matrix)
     
         # Vrátit vytvořenou matici
-        return matrix
\ No newline at end of file
+        return matrix
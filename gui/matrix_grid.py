@@ -0,0 +1,451 @@
+import tkinter as tk
+from tkinter import ttk
+import numpy as np
+from gui.utils import validate_float_input
+
+# Virtualizovaná tabulka matice na plátně (Canvas)
+# Vykreslují se jen buňky ve viditelném výřezu, hodnoty se čtou po blocích přímo z pole
+# (NumPy, memmap DistanceMatrix nebo vzdálenosti ze souřadnic). Položky plátna se při posunu
+# znovu použijí, jejich počet závisí jen na velikosti okna, ne na velikosti matice.
+
+CELL_WIDTH = 80
+CELL_HEIGHT = 22
+HEADER_WIDTH = 120
+
+BACKGROUND = "white"
+HEADER_BACKGROUND = "#f0f0f0"
+GRID_COLOR = "#d9d9d9"
+HIGHLIGHT_BACKGROUND = "#e6f2ff"
+DIAGONAL_BACKGROUND = "#f7f7f7"
+
+def format_value(value):
+    """Text buňky - čísla zkráceně (%g), ostatní hodnoty tak, jak jsou"""
+    if isinstance(value, (float, np.floating)):
+        return "" if value != value else f"{value:g}"
+    return str(value)
+
+class MatrixGrid(ttk.Frame):
+    """Tabulka n x n se záhlavím řádků a sloupců, posun po celých buňkách"""
+
+    def __init__(self, parent, cell_width=CELL_WIDTH, cell_height=CELL_HEIGHT, header_width=HEADER_WIDTH):
+        super().__init__(parent)
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.header_width = header_width
+
+        self.values = None
+        self.row_labels = []
+        self.col_labels = []
+        # successor[i] = sloupec zvýrazněné buňky v řádku i (-1 = žádná)
+        self.successor = None
+
+        # první viditelný řádek a sloupec
+        self.top_row = 0
+        self.left_col = 0
+
+        # položky plátna znovu používané při překreslení: (obdélník, text) pro každou pozici výřezu
+        self.cell_items = {}
+        self.row_header_items = {}
+        self.col_header_items = {}
+
+        self.canvas = tk.Canvas(self, background=BACKGROUND, highlightthickness=0)
+        self.y_scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.x_scrollbar = ttk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.xview)
+        self.y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.x_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+
+        self.canvas.bind("<Configure>", lambda e: self.redraw())
+        self.canvas.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.canvas.bind("<Shift-MouseWheel>", lambda e: self.on_mouse_wheel(e, horizontal=True))
+        self.canvas.bind("<Button-4>", lambda e: self.scroll_rows(-3))
+        self.canvas.bind("<Button-5>", lambda e: self.scroll_rows(3))
+        self.canvas.bind("<Shift-Button-4>", lambda e: self.scroll_cols(-3))
+        self.canvas.bind("<Shift-Button-5>", lambda e: self.scroll_cols(3))
+
+    def set_data(self, values, row_labels, col_labels=None):
+        """Nastaví zobrazované pole n x m (stačí indexování řezy [r0:r1, c0:c1]) a popisky"""
+        self.values = values
+        self.row_labels = [str(label) for label in row_labels]
+        self.col_labels = [str(label) for label in (col_labels if col_labels is not None else row_labels)]
+        self.successor = None
+        self.top_row = 0
+        self.left_col = 0
+        self.redraw()
+
+    def clear(self):
+        """Odstraní data i všechny položky plátna"""
+        self.values = None
+        self.row_labels = []
+        self.col_labels = []
+        self.successor = None
+        self.canvas.delete("all")
+        self.cell_items.clear()
+        self.row_header_items.clear()
+        self.col_header_items.clear()
+        self.y_scrollbar.set(0.0, 1.0)
+        self.x_scrollbar.set(0.0, 1.0)
+
+    def set_highlight(self, successor):
+        """Zvýrazní v každém řádku i buňku ve sloupci successor[i] (None nebo -1 = bez zvýraznění)"""
+        self.successor = None if successor is None else np.asarray(successor, dtype=np.int64)
+        self.redraw()
+
+    @property
+    def num_rows(self):
+        return len(self.row_labels)
+
+    @property
+    def num_cols(self):
+        return len(self.col_labels)
+
+    def visible_counts(self):
+        """Počet řádků a sloupců, které se vejdou do okna (včetně částečně viditelných)"""
+        width = max(self.canvas.winfo_width() - self.header_width, 0)
+        height = max(self.canvas.winfo_height() - self.cell_height, 0)
+        return -(-height // self.cell_height), -(-width // self.cell_width)
+
+    def visible_range(self):
+        """Vrátí (první řádek, konec řádků, první sloupec, konec sloupců) výřezu"""
+        rows, cols = self.visible_counts()
+        return (self.top_row, min(self.top_row + rows, self.num_rows),
+                self.left_col, min(self.left_col + cols, self.num_cols))
+
+    def cell_at(self, x, y):
+        """Vrátí (řádek, sloupec) buňky na souřadnicích plátna, None mimo buňky"""
+        if x < self.header_width or y < self.cell_height:
+            return None
+        row = self.top_row + int((y - self.cell_height) // self.cell_height)
+        col = self.left_col + int((x - self.header_width) // self.cell_width)
+        if row >= self.num_rows or col >= self.num_cols:
+            return None
+        return row, col
+
+    def cell_bbox(self, row, col):
+        """Obdélník buňky na plátně (x0, y0, x1, y1), None pokud není ve výřezu"""
+        r0, r1, c0, c1 = self.visible_range()
+        if not (r0 <= row < r1 and c0 <= col < c1):
+            return None
+        x0 = self.header_width + (col - c0) * self.cell_width
+        y0 = self.cell_height + (row - r0) * self.cell_height
+        return x0, y0, x0 + self.cell_width, y0 + self.cell_height
+
+    def read_block(self, r0, r1, c0, c1):
+        """Načte hodnoty výřezu z pole"""
+        return np.asarray(self.values[r0:r1, c0:c1])
+
+    def cell_background(self, row, col, highlighted):
+        if highlighted:
+            return HIGHLIGHT_BACKGROUND
+        return DIAGONAL_BACKGROUND if row == col else BACKGROUND
+
+    def item_pair(self, pool, key, fill, anchor="center"):
+        """Vrátí (obdélník, text) pro pozici výřezu, chybějící vytvoří"""
+        if key not in pool:
+            pool[key] = (self.canvas.create_rectangle(0, 0, 0, 0, fill=fill, outline=GRID_COLOR),
+                         self.canvas.create_text(0, 0, anchor=anchor))
+        return pool[key]
+
+    def hide_unused(self, pool, used):
+        for key, items in pool.items():
+            if key not in used:
+                for item in items:
+                    self.canvas.itemconfigure(item, state="hidden")
+
+    def redraw(self):
+        """Překreslí viditelný výřez a nastaví posuvníky"""
+        if self.values is None:
+            return
+        rows, cols = self.visible_counts()
+        self.top_row = max(0, min(self.top_row, self.num_rows - max(rows - 1, 1)))
+        self.left_col = max(0, min(self.left_col, self.num_cols - max(cols - 1, 1)))
+        r0, r1, c0, c1 = self.visible_range()
+        block = self.read_block(r0, r1, c0, c1)
+        highlight_cols = None
+        if self.successor is not None:
+            highlight_cols = self.successor[r0:r1]
+
+        cw, ch, hw = self.cell_width, self.cell_height, self.header_width
+        used = set()
+        for i, row in enumerate(range(r0, r1)):
+            y0 = ch + i * ch
+            for j, col in enumerate(range(c0, c1)):
+                x0 = hw + j * cw
+                highlighted = highlight_cols is not None and highlight_cols[i] == col
+                rect, text = self.item_pair(self.cell_items, (i, j), BACKGROUND)
+                self.canvas.coords(rect, x0, y0, x0 + cw, y0 + ch)
+                self.canvas.itemconfigure(rect, state="normal", fill=self.cell_background(row, col, highlighted))
+                self.canvas.coords(text, x0 + cw / 2, y0 + ch / 2)
+                self.canvas.itemconfigure(text, state="normal", text=format_value(block[i, j]),
+                                          font=("TkDefaultFont", 9, "bold") if highlighted else ("TkDefaultFont", 9))
+                used.add((i, j))
+        self.hide_unused(self.cell_items, used)
+
+        # záhlaví se kreslí až po buňkách, aby zůstala nahoře
+        used = set()
+        for i, row in enumerate(range(r0, r1)):
+            rect, text = self.item_pair(self.row_header_items, i, HEADER_BACKGROUND, anchor="w")
+            y0 = ch + i * ch
+            self.canvas.coords(rect, 0, y0, hw, y0 + ch)
+            self.canvas.coords(text, 6, y0 + ch / 2)
+            self.canvas.itemconfigure(rect, state="normal")
+            self.canvas.itemconfigure(text, state="normal", text=self.row_labels[row])
+            self.canvas.tag_raise(rect)
+            self.canvas.tag_raise(text)
+            used.add(i)
+        self.hide_unused(self.row_header_items, used)
+
+        used = set()
+        for j, col in enumerate(range(c0, c1)):
+            rect, text = self.item_pair(self.col_header_items, j, HEADER_BACKGROUND)
+            x0 = hw + j * cw
+            self.canvas.coords(rect, x0, 0, x0 + cw, ch)
+            self.canvas.coords(text, x0 + cw / 2, ch / 2)
+            self.canvas.itemconfigure(rect, state="normal")
+            self.canvas.itemconfigure(text, state="normal", text=self.col_labels[col])
+            self.canvas.tag_raise(rect)
+            self.canvas.tag_raise(text)
+            used.add(j)
+        self.hide_unused(self.col_header_items, used)
+
+        corner = self.item_pair(self.col_header_items, "corner", HEADER_BACKGROUND)
+        self.canvas.coords(corner[0], 0, 0, hw, ch)
+        self.canvas.coords(corner[1], hw / 2, ch / 2)
+        self.canvas.itemconfigure(corner[1], text="Index")
+        for item in corner:
+            self.canvas.tag_raise(item)
+
+        self.y_scrollbar.set(*self.fractions(r0, r1, self.num_rows))
+        self.x_scrollbar.set(*self.fractions(c0, c1, self.num_cols))
+
+    @staticmethod
+    def fractions(first, last, total):
+        if total == 0:
+            return 0.0, 1.0
+        return first / total, last / total
+
+    def scroll_rows(self, amount):
+        self.top_row += amount
+        self.redraw()
+
+    def scroll_cols(self, amount):
+        self.left_col += amount
+        self.redraw()
+
+    def view_command(self, args, first, visible, total):
+        """Zpracuje příkaz posuvníku (moveto/scroll) a vrátí nový první řádek či sloupec"""
+        if args[0] == "moveto":
+            return int(float(args[1]) * total)
+        amount = int(args[1])
+        step = max(visible - 1, 1) if args[2] == "pages" else 1
+        return first + amount * step
+
+    def yview(self, *args):
+        self.top_row = self.view_command(args, self.top_row, self.visible_counts()[0], self.num_rows)
+        self.redraw()
+
+    def xview(self, *args):
+        self.left_col = self.view_command(args, self.left_col, self.visible_counts()[1], self.num_cols)
+        self.redraw()
+
+    def on_mouse_wheel(self, event, horizontal=False):
+        # Windows/macOS posílají násobky 120 (macOS malé hodnoty), Linux používá Button-4/5
+        amount = -3 if event.delta > 0 else 3
+        if horizontal:
+            self.scroll_cols(amount)
+        else:
+            self.scroll_rows(amount)
+
+ACTIVE_COLOR = "#1f6fd1"
+
+class EditableMatrixGrid(MatrixGrid):
+    """MatrixGrid s úpravami - jediné pole Entry se přesune nad aktivní buňku
+
+    Hodnoty se zapisují přímo do pole předaného v set_data (NumPy, NaN = nevyplněno),
+    diagonála se neupravuje. Dvojklik na záhlaví řádku přejmenuje bod.
+    on_change(row, col) se zavolá po každé úpravě (col=None u přejmenování).
+    """
+
+    def __init__(self, parent, on_change=None, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.on_change = on_change
+        self.active = (0, 1)
+        # upravovaná buňka (řádek, sloupec), u popisku (řádek, None)
+        self.editing = None
+
+        self.active_item = self.canvas.create_rectangle(0, 0, 0, 0, outline=ACTIVE_COLOR, width=2, state="hidden")
+        self.editor_var = tk.StringVar()
+        self.editor = ttk.Entry(self.canvas, textvariable=self.editor_var,
+                                validatecommand=(self.register(validate_float_input), "%P"))
+        self.editor_item = self.canvas.create_window(0, 0, window=self.editor, anchor="nw", state="hidden")
+
+        self.canvas.configure(takefocus=True)
+        self.canvas.bind("<Button-1>", self.on_click)
+        self.canvas.bind("<Double-Button-1>", self.on_double_click)
+        self.canvas.bind("<Key>", self.on_key)
+        self.editor.bind("<Return>", lambda e: self.finish_edit(move=(1, 0)))
+        self.editor.bind("<Tab>", lambda e: self.finish_edit(move=(0, 1)) or "break")
+        self.editor.bind("<Escape>", lambda e: self.cancel_edit())
+        self.editor.bind("<FocusOut>", lambda e: self.finish_edit())
+
+    def redraw(self):
+        super().redraw()
+        if self.values is None:
+            return
+        # rámeček aktivní buňky a pole pro úpravu se posouvají s výřezem
+        bbox = self.cell_bbox(*self.active)
+        if bbox is None:
+            self.canvas.itemconfigure(self.active_item, state="hidden")
+        else:
+            self.canvas.coords(self.active_item, *bbox)
+            self.canvas.itemconfigure(self.active_item, state="normal")
+            self.canvas.tag_raise(self.active_item)
+        if self.editing is not None:
+            bbox = self.editing_bbox()
+            if bbox is None:
+                self.canvas.itemconfigure(self.editor_item, state="hidden")
+            else:
+                self.canvas.coords(self.editor_item, bbox[0], bbox[1])
+                self.canvas.itemconfigure(self.editor_item, state="normal",
+                                          width=bbox[2] - bbox[0], height=bbox[3] - bbox[1])
+                self.canvas.tag_raise(self.editor_item)
+
+    def editing_bbox(self):
+        row, col = self.editing
+        if col is not None:
+            return self.cell_bbox(row, col)
+        r0, r1, _, _ = self.visible_range()
+        if not r0 <= row < r1:
+            return None
+        y0 = self.cell_height + (row - r0) * self.cell_height
+        return 0, y0, self.header_width, y0 + self.cell_height
+
+    def row_header_at(self, x, y):
+        """Řádek, na jehož záhlaví ukazují souřadnice, jinak None"""
+        if x >= self.header_width or y < self.cell_height:
+            return None
+        row = self.top_row + int((y - self.cell_height) // self.cell_height)
+        return row if row < self.num_rows else None
+
+    def select(self, row, col):
+        """Nastaví aktivní buňku a posune výřez tak, aby byla vidět"""
+        row = max(0, min(row, self.num_rows - 1))
+        col = max(0, min(col, self.num_cols - 1))
+        self.active = (row, col)
+        rows, cols = self.visible_counts()
+        if row < self.top_row:
+            self.top_row = row
+        elif row >= self.top_row + rows - 1:
+            self.top_row = row - max(rows - 2, 0)
+        if col < self.left_col:
+            self.left_col = col
+        elif col >= self.left_col + cols - 1:
+            self.left_col = col - max(cols - 2, 0)
+        self.redraw()
+
+    def on_click(self, event):
+        self.canvas.focus_set()
+        cell = self.cell_at(event.x, event.y)
+        if cell is not None:
+            self.select(*cell)
+
+    def on_double_click(self, event):
+        row = self.row_header_at(event.x, event.y)
+        if row is not None:
+            self.begin_edit(row, None)
+            return
+        cell = self.cell_at(event.x, event.y)
+        if cell is not None:
+            self.begin_edit(*cell)
+
+    def on_key(self, event):
+        if self.values is None or self.editing is not None:
+            return None
+        row, col = self.active
+        moves = {"Up": (-1, 0), "Down": (1, 0), "Left": (0, -1), "Right": (0, 1), "Tab": (0, 1),
+                 "Return": (1, 0), "Prior": (-self.visible_counts()[0], 0), "Next": (self.visible_counts()[0], 0)}
+        if event.keysym in moves:
+            d_row, d_col = moves[event.keysym]
+            self.select(row + d_row, col + d_col)
+            return "break"
+        if event.keysym in ("Delete", "BackSpace"):
+            self.set_value(row, col, np.nan)
+            return "break"
+        if event.keysym == "F2":
+            self.begin_edit(row, col)
+            return "break"
+        # psaní čísla rovnou začne úpravu buňky
+        if event.char and (event.char.isdigit() or event.char in ".,-"):
+            self.begin_edit(row, col, initial=event.char.replace(",", "."))
+            return "break"
+        return None
+
+    def begin_edit(self, row, col, initial=None):
+        """Otevře pole pro úpravu buňky (col=None upraví popisek řádku)"""
+        if col is not None and row == col:
+            return  # diagonála je vždy 0
+        self.finish_edit()
+        if col is None:
+            text = self.row_labels[row]
+            self.editor.configure(validate="none")
+        else:
+            self.active = (row, col)
+            value = self.values[row, col]
+            text = "" if value != value else format_value(value)
+            self.editor.configure(validate="key")
+        self.editing = (row, col)
+        self.editor_var.set(text if initial is None else initial)
+        self.redraw()
+        self.editor.focus_set()
+        self.editor.icursor(tk.END)
+        if initial is None:
+            self.editor.selection_range(0, tk.END)
+
+    def finish_edit(self, move=None):
+        """Zapíše upravenou hodnotu do pole a případně posune aktivní buňku"""
+        if self.editing is None:
+            return
+        row, col = self.editing
+        text = self.editor_var.get().strip()
+        value = np.nan
+        if col is not None and text:
+            try:
+                value = float(text)
+            except ValueError:
+                # neúplné číslo ("-", ".") - po Enter/Tab zůstane pole otevřené k opravě,
+                # při opuštění pole se ponechá původní hodnota
+                self.editor.bell()
+                if move is not None:
+                    return
+                self.cancel_edit()
+                return
+        self.editing = None
+        self.canvas.itemconfigure(self.editor_item, state="hidden")
+        if col is None:
+            if text:
+                self.row_labels[row] = text
+                self.col_labels[row] = text
+                if self.on_change:
+                    self.on_change(row, None)
+        else:
+            self.set_value(row, col, value)
+        self.canvas.focus_set()
+        if move is not None:
+            self.select(self.active[0] + move[0], self.active[1] + move[1])
+        else:
+            self.redraw()
+
+    def cancel_edit(self):
+        self.editing = None
+        self.canvas.itemconfigure(self.editor_item, state="hidden")
+        self.canvas.focus_set()
+        self.redraw()
+
+    def set_value(self, row, col, value):
+        """Zapíše jednu hodnotu mimo diagonálu"""
+        if row == col:
+            return
+        self.values[row, col] = value
+        self.redraw()
+        if self.on_change:
+            self.on_change(row, col)
@@ -1,5 +1,14 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
+import threading
+import numpy as np
+import pandas as pd
+from core.models import DistanceMatrix
+from core.symmetry import analyze_symmetry, symmetrize
+from gui.matrix_grid import MatrixGrid
+
+# Tolerance pro float při kontrole symetrie z GUI
+SYMMETRY_CHECK_TOLERANCE = 0.001
 
 class MatrixView:
     def __init__(self, parent, notebook):
@@ -11,6 +20,7 @@ class MatrixView:
         self.matrix = None
         self.solution = None
         self.highlight_var = tk.BooleanVar(value=True)
+        self.analysis_running = False
         
         self.create_ui()
     
@@ -36,9 +46,9 @@ class MatrixView:
         # Přidání přepínače pro zobrazení zvýraznění v matici
         ttk.Checkbutton(control_frame, text="Zvýraznit vybrané hrany", 
                        variable=self.highlight_var,
-                       command=lambda: self.display_matrix() if self.matrix is not None else None).pack(side=tk.RIGHT)
+                       command=self.toggle_highlight).pack(side=tk.RIGHT)
         
-        # Frame pro Treeview (tabulku) s fixed layout
+        # Frame pro tabulku s fixed layout
         self.matrix_container = ttk.Frame(self.matrix_tab)
         self.matrix_container.pack(fill=tk.BOTH, expand=True)
         
@@ -46,25 +56,9 @@ class MatrixView:
         paned = ttk.PanedWindow(self.matrix_container, orient=tk.VERTICAL)
         paned.pack(fill=tk.BOTH, expand=True)
         
-        # Frame pro tabulku
-        tree_frame = ttk.Frame(paned)
-        paned.add(tree_frame, weight=4)
-        
-        # Vytvoření Treeview pro zobrazení matice s lepším nastavením sloupců
-        self.matrix_tree = ttk.Treeview(tree_frame)
-        
-        # Přidání scrollbarů
-        y_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.matrix_tree.yview)
-        y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        x_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=self.matrix_tree.xview)
-        x_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
-        
-        self.matrix_tree.configure(yscrollcommand=y_scrollbar.set, xscrollcommand=x_scrollbar.set)
-        self.matrix_tree.pack(fill=tk.BOTH, expand=True)
-        
-        # Nastavení fixní šířky pro sloupec indexů
-        self.matrix_tree.column("#0", width=120, stretch=False)
+        # Virtualizovaná tabulka - vykresluje jen viditelné buňky, zvládne i tisíce uzlů
+        self.matrix_grid = MatrixGrid(paned)
+        paned.add(self.matrix_grid, weight=4)
         
         # Frame pro legendu
         legend_frame = ttk.LabelFrame(paned, text="Legenda", padding=10)
@@ -74,6 +68,11 @@ class MatrixView:
         ttk.Label(legend_frame, text="• Hodnoty na diagonále by měly být výrazně vyšší než ostatní (nebo 0)").pack(anchor="w")
         ttk.Label(legend_frame, text="• Řešení zahrnuje návrat do výchozího bodu").pack(anchor="w")
     
+    def toggle_highlight(self):
+        """Zapne/vypne zvýraznění hran řešení bez nového načtení matice"""
+        if self.matrix is not None:
+            self.matrix_grid.set_highlight(self.solution_successors() if self.highlight_var.get() else None)
+    
     def set_matrix(self, matrix):
         """Nastaví matici a zobrazí ji"""
         self.matrix = matrix
@@ -86,44 +85,30 @@ class MatrixView:
             self.display_matrix()
     
     def display_matrix(self):
-        """Zobrazí matici v Treeview"""
+        """Zobrazí matici ve virtualizované tabulce"""
         if self.matrix is None:
+            self.matrix_grid.clear()
             return
-            
-        # Vyčištění Treeview
-        for item in self.matrix_tree.get_children():
-            self.matrix_tree.delete(item)
-        
-        # Resetování sloupců
-        self.matrix_tree["columns"] = list(self.matrix.columns)
-        
-        # Konfigurace hlavičky
-        self.matrix_tree.heading("#0", text="Index")
-        self.matrix_tree.column("#0", width=120, stretch=False)  # Fixní šířka pro indexy
-        
-        # Nastavení sloupců s optimalizovanými šířkami
-        for col in self.matrix.columns:
-            self.matrix_tree.heading(col, text=str(col))
-            # Výpočet optimální šířky na základě délky obsahu
-            max_width = max(len(str(col)) * 8, 50)  # Minimálně 50px
-            self.matrix_tree.column(col, width=min(max_width, 100), stretch=True, anchor="center")
-        
-        # Přidání dat
-        for idx, row in self.matrix.iterrows():
-            values = [row[col] for col in self.matrix.columns]
-            item_id = self.matrix_tree.insert("", "end", text=str(idx), values=values)
-            
-            # Zvýraznění buněk, které jsou v řešení (pokud existuje řešení)
-            if self.solution and self.highlight_var.get():
-                for edge in self.solution:
-                    if edge[0] == idx:
-                        col_idx = self.matrix.columns.get_loc(edge[1])
-                        # Pouze celých řádků, což zde není ideální
-                        self.matrix_tree.item(item_id, tags=("highlight",))
-                        break
-        
-        # Přidání tagu pro zvýraznění
-        self.matrix_tree.tag_configure("highlight", background='#e6f2ff')
+        
+        # matice na disku / ze souřadnic se čte po viditelných blocích, DataFrame jako pole
+        if isinstance(self.matrix, DistanceMatrix):
+            values = self.matrix.costs
+        else:
+            values = self.matrix.to_numpy()
+        self.matrix_grid.set_data(values, list(self.matrix.index), list(self.matrix.columns))
+        self.matrix_grid.set_highlight(self.solution_successors() if self.highlight_var.get() else None)
+    
+    def solution_successors(self):
+        """Pro každý řádek matice sloupec vybrané hrany řešení (-1 = žádná)"""
+        if not self.solution:
+            return None
+        successor = np.full(len(self.matrix), -1, dtype=np.int64)
+        sources, targets = zip(*self.solution)
+        rows = self.matrix.index.get_indexer(list(sources))
+        cols = self.matrix.columns.get_indexer(list(targets))
+        valid = (rows >= 0) & (cols >= 0)
+        successor[rows[valid]] = cols[valid]
+        return successor
     
     def save_matrix_to_excel(self):
         """Uloží aktuální matici do Excel souboru"""
@@ -142,8 +127,9 @@ class MatrixView:
             return
         
         try:
-            # Uložit matici do Excelu
-            self.matrix.to_excel(file_path)
+            # Uložit matici do Excelu (matici na disku nejprve načteme jako DataFrame)
+            matrix = self.matrix.to_frame() if isinstance(self.matrix, DistanceMatrix) else self.matrix
+            matrix.to_excel(file_path)
             self.parent.log(f"Matice uložena do souboru: {file_path}")
             messagebox.showinfo("Uloženo", f"Matice byla úspěšně uložena do:\n{file_path}")
             
@@ -152,58 +138,99 @@ class MatrixView:
         except Exception as e:
             messagebox.showerror("Chyba při ukládání", f"Nastala chyba:\n{str(e)}")
 
+    def matrix_values(self):
+        """Hodnoty matice pro výpočty - matice na disku se čte po blocích, DataFrame jako pole"""
+        if isinstance(self.matrix, DistanceMatrix):
+            return self.matrix.costs
+        return self.matrix.to_numpy()
+
+    def run_in_background(self, task, on_done):
+        """Spustí task v pracovním vlákně a on_done(výsledek, chyba) zavolá zpět v hlavním vlákně Tk"""
+        if self.analysis_running:
+            messagebox.showinfo("Informace", "Operace s maticí již probíhá. Počkejte prosím na dokončení.")
+            return
+        self.analysis_running = True
+        self.parent.status_var.set("Zpracování matice...")
+
+        def worker():
+            result, error = None, None
+            try:
+                result = task()
+            except Exception as e:
+                error = e
+            self.parent.after(0, finish, result, error)
+
+        def finish(result, error):
+            self.analysis_running = False
+            self.parent.status_var.set("Připraveno")
+            on_done(result, error)
+
+        thread = threading.Thread(target=worker)
+        thread.daemon = True  # Vlákno se ukončí spolu s hlavním programem
+        thread.start()
+
     def check_matrix_symmetry(self):
-        """Zkontroluje, zda je matice symetrická"""
+        """Zkontroluje, zda je matice symetrická (vektorově v pracovním vlákně)"""
         if self.matrix is None:
             messagebox.showinfo("Informace", "Žádná matice není načtena.")
             return
         
-        # Kontrola symetrie
-        is_symmetric = True
-        asymmetric_points = []
-        
-        for i in range(len(self.matrix)):
-            for j in range(i+1, len(self.matrix)):  # Pouze horní trojúhelníková část
-                if abs(self.matrix.iloc[i, j] - self.matrix.iloc[j, i]) > 0.001:  # Tolerance pro float
-                    is_symmetric = False
-                    asymmetric_points.append((self.matrix.index[i], self.matrix.columns[j]))
-                    
-                    # Omezit počet nalezených bodů
-                    if len(asymmetric_points) >= 5:
-                        break
-            
-            if not is_symmetric and len(asymmetric_points) >= 5:
-                break
+        matrix = self.matrix
+        values = self.matrix_values()
+        self.parent.log("Kontroluji symetrii matice...")
+        self.run_in_background(lambda: analyze_symmetry(values, SYMMETRY_CHECK_TOLERANCE),
+                               lambda report, error: self.show_symmetry_report(matrix, report, error))
+
+    def show_symmetry_report(self, matrix, report, error):
+        """Zobrazí výsledek kontroly symetrie, případně nabídne symetrizaci"""
+        if error is not None:
+            messagebox.showerror("Chyba", f"Nastala chyba při kontrole symetrie:\n{str(error)}")
+            return
         
-        # Zobrazit výsledek
-        if is_symmetric:
+        if report.is_symmetric:
+            self.parent.log("Matice je symetrická.")
             messagebox.showinfo("Kontrola matice", "Matice je symetrická.")
-        else:
-            points_str = ", ".join([f"({a}, {b})" for a, b in asymmetric_points[:5]])
-            if len(asymmetric_points) > 5:
-                points_str += ", ..."
-                
-            if messagebox.askyesno(
-                "Kontrola matice", 
-                f"Matice není symetrická. Nesymetrické body: {points_str}\n\n"
-                "Pro běžný TSP problém by matice měla být symetrická.\n"
-                "Chcete vytvořit symetrickou verzi matice?"):
-                self.create_symmetric_matrix()
+            return
+        
+        share = report.asymmetric_pairs / report.total_pairs * 100
+        i, j = report.max_pair
+        self.parent.log(f"Matice není symetrická: {report.asymmetric_pairs} z {report.total_pairs} dvojic "
+                        f"({share:.1f} %), největší odchylka {report.max_deviation:g} "
+                        f"({matrix.index[i]}, {matrix.columns[j]})")
+        points_str = ", ".join([f"({matrix.index[a]}, {matrix.columns[b]})" for a, b in report.examples])
+        if report.asymmetric_pairs > len(report.examples):
+            points_str += ", ..."
+            
+        if messagebox.askyesno(
+            "Kontrola matice", 
+            f"Matice není symetrická.\n"
+            f"Nesymetrických dvojic: {report.asymmetric_pairs} z {report.total_pairs} ({share:.1f} %)\n"
+            f"Největší odchylka: {report.max_deviation:g} mezi ({matrix.index[i]}, {matrix.columns[j]})\n"
+            f"Nesymetrické body: {points_str}\n\n"
+            "Pro běžný TSP problém by matice měla být symetrická.\n"
+            "Chcete vytvořit symetrickou verzi matice?"):
+            self.create_symmetric_matrix()
 
     def create_symmetric_matrix(self):
-        """Vytvoří symetrickou verzi aktuální matice (průměrováním hodnot)"""
+        """Vytvoří symetrickou verzi aktuální matice (průměrováním hodnot) v pracovním vlákně"""
         if self.matrix is None:
             return
         
-        # Vytvořit kopii matice
-        symmetric_matrix = self.matrix.copy()
+        matrix = self.matrix
+        values = self.matrix_values()
+        self.run_in_background(lambda: symmetrize(values),
+                               lambda result, error: self.apply_symmetric_matrix(matrix, result, error))
+
+    def apply_symmetric_matrix(self, matrix, values, error):
+        """Nahradí matici její symetrickou verzí (v hlavním vlákně)"""
+        if error is not None:
+            messagebox.showerror("Chyba", f"Nastala chyba při symetrizaci matice:\n{str(error)}")
+            return
+        if self.matrix is not matrix:
+            self.parent.log("Matice se během symetrizace změnila, výsledek se nepoužije.")
+            return
         
-        # Pro každou dvojici bodů vzít průměr hodnot
-        for i in range(len(self.matrix)):
-            for j in range(i+1, len(self.matrix)):  # Pouze horní trojúhelníková část
-                avg_value = (self.matrix.iloc[i, j] + self.matrix.iloc[j, i]) / 2
-                symmetric_matrix.iloc[i, j] = avg_value
-                symmetric_matrix.iloc[j, i] = avg_value
+        symmetric_matrix = pd.DataFrame(values, index=matrix.index, columns=matrix.columns)
         
         # Nahradit původní matici
         self.matrix = symmetric_matrix
@@ -216,4 +243,4 @@ class MatrixView:
         messagebox.showinfo("Matice aktualizována", "Byla vytvořena symetrická verze matice.")
         
         # Aktualizovat matici v aplikaci
-        self.parent.matrix = symmetric_matrix
\ No newline at end of file
+        self.parent.matrix = symmetric_matrix
@@ -0,0 +1,67 @@
+import numpy as np
+
+# Prostorový index bodů v rovině pro hledání nejbližšího bodu při kliknutí a najetí myší.
+# Body se rozdělí do pravidelné mřížky s několika body na buňku a seřadí se podle buněk řádek po řádku,
+# takže body jednoho řádku buněk v rozsahu sloupců leží v poli za sebou. Dotaz projde jen řádky buněk
+# v dosahu tolerance, ne všechny body.
+
+# průměrný počet bodů v buňce mřížky
+POINTS_PER_CELL = 2
+
+class PointIndex:
+    """Mřížkový index bodů (n x 2) - nearest(x, y, radius) vrací index nejbližšího bodu nebo None"""
+
+    def __init__(self, points, points_per_cell=POINTS_PER_CELL):
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        num_points = len(self.points)
+        if num_points == 0:
+            self.origin = np.zeros(2)
+            self.cell_size = 1.0
+            self.num_cols = self.num_rows = 0
+            self.order = np.empty(0, dtype=np.int64)
+            self.starts = np.zeros(1, dtype=np.int64)
+            return
+
+        self.origin = self.points.min(axis=0)
+        extent = self.points.max(axis=0) - self.origin
+        span = float(extent.max()) or 1.0
+        self.cell_size = span / max(1.0, np.sqrt(num_points / points_per_cell))
+        self.num_cols, self.num_rows = (np.floor(extent / self.cell_size).astype(np.int64) + 1).tolist()
+
+        cols, rows = self.cells(self.points).T
+        cell_ids = rows * self.num_cols + cols
+        self.order = np.argsort(cell_ids, kind="stable")
+        # body buňky k leží v order[starts[k]:starts[k + 1]]
+        self.starts = np.searchsorted(cell_ids[self.order], np.arange(self.num_cols * self.num_rows + 1))
+
+    def __len__(self):
+        return len(self.points)
+
+    def cells(self, points):
+        """Sloupec a řádek buňky mřížky pro každý bod (oříznuté do mřížky)"""
+        cells = np.floor((points - self.origin) / self.cell_size).astype(np.int64)
+        return np.clip(cells, 0, [max(self.num_cols - 1, 0), max(self.num_rows - 1, 0)])
+
+    def candidates(self, x, y, radius):
+        """Indexy bodů v buňkách, které zasahují do čtverce o poloměru radius kolem (x, y)"""
+        if not len(self.points):
+            return self.order
+        col0, row0 = np.floor((np.array([x, y]) - radius - self.origin) / self.cell_size).astype(np.int64)
+        col1, row1 = np.floor((np.array([x, y]) + radius - self.origin) / self.cell_size).astype(np.int64)
+        col0, row0 = max(col0, 0), max(row0, 0)
+        col1, row1 = min(col1, self.num_cols - 1), min(row1, self.num_rows - 1)
+        if col0 > col1 or row0 > row1:
+            return self.order[:0]
+        rows = np.arange(row0, row1 + 1) * self.num_cols
+        return np.concatenate([self.order[self.starts[row + col0]:self.starts[row + col1 + 1]]
+                               for row in rows.tolist()])
+
+    def nearest(self, x, y, radius):
+        """Index nejbližšího bodu ve vzdálenosti nejvýše radius od (x, y), jinak None"""
+        candidates = self.candidates(x, y, radius)
+        if not len(candidates):
+            return None
+        offsets = self.points[candidates] - (x, y)
+        distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        k = int(np.argmin(distances))
+        return int(candidates[k]) if distances[k] <= radius else None
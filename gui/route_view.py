@@ -1,11 +1,91 @@
 import tkinter as tk
 from tkinter import ttk
+from dataclasses import dataclass, field
+from typing import Callable
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-from matplotlib.patches import FancyArrowPatch
+from matplotlib.collections import LineCollection
+from core.models import CoordinateMatrix
+from gui.point_index import PointIndex
 from gui.utils import get_color_for_index, lighten_color
 
+# Každý styl se kreslí do vlastních os hromadnými objekty (jeden scatter pro body, LineCollection
+# pro hrany, quiver pro šipky směru). Osy zůstávají mezi přepnutími stylu v paměti, zahodí se až
+# s novou trasou. Popisky se vytvářejí jen pro body ve výřezu, a to až po dostatečném přiblížení.
+# Polohy bodů se pro každý styl spočtou jednou za trasu (RouteLayout) a s mřížkovým indexem slouží
+# i kliknutí a nápovědě při najetí myší, takže hledání bodu nezávisí na počtu bodů.
+
+# nejvýše tolik bodů ve výřezu dostane popisky (víc by nebylo čitelné)
+MAX_LABELED_NODES = 40
+
+# do této velikosti trasy jsou značky bodů velké a pořadí se píše dovnitř
+LARGE_MARKER_NODES = 30
+
+# počet bodů lomené čáry, kterou se aproximuje zakřivená hrana
+ARC_POINTS = 12
+
+# umístění os stylu v obrázku (vlevo, dole, šířka, výška); s legendou se osy zúží
+STYLE_AXES_RECT = [0.03, 0.03, 0.94, 0.9]
+LEGEND_AXES_RECT = [0.03, 0.03, 0.72, 0.9]
+
+# do jaké vzdálenosti v pixelech od bodu se kliknutí nebo najetí myší počítá jako zásah
+HIT_TOLERANCE_PX = 15
+
+def marker_size(base, num_nodes):
+    """Velikost značky bodu - u větších tras menší, aby se body nepřekrývaly"""
+    if num_nodes <= LARGE_MARKER_NODES:
+        return base
+    return base / 7.5 if num_nodes <= 500 else 4
+
+def edge_segments(start, end, rad=0.0):
+    """Hrany jako pole lomených čar (m x k x 2) pro LineCollection
+
+    Pro rad != 0 se hrana prohne jako connectionstyle "arc3" (kvadratická Bézierova křivka).
+    """
+    if not rad:
+        return np.stack([start, end], axis=1)
+    delta = end - start
+    control = (start + end) / 2 + rad * np.column_stack([delta[:, 1], -delta[:, 0]])
+    t = np.linspace(0.0, 1.0, ARC_POINTS)[None, :, None]
+    return (1 - t) ** 2 * start[:, None] + 2 * (1 - t) * t * control[:, None] + t ** 2 * end[:, None]
+
+def add_direction_arrows(ax, segments, color, zorder, at=0.7):
+    """Šipky směru na hranách (v poměru at délky) - jeden quiver místo samostatné šipky pro každou hranu
+
+    Šipka je za středem hrany, aby ji nezakrýval popisek s pořadím hrany.
+    """
+    step = at * (segments.shape[1] - 1)
+    k = int(step)
+    before, after = segments[:, k], segments[:, k + 1]
+    middle = before + (step - k) * (after - before)
+    direction = after - before
+    length = np.hypot(direction[:, 0], direction[:, 1])
+    direction = direction / np.where(length > 0, length, 1.0)[:, None]
+    return ax.quiver(middle[:, 0], middle[:, 1], direction[:, 0], direction[:, 1], color=color,
+                     angles='xy', scale_units='inches', scale=8, pivot='mid', units='inches',
+                     width=0.02, headwidth=4, headlength=5, headaxislength=4.5, zorder=zorder)
+
+@dataclass
+class RouteLayout:
+    """Rozmístění bodů trasy v jednom stylu - počítá se jednou za trasu"""
+    positions: np.ndarray  # polohy bodů v pořadí trasy (n x 2)
+    index: PointIndex  # prostorový index poloh pro hledání bodu pod myší
+
+    @classmethod
+    def from_positions(cls, positions):
+        return cls(positions, PointIndex(positions))
+
+@dataclass
+class StyleView:
+    """Vykreslený styl trasy - vlastní osy s hotovými objekty, při přepnutí stylu se jen zobrazí"""
+    ax: object
+    layout: RouteLayout
+    make_labels: Callable  # vytvoří popisky bodu a hrany z něj pro danou pozici v trase
+    highlight: object = None  # značka vybraného bodu, kreslí se blittingem
+    tooltip: object = None  # nápověda k bodu pod myší, kreslí se blittingem
+    labels: dict = field(default_factory=dict)  # pozice v trase -> již vytvořené popisky
+
 class RouteView:
     def __init__(self, parent, notebook):
         self.parent = parent
@@ -19,6 +99,14 @@ class RouteView:
         self.route_sequence = None
         self.selected_node = None
         self.node_colors = {}
+        self.node_items = []
+        
+        # Rozmístění bodů podle stylu, vykreslené styly (osy s hotovými objekty),
+        # pozadí grafu pro blitting zvýraznění a pozice bodu pod myší v trase
+        self.layouts = {}
+        self.style_views = {}
+        self.background = None
+        self.hover_index = None
         
         self.viz_style = tk.StringVar(value="modern")
         
@@ -46,6 +134,8 @@ class RouteView:
         
         # Připojení událostí pro interakci s grafem
         self.canvas.mpl_connect('button_press_event', self.on_graph_click)
+        self.canvas.mpl_connect('motion_notify_event', self.on_graph_hover)
+        self.canvas.mpl_connect('draw_event', self.on_draw)
         
         # Toolbar pro graf
         self.toolbar = NavigationToolbar2Tk(self.canvas, self.graph_frame)
@@ -85,6 +175,12 @@ class RouteView:
                       variable=self.viz_style, value="schema",
                       command=self.update_visualization).grid(row=2, column=0, sticky="w", padx=5, pady=2)
         
+        # Skutečné polohy - jen pokud byl vstup zadán souřadnicemi bodů
+        self.map_radio = ttk.Radiobutton(control_frame, text="Skutečné polohy",
+                      variable=self.viz_style, value="map", state="disabled",
+                      command=self.update_visualization)
+        self.map_radio.grid(row=3, column=0, sticky="w", padx=5, pady=2)
+        
         # Vytvoření tabulky pro zobrazení seznamu bodů a jejich návazností
         list_frame = ttk.LabelFrame(detail_container, text="Seznam bodů")
         list_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -133,6 +229,9 @@ class RouteView:
     
     def init_empty_graph(self):
         """Inicializuje prázdný graf s instrukcemi"""
+        for view in self.style_views.values():
+            view.ax.set_visible(False)
+        self.ax.set_visible(True)
         self.ax.clear()
         self.ax.text(0.5, 0.5, "Pro vizualizaci spusťte optimalizaci", 
                     ha='center', va='center', fontsize=14, color='gray',
@@ -141,11 +240,31 @@ class RouteView:
         self.ax.set_yticks([])
         self.canvas.draw()
     
-    def set_data(self, matrix, solution, route_sequence):
-        """Nastaví data pro vizualizaci trasy"""
+    def clear_style_views(self):
+        """Zahodí vykreslené styly (po změně trasy se musí nakreslit znovu)"""
+        for view in self.style_views.values():
+            self.fig.delaxes(view.ax)
+        self.style_views = {}
+        self.background = None
+        self.hover_index = None
+    
+    def set_data(self, matrix, solution):
+        """Nastaví data pro vizualizaci trasy (solution je core.models.TSPSolution)"""
         self.matrix = matrix
         self.solution = solution
-        self.route_sequence = route_sequence
+        self.route_sequence = solution.node_sequence
+        self.selected_node = None
+        self.layouts = {}
+        self.clear_style_views()
+        
+        # Vstup se souřadnicemi se zobrazí rovnou na skutečných polohách
+        if isinstance(matrix, CoordinateMatrix):
+            self.map_radio.configure(state="normal")
+            self.viz_style.set("map")
+        else:
+            self.map_radio.configure(state="disabled")
+            if self.viz_style.get() == "map":
+                self.viz_style.set("modern")
         
         # Generovat barvy pro uzly
         self.generate_node_colors()
@@ -191,11 +310,8 @@ class RouteView:
         if not self.solution or self.matrix is None:
             return
             
-        # Výpočet celkové vzdálenosti
-        total_distance = sum(self.matrix.loc[node[0], node[1]] for node in self.solution)
-        
         # Aktualizovat statistiky
-        self.route_stats.config(text=f"Celková vzdálenost: {total_distance}")
+        self.route_stats.config(text=f"Celková vzdálenost: {self.solution.total_distance:g}")
         self.node_count.config(text=f"Počet bodů: {len(set(self.route_sequence))}")
     
     def populate_node_list(self):
@@ -207,14 +323,15 @@ class RouteView:
         for item in self.node_tree.get_children():
             self.node_tree.delete(item)
         
-        # Pro každý uzel v sekvenci přidat řádek do seznamu
+        # Pro každý uzel v sekvenci přidat řádek do seznamu (id řádků v pořadí trasy pro výběr z grafu)
+        self.node_items = []
         for i, node in enumerate(self.route_sequence):
             next_node = self.route_sequence[(i + 1) % len(self.route_sequence)]
-            distance = self.matrix.loc[node, next_node]
+            distance = f"{self.solution.leg_costs[i]:g}"
             
             # Přidat řádek do seznamu
-            self.node_tree.insert("", "end", text=node, values=(i+1, next_node, distance),
-                                 tags=(f"color_{i % 10}",))
+            self.node_items.append(self.node_tree.insert("", "end", text=node, values=(i+1, next_node, distance),
+                                                         tags=(f"color_{i % 10}",)))
         
         # Nastavit barvy řádků
         for i in range(10):
@@ -222,7 +339,7 @@ class RouteView:
             self.node_tree.tag_configure(f"color_{i}", background=lighten_color(color))
     
     def update_visualization(self):
-        """Aktualizuje vizualizaci trasy podle zvoleného stylu"""
+        """Zobrazí trasu ve zvoleném stylu - styl se kreslí jen poprvé, pak se jeho osy jen zviditelní"""
         if not self.solution:
             self.init_empty_graph()
             return
@@ -230,367 +347,398 @@ class RouteView:
         # Získat zvolený styl vizualizace
         viz_style = self.viz_style.get()
         
-        if viz_style == "modern":
-            self.visualize_modern_style()
-        elif viz_style == "classic":
-            self.visualize_classic_style()
-        elif viz_style == "schema":
-            self.visualize_schema_style()
+        view = self.style_views.get(viz_style)
+        if view is None:
+            view = self.create_style_view(viz_style)
+            if view is None:
+                self.init_empty_graph()
+                return
+        
+        self.ax.set_visible(False)
+        for other in self.style_views.values():
+            other.ax.set_visible(other is view)
+        self.set_highlight(view)
+        self.hover_index = None
+        view.tooltip.set_visible(False)
+        
+        # pozadí pro blitting se uloží až po překreslení nového stylu
+        self.background = None
+        self.canvas.draw_idle()
     
-    def visualize_modern_style(self):
-        """Moderní styl vizualizace s barevným odlišením a dynamickým rozmístěním"""
-        self.ax.clear()
-        
-        if not self.route_sequence:
-            self.init_empty_graph()
-            return
+    def create_style_view(self, viz_style):
+        """Nakreslí styl do nových os a uloží je pro další přepnutí (None, pokud styl nejde použít)"""
+        layout = self.layout(viz_style)
+        if layout is None:
+            return None
+        positions = layout.positions
+        
+        draw_style = {
+            "modern": self.draw_modern_style,
+            "classic": self.draw_classic_style,
+            "schema": self.draw_schema_style,
+            "map": self.draw_map_style,
+        }[viz_style]
+        ax = self.fig.add_axes(STYLE_AXES_RECT, label=viz_style)
+        view = StyleView(ax, layout, draw_style(ax, positions))
+        
+        # zvýraznění vybraného bodu se nekreslí s grafem (animated), ale blittingem přes uložené pozadí
+        size = marker_size(300, len(positions)) * 2
+        view.highlight = ax.scatter([], [], s=size, facecolors='none', edgecolors='#f1c40f',
+                                    linewidths=3, zorder=6, animated=True)
+        view.tooltip = ax.annotate("", (0, 0), xytext=(12, 12), textcoords='offset points', fontsize=9,
+                                   bbox=dict(boxstyle="round,pad=0.3", fc="#ffffe0", ec="gray", alpha=0.95),
+                                   zorder=7, animated=True, visible=False)
+        
+        # popisky podle výřezu - po přiblížení/posunu nástrojovou lištou se doplní
+        ax.callbacks.connect('xlim_changed', lambda ax: self.update_labels(view))
+        ax.callbacks.connect('ylim_changed', lambda ax: self.update_labels(view))
+        self.update_labels(view)
+        
+        self.style_views[viz_style] = view
+        return view
+    
+    def layout(self, viz_style):
+        """Rozmístění bodů pro daný styl (RouteLayout) - spočte se jen poprvé, None pokud styl nelze použít"""
+        if viz_style not in self.layouts:
+            positions = self.layout_positions(viz_style)
+            self.layouts[viz_style] = None if positions is None else RouteLayout.from_positions(positions)
+        return self.layouts[viz_style]
+    
+    def layout_positions(self, viz_style):
+        """Polohy bodů v pořadí trasy pro daný styl (n x 2), None pokud styl nelze použít"""
+        num_nodes = len(self.route_sequence)
+        order = np.arange(num_nodes)
         
-        # Generovat pozice bodů v kruhu
-        positions = {}
-        num_nodes = len(set(self.route_sequence))
+        if viz_style == "modern":
+            # Body v kruhu podle pořadí v trase, začátek nahoře
+            angle = -np.pi / 2 + order * 2 * np.pi / num_nodes
+            return 0.8 * np.column_stack([np.cos(angle), np.sin(angle)])
         
-        # Upravit layout podle počtu bodů
-        radius = 0.8
-        angle_start = -np.pi / 2  # Začít nahoře
+        if viz_style == "classic":
+            # Mřížka podle pořadí bodů v matici, normalizovaná do rozsahu [-1, 1]
+            grid_size = int(np.ceil(np.sqrt(num_nodes)))
+            step = 2.0 / (grid_size - 1 or 1)
+            row, col = np.divmod(self.solution.tour.astype(np.int64), grid_size)
+            return np.column_stack([col * step - 1.0, 1.0 - row * step])
+        
+        if viz_style == "schema":
+            # Body v řadě s mírným vychýlením pro lepší čitelnost
+            return np.column_stack([np.linspace(-0.9, 0.9, num_nodes), np.where(order % 2 == 1, 0.1, -0.1)])
+        
+        if viz_style == "map":
+            coords = self.node_coordinates()
+            return None if coords is None else coords[self.solution.tour]
+        return None
+    
+    def node_coordinates(self):
+        """Vrátí skutečné polohy bodů (n x 2, pořadí matice) přepočtené do rozsahu [-1, 1] (None bez souřadnic)"""
+        if not isinstance(self.matrix, CoordinateMatrix):
+            return None
+        coords = self.matrix.coordinates
+        if self.matrix.metric == "haversine":
+            # (šířka, délka) -> (x, y), délka zkrácená podle průměrné zeměpisné šířky
+            x = coords[:, 1] * np.cos(np.radians(coords[:, 0].mean()))
+            y = coords[:, 0]
+        else:
+            x, y = coords[:, 0], coords[:, 1]
+        # stejné měřítko v obou osách, aby se nezkreslily vzdálenosti
+        span = max(np.ptp(x), np.ptp(y)) or 1.0
+        x = (x - (x.min() + x.max()) / 2) * 2 / span
+        y = (y - (y.min() + y.max()) / 2) * 2 / span
+        return np.column_stack([x, y])
+    
+    def route_colors(self):
+        """Barvy bodů (a hran z nich vycházejících) v pořadí trasy"""
+        return [self.node_colors.get(node, '#3498db') for node in self.route_sequence]
+    
+    def node_label(self, index):
+        """Název bodu - u malých značek i s pořadím, které se do značky nevejde"""
+        node = self.route_sequence[index]
+        if len(self.route_sequence) <= LARGE_MARKER_NODES:
+            return str(node)
+        return f"{index + 1}. {node}"
+    
+    def order_texts(self, ax, x, y, index, **kwargs):
+        """Číslo pořadí uvnitř značky bodu - jen pokud jsou značky dost velké"""
+        if len(self.route_sequence) > LARGE_MARKER_NODES:
+            return []
+        return [ax.text(x, y, str(index + 1), ha='center', va='center', **kwargs)]
+    
+    def draw_nodes(self, ax, positions, sizes, colors, **kwargs):
+        """Všechny body jedním scatterem, startovní bod se kreslí jako poslední (navrch)"""
+        order = np.r_[1:len(positions), 0]
+        return ax.scatter(positions[order, 0], positions[order, 1], s=np.asarray(sizes)[order],
+                          c=[colors[i] for i in order.tolist()], **kwargs)
+    
+    def update_labels(self, view):
+        """Zobrazí popisky jen pro body ve výřezu, pokud jich tam je nejvýše MAX_LABELED_NODES"""
+        x0, x1 = sorted(view.ax.get_xlim())
+        y0, y1 = sorted(view.ax.get_ylim())
+        x, y = view.layout.positions[:, 0], view.layout.positions[:, 1]
+        inside = np.flatnonzero((x >= x0) & (x <= x1) & (y >= y0) & (y <= y1))
+        shown = set(inside.tolist()) if len(inside) <= MAX_LABELED_NODES else set()
+        
+        for index in shown - view.labels.keys():
+            view.labels[index] = view.make_labels(index)
+            # po přiblížení nesmí popisky přetékat přes okraj os
+            for text in view.labels[index]:
+                text.set_clip_on(True)
+        for index, texts in view.labels.items():
+            for text in texts:
+                text.set_visible(index in shown)
+    
+    def draw_map_style(self, ax, positions):
+        """Trasa vykreslená na skutečných polohách bodů (vstup se souřadnicemi)"""
+        num_nodes = len(positions)
+        
+        # Trasa jako jedna kolekce úseček
+        segments = edge_segments(positions, np.roll(positions, -1, axis=0))
+        ax.add_collection(LineCollection(segments, colors='#3498db', linewidths=1.5, alpha=0.8, zorder=1))
+        
+        # Body - velikost podle počtu, aby se u velkých instancí nepřekrývaly
+        size = marker_size(300, num_nodes)
+        sizes = np.full(num_nodes, size)
+        sizes[0] = size * 1.3
+        colors = ['#e74c3c'] + ['#3498db'] * (num_nodes - 1)
+        self.draw_nodes(ax, positions, sizes, colors, edgecolor='white', linewidth=1, zorder=2)
+        
+        def make_labels(i):
+            x, y = positions[i]
+            texts = self.order_texts(ax, x, y, i, color='white', fontsize=9, fontweight='bold', zorder=4)
+            texts.append(ax.text(x, y + 0.07, self.node_label(i), ha='center', va='bottom', fontsize=8,
+                                 bbox=dict(boxstyle="round,pad=0.2", fc="white", ec="gray", alpha=0.7)))
+            return texts
         
-        for i, node in enumerate(self.route_sequence):
-            if node in positions:
-                continue
-                
-            angle = angle_start + (i * 2 * np.pi / num_nodes)
-            positions[node] = (radius * np.cos(angle), radius * np.sin(angle))
-        
-        # Vykreslit hrany jako průhledné šipky s plynulým barevným přechodem
-        for i in range(len(self.route_sequence)):
-            node = self.route_sequence[i]
-            next_node = self.route_sequence[(i + 1) % len(self.route_sequence)]
-            
-            # Souřadnice bodů
-            x1, y1 = positions[node]
-            x2, y2 = positions[next_node]
-            
-            # Barva podle pořadí s plynulým přechodem
-            color = self.node_colors.get(node, '#3498db')
-            next_color = self.node_colors.get(next_node, '#3498db')
-            
-            # Vykreslení plynulé šipky
-            arrow = FancyArrowPatch(
-                (x1, y1),
-                (x2, y2),
-                connectionstyle=f"arc3,rad=0.1",
-                arrowstyle="Simple,head_width=10,head_length=12",
-                color=color,
-                linewidth=2,
-                alpha=0.7,
-                zorder=1
-            )
-            self.ax.add_patch(arrow)
-            
-            # Přidat číslo pořadí hrany
-            mid_x = (x1 + x2) / 2
-            mid_y = (y1 + y2) / 2
-            # Posunout mírně stranou od šipky
+        # Nastavení grafu
+        ax.set_title("Trasa podle skutečných poloh", fontsize=14)
+        ax.axis('equal')
+        ax.axis('off')
+        ax.set_xlim(-1.15, 1.15)
+        ax.set_ylim(-1.15, 1.15)
+        return make_labels
+    
+    def draw_modern_style(self, ax, positions):
+        """Moderní styl vizualizace s barevným odlišením a dynamickým rozmístěním"""
+        num_nodes = len(positions)
+        colors = self.route_colors()
+        ends = np.roll(positions, -1, axis=0)
+        
+        # Hrany jako průhledné oblouky v barvě výchozího bodu, směr ukazují šipky uprostřed
+        segments = edge_segments(positions, ends, rad=0.1)
+        ax.add_collection(LineCollection(segments, colors=colors, linewidths=2, alpha=0.7, zorder=1))
+        add_direction_arrows(ax, segments, colors, zorder=1)
+        
+        # Body, startovní/cílový bod zvýrazněný
+        size = marker_size(300, num_nodes)
+        sizes = np.full(num_nodes, size)
+        sizes[0] = size * 4 / 3
+        node_colors = ['#e74c3c'] + colors[1:]
+        self.draw_nodes(ax, positions, sizes, node_colors, edgecolor='white', linewidth=2, alpha=0.8, zorder=2)
+        
+        def make_labels(i):
+            x1, y1 = positions[i]
+            x2, y2 = ends[i]
+            # Číslo pořadí hrany mírně stranou od šipky, se světlým pozadím
             angle = np.arctan2(y2 - y1, x2 - x1)
-            mid_x += 0.05 * np.sin(angle)
-            mid_y -= 0.05 * np.cos(angle)
-            
-            # Přidat číslo se světlým pozadím
-            self.ax.text(mid_x, mid_y, f"{i+1}", ha='center', va='center',
-                       fontsize=9, fontweight='bold',
-                       bbox=dict(boxstyle="circle", fc="white", ec=color, alpha=0.8))
-        
-        # Vykreslit body s čísly pořadí
-        for i, node in enumerate(self.route_sequence):
-            if node == self.route_sequence[0]:  # Zvýraznit první bod
-                continue  # Bude vykreslen zvlášť
-                
-            x, y = positions[node]
-            
-            # Základní barva bodu
-            color = self.node_colors.get(node, '#3498db')
-            
-            # Vykreslit bod
-            self.ax.scatter(x, y, s=300, color=color, edgecolor='white', 
-                          linewidth=2, alpha=0.8, zorder=2)
-            
-            # Přidat číslo do bodu
-            self.ax.text(x, y, str(self.route_sequence.index(node) + 1), 
-                       ha='center', va='center', color='white', 
-                       fontsize=10, fontweight='bold', zorder=3)
-        
-        # Zvýraznit startovací/cílový bod
-        start_node = self.route_sequence[0]
-        x, y = positions[start_node]
-        self.ax.scatter(x, y, s=400, color='#e74c3c', edgecolor='white',
-                      linewidth=2, alpha=0.8, zorder=2)
-        self.ax.text(x, y, "1", ha='center', va='center', color='white',
-                   fontsize=10, fontweight='bold', zorder=3)
-        
-        # Přidat popisky bodů vedle bodů
-        for node, pos in positions.items():
-            x, y = pos
-            # Vypočítat pozici popisku (mírně posunutou od bodu)
-            label_x = x * 1.15
-            label_y = y * 1.15
-            
-            self.ax.text(label_x, label_y, str(node), ha='center', va='center',
-                       fontsize=9, bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="gray", alpha=0.7))
+            mid_x = (x1 + x2) / 2 + 0.05 * np.sin(angle)
+            mid_y = (y1 + y2) / 2 - 0.05 * np.cos(angle)
+            texts = [ax.text(mid_x, mid_y, f"{i+1}", ha='center', va='center', fontsize=9, fontweight='bold',
+                             bbox=dict(boxstyle="circle", fc="white", ec=colors[i], alpha=0.8))]
+            texts += self.order_texts(ax, x1, y1, i, color='white', fontsize=10, fontweight='bold', zorder=3)
+            # Popisek bodu mírně posunutý od bodu
+            texts.append(ax.text(x1 * 1.15, y1 * 1.15, self.node_label(i), ha='center', va='center',
+                                 fontsize=9, bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="gray", alpha=0.7)))
+            return texts
         
         # Nastavení grafu
-        self.ax.set_title("Optimalizovaná trasa", fontsize=14)
-        self.ax.axis('equal')
-        self.ax.axis('off')
-        self.ax.set_xlim(-1.3, 1.3)
-        self.ax.set_ylim(-1.3, 1.3)
+        ax.set_title("Optimalizovaná trasa", fontsize=14)
+        ax.axis('equal')
+        ax.axis('off')
+        ax.set_xlim(-1.3, 1.3)
+        ax.set_ylim(-1.3, 1.3)
         
         # Přidat legendu pro barevné značení
-        if len(self.route_sequence) <= 20:  # Pouze pro menší grafy
+        if num_nodes <= 20:  # Pouze pro menší grafy
             legend_elements = []
             for i, node in enumerate(self.route_sequence[:10]):  # Max 10 položek v legendě
-                color = self.node_colors.get(node, '#3498db')
                 legend_elements.append(plt.Line2D([0], [0], marker='o', color='w',
-                                              markerfacecolor=color, markersize=10, 
+                                              markerfacecolor=colors[i], markersize=10, 
                                               label=f"{i+1}: {node}"))
             
-            self.ax.legend(handles=legend_elements, loc='upper right', 
-                         bbox_to_anchor=(1.3, 1.0), fontsize=9)
-        
-        self.fig.tight_layout()
-        self.canvas.draw()
+            ax.set_position(LEGEND_AXES_RECT)
+            ax.legend(handles=legend_elements, loc='upper left', 
+                     bbox_to_anchor=(1.02, 1.0), fontsize=9)
+        return make_labels
     
-    def visualize_classic_style(self):
+    def draw_classic_style(self, ax, positions):
         """Klasický styl vizualizace s číselnými popisky"""
-        self.ax.clear()
-        
-        if not self.route_sequence:
-            self.init_empty_graph()
-            return
-        
-        # Generovat pozice bodů v mřížce
-        positions = {}
-        nodes_list = list(set(self.route_sequence))
-        num_nodes = len(nodes_list)
-        
-        # Vypočítat velikost mřížky
-        grid_size = int(np.ceil(np.sqrt(num_nodes)))
-        
-        # Rozmístit body v mřížce
-        for i, node in enumerate(nodes_list):
-            row = i // grid_size
-            col = i % grid_size
-            
-            # Normalizovat pozice do rozsahu [-1, 1]
-            x = (col * 2.0 / (grid_size - 1 or 1)) - 1.0
-            y = 1.0 - (row * 2.0 / (grid_size - 1 or 1))
-            
-            positions[node] = (x, y)
-        
-        # Vykreslit hrany jako čáry
-        for i in range(len(self.route_sequence)):
-            node = self.route_sequence[i]
-            next_node = self.route_sequence[(i + 1) % len(self.route_sequence)]
-            
-            x1, y1 = positions[node]
-            x2, y2 = positions[next_node]
-            
-            # Vykreslení šipky
-            self.ax.annotate("", xy=(x2, y2), xytext=(x1, y1),
-                           arrowprops=dict(arrowstyle="->", lw=1.5, color='blue'))
-            
-            # Přidat číslo pořadí hrany
-            mid_x = (x1 + x2) / 2
-            mid_y = (y1 + y2) / 2
-            self.ax.text(mid_x, mid_y, f"{i+1}", ha='center', va='center',
-                       fontsize=8, bbox=dict(boxstyle="round", fc="white", alpha=0.7))
-        
-        # Vykreslit body
-        for node, pos in positions.items():
-            x, y = pos
-            
-            # Zjistit pořadí bodu v sekvenci
-            node_index = self.route_sequence.index(node) + 1
-            
-            # Vykreslit bod s popiskem uvnitř
-            self.ax.scatter(x, y, s=200, color='lightblue', edgecolor='blue', linewidth=1.5)
-            self.ax.text(x, y, str(node_index), ha='center', va='center', fontsize=10)
-            
-            # Přidat popisek pod bod
-            self.ax.text(x, y - 0.1, str(node), ha='center', va='top', fontsize=8)
+        ends = np.roll(positions, -1, axis=0)
+        
+        # Hrany jako čáry se šipkami
+        segments = edge_segments(positions, ends)
+        ax.add_collection(LineCollection(segments, colors='blue', linewidths=1.5, zorder=1))
+        add_direction_arrows(ax, segments, 'blue', zorder=1)
+        
+        # Body
+        size = marker_size(200, len(positions))
+        self.draw_nodes(ax, positions, np.full(len(positions), size), ['lightblue'] * len(positions),
+                        edgecolor='blue', linewidth=1.5, zorder=2)
+        
+        def make_labels(i):
+            x1, y1 = positions[i]
+            x2, y2 = ends[i]
+            # Číslo pořadí hrany
+            texts = [ax.text((x1 + x2) / 2, (y1 + y2) / 2, f"{i+1}", ha='center', va='center',
+                             fontsize=8, bbox=dict(boxstyle="round", fc="white", alpha=0.7))]
+            texts += self.order_texts(ax, x1, y1, i, fontsize=10, zorder=3)
+            # Popisek pod bodem
+            texts.append(ax.text(x1, y1 - 0.1, self.node_label(i), ha='center', va='top', fontsize=8))
+            return texts
         
         # Nastavení grafu
-        self.ax.set_title("Optimalizovaná trasa - klasický styl", fontsize=14)
-        self.ax.grid(True, linestyle='--', alpha=0.3)
-        self.ax.set_xlim(-1.2, 1.2)
-        self.ax.set_ylim(-1.2, 1.2)
-        self.ax.set_xticks([])
-        self.ax.set_yticks([])
-        
-        self.fig.tight_layout()
-        self.canvas.draw()
+        ax.set_title("Optimalizovaná trasa - klasický styl", fontsize=14)
+        ax.grid(True, linestyle='--', alpha=0.3)
+        ax.set_xlim(-1.2, 1.2)
+        ax.set_ylim(-1.2, 1.2)
+        ax.set_xticks([])
+        ax.set_yticks([])
+        return make_labels
     
-    def visualize_schema_style(self):
+    def draw_schema_style(self, ax, positions):
         """Schematický styl vizualizace jako liniové schéma"""
-        self.ax.clear()
-        
-        if not self.route_sequence:
-            self.init_empty_graph()
-            return
-        
-        # Lineární schéma - body v řadě s šipkami mezi nimi
-        num_nodes = len(self.route_sequence)
-        
-        # Vytvořit lineární rozvržení
-        x_positions = np.linspace(-0.9, 0.9, num_nodes)
-        y_positions = np.zeros(num_nodes)
-        
-        # Přidat mírné vychýlení pro lepší čitelnost
-        for i in range(num_nodes):
-            if i % 2 == 1:
-                y_positions[i] = 0.1
-            else:
-                y_positions[i] = -0.1
-        
-        # Vykreslit hrany jako šipky
-        for i in range(num_nodes):
-            node = self.route_sequence[i]
-            next_node = self.route_sequence[(i + 1) % num_nodes]
-            next_idx = (i + 1) % num_nodes
-            
-            x1, y1 = x_positions[i], y_positions[i]
-            x2, y2 = x_positions[next_idx], y_positions[next_idx]
-            
-            # Vykreslení šipky mezi body
-            self.ax.annotate("", xy=(x2, y2), xytext=(x1, y1),
-                           arrowprops=dict(arrowstyle="->", lw=1.5, 
-                                          connectionstyle="arc3,rad=0.2",
-                                          color='gray'))
-            
-            # Přidat vzdálenost nad šipku
-            distance = self.matrix.loc[node, next_node]
-            
-            # Vypočítat pozici pro text vzdálenosti
-            mid_x = (x1 + x2) / 2
-            mid_y = (y1 + y2) / 2
-            
-            # Posunout text vzdálenosti nad šipku
-            if y1 == y2:
-                text_y = mid_y + 0.05
-            else:
-                text_y = mid_y + 0.1
-                
-            self.ax.text(mid_x, text_y, f"{distance}", ha='center', va='bottom',
-                       fontsize=8, bbox=dict(boxstyle="round", fc="white", alpha=0.7))
-        
-        # Vykreslit body
-        for i, node in enumerate(self.route_sequence):
-            x, y = x_positions[i], y_positions[i]
-            
-            # První bod zvýraznit
-            if i == 0:
-                node_color = 'red'
-            else:
-                node_color = 'skyblue'
-                
-            # Vykreslit bod
-            self.ax.scatter(x, y, s=300, color=node_color, edgecolor='black', linewidth=1)
-            
-            # Přidat popisek bodu
-            self.ax.text(x, y, f"{i+1}", ha='center', va='center', fontsize=10, fontweight='bold', color='white')
-            
-            # Přidat název bodu pod bod
-            self.ax.text(x, y - 0.15, str(node), ha='center', va='top', fontsize=9,
-                       bbox=dict(boxstyle="round,pad=0.2", fc="white", ec="gray", alpha=0.9))
+        num_nodes = len(positions)
+        ends = np.roll(positions, -1, axis=0)
+        
+        # Hrany jako prohnuté šipky mezi body
+        segments = edge_segments(positions, ends, rad=0.2)
+        ax.add_collection(LineCollection(segments, colors='gray', linewidths=1.5, zorder=1))
+        add_direction_arrows(ax, segments, 'gray', zorder=1)
+        
+        # Body, první zvýrazněný
+        size = marker_size(300, num_nodes)
+        colors = ['red'] + ['skyblue'] * (num_nodes - 1)
+        self.draw_nodes(ax, positions, np.full(num_nodes, size), colors, edgecolor='black', linewidth=1, zorder=2)
+        
+        def make_labels(i):
+            x1, y1 = positions[i]
+            x2, y2 = ends[i]
+            # Vzdálenost nad šipkou
+            text_y = (y1 + y2) / 2 + (0.05 if y1 == y2 else 0.1)
+            texts = [ax.text((x1 + x2) / 2, text_y, f"{self.solution.leg_costs[i]:g}", ha='center', va='bottom',
+                             fontsize=8, bbox=dict(boxstyle="round", fc="white", alpha=0.7))]
+            texts += self.order_texts(ax, x1, y1, i, fontsize=10, fontweight='bold', color='white', zorder=3)
+            # Název bodu pod bodem
+            texts.append(ax.text(x1, y1 - 0.15, self.node_label(i), ha='center', va='top', fontsize=9,
+                                 bbox=dict(boxstyle="round,pad=0.2", fc="white", ec="gray", alpha=0.9)))
+            return texts
         
         # Nastavení grafu
-        self.ax.set_title("Schéma trasy", fontsize=14)
-        self.ax.axis('equal')
-        self.ax.axis('off')
-        self.ax.set_xlim(-1.1, 1.1)
-        self.ax.set_ylim(-0.5, 0.5)
-        
-        self.fig.tight_layout()
-        self.canvas.draw()
+        ax.set_title("Schéma trasy", fontsize=14)
+        ax.axis('equal')
+        ax.axis('off')
+        ax.set_xlim(-1.1, 1.1)
+        ax.set_ylim(-0.5, 0.5)
+        return make_labels
     
-    def on_graph_click(self, event):
-        """Reakce na kliknutí do grafu"""
+    def current_view(self):
+        """Právě zobrazený styl (None, pokud je zobrazen prázdný graf)"""
+        view = self.style_views.get(self.viz_style.get())
+        if view is None or not view.ax.get_visible():
+            return None
+        return view
+    
+    def set_highlight(self, view):
+        """Přesune značku zvýraznění stylu na vybraný bod"""
+        if self.selected_node is None:
+            view.highlight.set_offsets(np.empty((0, 2)))
+        else:
+            index = self.solution.position(self.selected_node)
+            view.highlight.set_offsets(view.layout.positions[index:index + 1])
+    
+    def highlight_selected_node(self):
+        """Zvýrazní vybraný bod blittingem - obnoví uložené pozadí a dokreslí jen značku"""
+        view = self.current_view()
+        if view is None:
+            return
+        self.set_highlight(view)
+        self.blit_overlays(view)
+    
+    def blit_overlays(self, view):
+        """Obnoví uložené pozadí a dokreslí jen zvýraznění a nápovědu (bez překreslení trasy)"""
+        if self.background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        self.draw_overlays(view)
+        self.canvas.blit(self.fig.bbox)
+    
+    def draw_overlays(self, view):
+        """Dokreslí animované objekty stylu (zvýraznění vybraného bodu, nápověda)"""
+        view.ax.draw_artist(view.highlight)
+        if view.tooltip.get_visible():
+            view.ax.draw_artist(view.tooltip)
+    
+    def on_draw(self, event):
+        """Po úplném překreslení uloží pozadí pro blitting a dokreslí zvýraznění a nápovědu"""
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        view = self.current_view()
+        if view is not None:
+            self.draw_overlays(view)
+    
+    def hit_radius(self, ax):
+        """Tolerance zásahu bodu v datových jednotkách os (HIT_TOLERANCE_PX při aktuálním přiblížení)"""
+        inverse = ax.transData.inverted()
+        (x0, y0), (x1, y1) = inverse.transform([(0, 0), (HIT_TOLERANCE_PX, HIT_TOLERANCE_PX)])
+        return max(abs(x1 - x0), abs(y1 - y0))
+    
+    def node_at(self, event):
+        """Pozice v trase bodu pod myší (None, pokud tam žádný není) - dotaz do indexu rozmístění"""
         if not self.solution or not self.route_sequence or self.matrix is None:
+            return None
+        view = self.current_view()
+        if view is None or event.inaxes is not view.ax or event.xdata is None or event.ydata is None:
+            return None
+        return view.layout.index.nearest(event.xdata, event.ydata, self.hit_radius(view.ax))
+    
+    def on_graph_hover(self, event):
+        """Nápověda k bodu pod myší - překreslí se blittingem jen při změně bodu"""
+        # při posunu/přiblížení nástrojovou lištou se graf stejně celý překresluje
+        if self.toolbar.mode:
             return
-            
-        if event.xdata is None or event.ydata is None:
+        index = self.node_at(event)
+        if index == self.hover_index:
             return
-            
-        # Generovat pozice bodů (musí být stejné jako ve vizualizaci)
-        positions = {}
-        viz_style = self.viz_style.get()
-        
-        if viz_style == "modern":
-            # Pozice v kruhu (stejné jako ve visualize_modern_style)
-            radius = 0.8
-            angle_start = -np.pi / 2
-            num_nodes = len(set(self.route_sequence))
-            
-            for i, node in enumerate(self.route_sequence):
-                if node in positions:
-                    continue
-                    
-                angle = angle_start + (i * 2 * np.pi / num_nodes)
-                positions[node] = (radius * np.cos(angle), radius * np.sin(angle))
-                
-        elif viz_style == "classic":
-            # Pozice v mřížce (stejné jako ve visualize_classic_style)
-            nodes_list = list(set(self.route_sequence))
-            num_nodes = len(nodes_list)
-            grid_size = int(np.ceil(np.sqrt(num_nodes)))
-            
-            for i, node in enumerate(nodes_list):
-                row = i // grid_size
-                col = i % grid_size
-                
-                # Normalizovat pozice do rozsahu [-1, 1]
-                x = (col * 2.0 / (grid_size - 1 or 1)) - 1.0
-                y = 1.0 - (row * 2.0 / (grid_size - 1 or 1))
-                
-                positions[node] = (x, y)
-                
-        elif viz_style == "schema":
-            # Lineární pozice (stejné jako ve visualize_schema_style)
-            num_nodes = len(self.route_sequence)
-            x_positions = np.linspace(-0.9, 0.9, num_nodes)
-            y_positions = np.zeros(num_nodes)
-            
-            # Přidat mírné vychýlení
-            for i in range(num_nodes):
-                if i % 2 == 1:
-                    y_positions[i] = 0.1
-                else:
-                    y_positions[i] = -0.1
-            
-            for i, node in enumerate(self.route_sequence):
-                positions[node] = (x_positions[i], y_positions[i])
-        
-        # Najít nejbližší bod ke kliknutí
-        min_distance = float('inf')
-        closest_node = None
-        
-        for node, pos in positions.items():
-            x, y = pos
-            distance = ((x - event.xdata) ** 2 + (y - event.ydata) ** 2) ** 0.5
-            
-            if distance < min_distance:
-                min_distance = distance
-                closest_node = node
+        view = self.current_view()
+        if view is None:
+            return
+        self.hover_index = index
+        
+        if index is None:
+            view.tooltip.set_visible(False)
+        else:
+            node = self.route_sequence[index]
+            next_node = self.route_sequence[(index + 1) % len(self.route_sequence)]
+            view.tooltip.xy = tuple(view.layout.positions[index])
+            view.tooltip.set_text(f"{index + 1}. {node}\n"
+                                  f"Do bodu {next_node}: {self.solution.leg_costs[index]:g}")
+            view.tooltip.set_visible(True)
+        self.blit_overlays(view)
+    
+    def on_graph_click(self, event):
+        """Reakce na kliknutí do grafu"""
+        # Najít nejbližší bod ke kliknutí v toleranci (prostorový index rozmístění stylu)
+        closest = self.node_at(event)
         
-        # Pokud je bod dostatečně blízko (tolerance kliknutí)
-        if min_distance < 0.1:
+        if closest is not None:
+            closest_node = self.route_sequence[closest]
             self.selected_node = closest_node
             self.update_node_details(closest_node)
+            self.highlight_selected_node()
             
-            # Označit vybraný řádek v seznamu
-            for item in self.node_tree.get_children():
-                if self.node_tree.item(item, "text") == closest_node:
-                    self.node_tree.selection_set(item)
-                    self.node_tree.see(item)
-                    break
+            # Označit vybraný řádek v seznamu (řádky jsou v pořadí trasy)
+            item = self.node_items[closest]
+            self.node_tree.selection_set(item)
+            self.node_tree.see(item)
     
     def on_node_select(self, event):
         """Reakce na výběr uzlu v seznamu"""
@@ -603,6 +751,7 @@ class RouteView:
         
         self.selected_node = node
         self.update_node_details(node)
+        self.highlight_selected_node()
     
     def update_node_details(self, node):
         """Aktualizuje detaily o vybraném uzlu"""
@@ -610,13 +759,13 @@ class RouteView:
             return
         
         # Najít pozici uzlu v sekvenci
-        node_index = self.route_sequence.index(node)
+        node_index = self.solution.position(node)
         next_node = self.route_sequence[(node_index + 1) % len(self.route_sequence)]
         prev_node = self.route_sequence[(node_index - 1) % len(self.route_sequence)]
         
-        # Získat vzdálenosti
-        dist_to_next = self.matrix.loc[node, next_node]
-        dist_from_prev = self.matrix.loc[prev_node, node]
+        # Získat vzdálenosti (předpočítané úseky trasy)
+        dist_to_next = f"{self.solution.leg_costs[node_index]:g}"
+        dist_from_prev = f"{self.solution.leg_costs[node_index - 1]:g}"
         
         # Sestavit text s detaily
         details = f"Bod: {node}\n"
@@ -624,15 +773,9 @@ class RouteView:
         details += f"Předchozí bod: {prev_node} (vzdálenost: {dist_from_prev})\n"
         details += f"Následující bod: {next_node} (vzdálenost: {dist_to_next})\n"
         
-        # Celková vzdálenost od tohoto bodu
-        total_from_here = 0
-        curr = node
-        for _ in range(len(self.route_sequence)):
-            next_n = self.route_sequence[(self.route_sequence.index(curr) + 1) % len(self.route_sequence)]
-            total_from_here += self.matrix.loc[curr, next_n]
-            curr = next_n
-        
-        details += f"Celková vzdálenost od tohoto bodu: {total_from_here}"
+        # Vzdálenost ze startu do tohoto bodu a celý okruh od tohoto bodu zpět do něj
+        details += f"Vzdálenost od startu trasy: {self.solution.distance_between(0, node_index):g}\n"
+        details += f"Celková vzdálenost od tohoto bodu: {self.solution.total_distance:g}"
         
         # Aktualizovat text v detailním panelu
         self.node_detail.config(text=details)
\ No newline at end of file
@@ -0,0 +1,41 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from core.models import DistanceMatrix
+
+class DistanceMatrixRoundTripTest(unittest.TestCase):
+    """Uložení matice na disk a zpětné načtení"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        values = np.array([[0.0, 12.5, np.inf],
+                           [100.0, 0.0, 7.25],
+                           [np.inf, 33.0, 0.0]])
+        labels = ["A", "B", "C"]
+        self.frame = pd.DataFrame(values, index=labels, columns=labels)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_inf_round_trip(self):
+        for dtype in (np.float32, np.float64, np.uint16, np.uint32):
+            with self.subTest(dtype=np.dtype(dtype).name):
+                path = os.path.join(self.directory.name, f"{np.dtype(dtype).name}.npy")
+                DistanceMatrix.from_frame(self.frame, path, dtype=dtype)
+                matrix = DistanceMatrix.open(path)
+                values = matrix.to_numpy()
+                expected = self.frame.to_numpy()
+                # zakázané hrany zůstanou nekonečné, ostatní hodnoty v přesnosti měřítka
+                np.testing.assert_array_equal(np.isinf(values), np.isinf(expected))
+                finite = np.isfinite(expected)
+                np.testing.assert_allclose(values[finite], expected[finite], rtol=1e-3)
+                self.assertEqual(matrix.loc["A", "C"], np.inf)
+                self.assertEqual(matrix.costs[2, 0], np.inf)
+                self.assertTrue(np.isinf(matrix.costs[0:1, 2]).all())
+
+if __name__ == "__main__":
+    unittest.main()